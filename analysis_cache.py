@@ -0,0 +1,165 @@
+import hashlib
+import os
+
+import pandas as pd
+
+from bias_detector import BiasDetector, parse_timestamps
+from tiered_cache import TieredCache
+
+
+class AnalysisCache:
+    """
+    /api/analyze results keyed by a fingerprint of the trade log.
+
+    The fingerprint hashes the normalized trades (parsed timestamps and
+    P/L, so formatting differences and extra fields don't matter) in the
+    order they were sent. An identical log returns the cached result
+    directly. A log that starts with a cached one (the same export with
+    new trades appended) extends the cached BiasDetector instead of
+    rebuilding it.
+
+    Entries are evicted least-recently-used once either `max_entries` or
+    `max_rows` (trades held across all cached detectors) is exceeded. When
+    `path` is set, results (not detectors, which hold the whole frame) are
+    also written to a local SQLite file so they survive restarts; a log
+    found only there is served directly but cannot be extended.
+
+    A result that `cacheable(detector, result)` rejects (e.g. one carrying
+    fallback recommendations because Gemini failed) is not kept; only its
+    detector is, so the next request for the log rebuilds just the result.
+    """
+    def __init__(self, max_entries=64, max_rows=2_000_000, path=None, max_disk_entries=1024):
+        self.max_entries = max_entries
+        self.max_rows = max_rows
+        self.path = path
+        self.max_disk_entries = max_disk_entries
+
+        # fingerprint -> (rows, result or None, detector or None when read
+        # back from SQLite); only entries holding a detector count as rows
+        self._entries = TieredCache(
+            'analyses', max_entries=max_entries, path=path, max_disk_entries=max_disk_entries,
+            weigh=lambda entry: entry[0] if entry[2] is not None else 0, max_weight=max_rows
+        )
+
+    @classmethod
+    def from_env(cls):
+        """Configure from ANALYSIS_CACHE_SIZE and ANALYSIS_CACHE_PATH."""
+        return cls(
+            max_entries=int(os.environ.get("ANALYSIS_CACHE_SIZE", 64)),
+            path=os.environ.get("ANALYSIS_CACHE_PATH") or None
+        )
+
+    def __len__(self):
+        return len(self._entries)
+
+    def analyze(self, df, build, cacheable=None):
+        """
+        Cached `build(detector)` for the trades in `df`.
+
+        On a miss the detector is built from the longest cached prefix of
+        the log when there is one, or from scratch otherwise.
+        """
+        df, row_hashes, fingerprint = self._key(df)
+
+        entry = self._entries.get(fingerprint)
+        if entry is not None and entry[1] is not None:
+            return entry[1]
+
+        detector = self._cached_detector(entry) or self._detector_for(df, row_hashes)
+        result = build(detector)
+        self._put(fingerprint, len(df), result, detector, cacheable)
+        return result
+
+    def iter_analyze(self, df, iter_build, cacheable=None):
+        """
+        Streaming analyze(): yields the (key, value) parts of the result.
+
+        `iter_build(detector)` yields the parts on a miss; the assembled
+        dict is cached once it is exhausted. A hit yields the cached parts.
+        """
+        df, row_hashes, fingerprint = self._key(df)
+
+        entry = self._entries.get(fingerprint)
+        if entry is not None and entry[1] is not None:
+            yield from entry[1].items()
+            return
+
+        detector = self._cached_detector(entry) or self._detector_for(df, row_hashes)
+        result = {}
+        for key, value in iter_build(detector):
+            result[key] = value
+            yield key, value
+        self._put(fingerprint, len(df), result, detector, cacheable)
+
+    def _key(self, df):
+        """(normalized frame, row hashes, fingerprint) for a trade log."""
+        df = self.normalize(df)
+        row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+        return df, row_hashes, self._fingerprint(row_hashes)
+
+    @staticmethod
+    def _cached_detector(entry):
+        return entry[2] if entry is not None else None
+
+    def _detector_for(self, df, row_hashes):
+        """Extend the longest cached prefix of the log, or build from scratch."""
+        prefix = self._longest_prefix(row_hashes)
+        if prefix is not None:
+            rows, prefix_detector = prefix
+            try:
+                return prefix_detector.extend(df.iloc[rows:])
+            except ValueError:
+                pass
+        return BiasDetector(df)
+
+    @staticmethod
+    def normalize(df):
+        """
+        Parse the trade columns so equivalent logs hash the same.
+
+        Labels become strings, but missing ones stay missing rather than
+        turning into a literal 'nan' or 'None' asset or trader.
+        """
+        labels = lambda column: column.astype(str).where(column.notna())
+        normalized = pd.DataFrame({
+            'Timestamp': parse_timestamps(df['Timestamp']),
+            'Buy/sell': labels(df['Buy/sell']),
+            'Asset': labels(df['Asset']),
+            'P/L': pd.to_numeric(df['P/L'], errors='coerce')
+        })
+        if 'Trader' in df:
+            normalized['Trader'] = labels(df['Trader'])
+        return normalized
+
+    @staticmethod
+    def _fingerprint(row_hashes):
+        return hashlib.blake2b(row_hashes.tobytes(), digest_size=16).hexdigest()
+
+    def _longest_prefix(self, row_hashes):
+        """(rows, detector) of the longest cached log this one starts with."""
+        lengths = self._entries.weights_below(len(row_hashes)) - {0}
+        if not lengths:
+            return None
+
+        # One incremental pass over the row hashes yields every candidate
+        # prefix's fingerprint
+        candidates = []
+        digest = hashlib.blake2b(digest_size=16)
+        done = 0
+        for rows in sorted(lengths):
+            digest.update(row_hashes[done:rows].tobytes())
+            done = rows
+            candidates.append((rows, digest.hexdigest()))
+
+        for rows, fingerprint in reversed(candidates):
+            detector = self._cached_detector(self._entries.get(fingerprint))
+            if detector is not None:
+                return rows, detector
+        return None
+
+    def _put(self, fingerprint, rows, result, detector, cacheable=None):
+        if cacheable is not None and not cacheable(detector, result):
+            result = None
+        self._entries.put(fingerprint, (rows, result, detector), persist=False)
+        if result is not None:
+            self._entries.save(fingerprint, (rows, result, None))
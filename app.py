@@ -1,5 +1,4 @@
-from flask import Flask, render_template, request, jsonify
-from flask.json.provider import DefaultJSONProvider
+from flask import Blueprint, Flask, Response, current_app, render_template, request, jsonify, stream_with_context
 from dotenv import load_dotenv
 import pandas as pd
 import numpy as np
@@ -7,101 +6,306 @@ from datetime import datetime, timedelta
 import json
 import os
 from bias_detector import BiasDetector
+from streaming_detector import StreamingBiasDetector
+from session_store import TraderSessionStore
+from trade_io import ARROW_STREAM_MIMETYPE, iter_trade_chunks, read_arrow_trades, trades_frame
+from batch_analysis import analyze_accounts
+from analysis_cache import AnalysisCache
 from mock_data_generator import MockDataGenerator
 from gemini_coach import GeminiCoach
+from intervention_pool import InterventionPool
+from json_provider import FastJSONProvider, compression_from_env
+from job_queue import JobManager
 
 # Load environment variables
 load_dotenv()
 
-class CustomJSONProvider(DefaultJSONProvider):
-    def default(self, obj):
-        if isinstance(obj, np.integer):
-            return int(obj)
-        if isinstance(obj, np.floating):
-            return float(obj)
-        if isinstance(obj, np.ndarray):
-            return obj.tolist()
-        return super().default(obj)
-
-app = Flask(__name__)
-from flask_cors import CORS
-CORS(app) # Enable CORS for all routes (allows extension to call API)
-app.json = CustomJSONProvider(app)
-
-# Initialize Gemini Coach
-gemini_coach = GeminiCoach()
-
-@app.route('/')
+# Routes live on a blueprint. Importing this module runs init_services()
+# and create_app() at the bottom (so `app` is there for WSGI servers,
+# tests and benchmarks), except in spawned batch workers, which skip both
+api = Blueprint('api', __name__)
+
+def create_app():
+    """The Flask app serving the API and the dashboard."""
+    app = Flask(__name__)
+    from flask_cors import CORS
+    CORS(app) # Enable CORS for all routes (allows extension to call API)
+    app.json = FastJSONProvider(app)
+    compression_from_env(app)
+    app.register_blueprint(api)
+    return app
+
+def init_services():
+    """Build the app-wide Gemini coach, caches, session store and job pool."""
+    global gemini_coach, intervention_pool, session_store, analysis_cache, job_manager
+    
+    # Initialize Gemini Coach
+    gemini_coach = GeminiCoach()
+    
+    # Ready-made intervention messages so /api/realtime never waits on Gemini;
+    # the pools start filling on the first real-time request
+    intervention_pool = InterventionPool.from_env(gemini_coach)
+    
+    # Per-session trade state for /api/realtime
+    session_store = TraderSessionStore.from_env()
+    
+    # /api/analyze results keyed by trade-log fingerprint
+    analysis_cache = AnalysisCache.from_env()
+    
+    # Background analyses for /api/jobs
+    job_manager = JobManager.from_env()
+
+@api.route('/')
 def index():
     return render_template('index.html')
 
-@app.route('/api/analyze', methods=['POST'])
+@api.route('/api/analyze', methods=['POST'])
 def analyze():
+    """
+    Full bias analysis of a trade log.
+    Input: { "trades": [...] } as row objects or parallel column arrays
+    ({"Timestamp": [...], "Buy/sell": [...], "Asset": [...], "P/L": [...]}),
+    or an Arrow IPC stream body (Content-Type: application/vnd.apache.arrow.stream)
+    """
+    try:
+        if request.mimetype == ARROW_STREAM_MIMETYPE:
+            df = read_arrow_trades(request.get_data())
+        else:
+            trades = request.json.get('trades', [])
+            if not trades:
+                return jsonify({'error': 'No trading data provided'}), 400
+            # Columnar payloads map straight onto DataFrame columns
+            df = trades_frame(trades)
+        
+        if len(df) == 0:
+            return jsonify({'error': 'No trading data provided'}), 400
+        
+        # Re-uploads of the same (or an appended) log reuse earlier work
+        return jsonify(analysis_cache.analyze(df, build_analysis, cacheable=gemini_answered))
+    
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@api.route('/api/analyze/stream', methods=['POST'])
+def analyze_stream():
+    """
+    /api/analyze as server-sent events, one per part as soon as it is ready.
+    Input: as for /api/analyze
+    Events: overtrading, loss_aversion, revenge_trading, summary, statistics,
+    recommendations, from_gemini (each with that part as JSON data), then
+    done; or error.
+    """
+    try:
+        if request.mimetype == ARROW_STREAM_MIMETYPE:
+            df = read_arrow_trades(request.get_data())
+        else:
+            trades = request.json.get('trades', [])
+            if not trades:
+                return jsonify({'error': 'No trading data provided'}), 400
+            df = trades_frame(trades)
+        
+        if len(df) == 0:
+            return jsonify({'error': 'No trading data provided'}), 400
+    
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    
+    def events():
+        try:
+            for name, value in analysis_cache.iter_analyze(df, iter_analysis, cacheable=gemini_answered):
+                yield f"event: {name}\ndata: {current_app.json.dumps(value)}\n\n"
+            yield "event: done\ndata: {}\n\n"
+        except Exception as e:
+            yield f"event: error\ndata: {current_app.json.dumps({'error': str(e)})}\n\n"
+    
+    # Unbuffered through proxies so each part reaches the browser right away
+    return Response(stream_with_context(events()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+TIMELINE_WINDOWS = {'daily': 1, 'weekly': 7}
+
+@api.route('/api/timeline', methods=['POST'])
+def timeline():
+    """
+    Bias scores over trailing daily or weekly windows, for charting trends.
+    Input: { "trades": [...], "window": "daily" | "weekly" | <days> }
+    (trades as row objects or parallel column arrays, as for /api/analyze)
+    Returns parallel lists (dates, trades, pnl, one score series per bias).
+    """
     try:
         data = request.json
         trades = data.get('trades', [])
-        
+
         if not trades:
             return jsonify({'error': 'No trading data provided'}), 400
+
+        window = data.get('window', 'weekly')
+        # Only strings are looked up: lists or objects are not hashable
+        window_days = TIMELINE_WINDOWS.get(window, window) if isinstance(window, str) else window
+        if not isinstance(window_days, int) or isinstance(window_days, bool) or window_days < 1:
+            return jsonify({'error': "window must be 'daily', 'weekly' or a positive number of days"}), 400
+
+        detector = BiasDetector(trades_frame(trades))
+        return jsonify(detector.timeline(window_days))
+
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@api.route('/api/analyze-upload', methods=['POST'])
+def analyze_upload():
+    """
+    Bias analysis of a CSV or Parquet export, streamed through the detectors in chunks.
+    Input: multipart/form-data with a 'file' field (.csv, .parquet)
+    """
+    try:
+        upload = request.files.get('file')
+        if upload is None or not upload.filename:
+            return jsonify({'error': 'No file uploaded'}), 400
         
-        # Convert to DataFrame
-        df = pd.DataFrame(trades)
-        
-        # Ensure required columns exist
-        required_cols = ['Timestamp', 'Buy/sell', 'Asset', 'P/L']
-        missing_cols = [col for col in required_cols if col not in df.columns]
-        if missing_cols:
-            return jsonify({'error': f'Missing required columns: {missing_cols}'}), 400
-        
-        # Initialize bias detector
-        detector = BiasDetector(df)
-        
-        # Detect all biases first to pass to Gemini
-        overtrading = detector.detect_overtrading()
-        loss_aversion = detector.detect_loss_aversion()
-        revenge_trading = detector.detect_revenge_trading()
-        summary = detector.generate_summary()
-        
-        # Determine recommendations source
-        if gemini_coach.model:
-            # Prepare analysis data for Gemini
-            bias_analysis = {
-                'overtrading': overtrading,
-                'loss_aversion': loss_aversion,
-                'revenge_trading': revenge_trading,
-                'summary': summary
-            }
-            try:
-                recommendations = gemini_coach.generate_recommendations(bias_analysis)
-                if not recommendations: # Fallback if Gemini returns empty list
-                     print("⚠️ Gemini returned no recommendations. Using fallback.")
-                     recommendations = detector.generate_recommendations()
-            except Exception as e:
-                print(f"❌ Gemini generation failed, falling back: {e}")
-                recommendations = detector.generate_recommendations()
-        else:
-            print("ℹ️ Gemini not configured (no API key). Using standard recommendations.")
-            recommendations = detector.generate_recommendations()
+        # Only running aggregates are kept, so memory stays flat however large the export
+        detector = StreamingBiasDetector()
+        for chunk in iter_trade_chunks(upload.stream, upload.filename):
+            detector.update_frame(chunk)
+        
+        if detector.total_trades == 0:
+            return jsonify({'error': 'No valid trading data found after processing'}), 400
+        
+        results = build_analysis(detector)
+        if detector.out_of_order_trades:
+            results['warnings'] = [
+                f'{detector.out_of_order_trades} trades were out of chronological order; '
+                'sort the export by Timestamp for exact results.'
+            ]
+        return jsonify(results)
+    
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@api.route('/api/analyze-batch', methods=['POST'])
+def analyze_batch():
+    """
+    Analyze many trader accounts in one call, fanned out across a process pool.
+    Input: { "accounts": { "<account_id>": [trades...], ... } }
+    Recommendations are rule-based; Gemini is not called per account.
+    """
+    try:
+        data = request.json
+        accounts = data.get('accounts', {})
+        
+        if not accounts or not isinstance(accounts, dict):
+            return jsonify({'error': 'No accounts provided'}), 400
+        
+        return jsonify(analyze_accounts(accounts))
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
 
-        results = {
+def build_analysis(detector, progress=None):
+    """
+    Assemble the /api/analyze response from a BiasDetector or StreamingBiasDetector.
+    `progress(fraction, stage)` is called between steps when given (job mode).
+    """
+    return dict(iter_analysis(detector, progress))
+
+def iter_analysis(detector, progress=None):
+    """
+    Yield the /api/analyze response one (key, value) part at a time: each
+    detector, the summary, the statistics, the recommendations (which may
+    wait on Gemini) and finally from_gemini, False when they are the
+    rule-based set.
+    """
+    progress = progress or (lambda fraction, stage: None)
+    
+    # Detect all biases first to pass to Gemini
+    progress(0.3, 'overtrading')
+    overtrading = detector.detect_overtrading()
+    yield 'overtrading', overtrading
+    progress(0.4, 'loss_aversion')
+    loss_aversion = detector.detect_loss_aversion()
+    yield 'loss_aversion', loss_aversion
+    progress(0.5, 'revenge_trading')
+    revenge_trading = detector.detect_revenge_trading()
+    yield 'revenge_trading', revenge_trading
+    summary = detector.generate_summary()
+    yield 'summary', summary
+    
+    progress(0.6, 'statistics')
+    yield 'statistics', detector.get_statistics()
+    
+    # Determine recommendations source
+    progress(0.7, 'recommendations')
+    from_gemini = False
+    if gemini_coach.model:
+        # Prepare analysis data for Gemini
+        bias_analysis = {
             'overtrading': overtrading,
             'loss_aversion': loss_aversion,
             'revenge_trading': revenge_trading,
-            'summary': summary,
-            'recommendations': recommendations,
-            'statistics': detector.get_statistics()
+            'summary': summary
         }
-        
-        return jsonify(results)
+        try:
+            recommendations = gemini_coach.generate_recommendations(bias_analysis)
+            from_gemini = bool(recommendations)
+            if not recommendations: # Fallback if Gemini returns empty list
+                 print("⚠️ Gemini returned no recommendations. Using fallback.")
+                 recommendations = detector.generate_recommendations()
+        except Exception as e:
+            print(f"❌ Gemini generation failed, falling back: {e}")
+            recommendations = detector.generate_recommendations()
+    else:
+        print("ℹ️ Gemini not configured (no API key). Using standard recommendations.")
+        recommendations = detector.generate_recommendations()
+    yield 'recommendations', recommendations
+    yield 'from_gemini', from_gemini
+
+def gemini_answered(detector, result):
+    """
+    Whether an /api/analyze result may be cached: not when Gemini is
+    configured but the recommendations are the rule-based fallback (it
+    failed, timed out or returned nothing), so the log is retried next time.
+    """
+    return not gemini_coach.model or result.get('from_gemini', False)
+
+def analyze_csv_trades(trades, mode='hybrid', progress=None):
+    """
+    Gemini bias analysis of a trade log, optionally pre-scored locally.
+    `progress(fraction, stage)` is called between steps and between Gemini
+    windows when given (job mode).
+    """
+    progress = progress or (lambda fraction, stage: None)
     
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    local_scores = None
+    if mode == 'hybrid':
+        progress(0.1, 'local_scoring')
+        try:
+            local_scores = BiasDetector(pd.DataFrame(trades)).score_local_biases()
+        except Exception as e:
+            print(f"⚠️ Local pre-scoring failed, asking Gemini for every bias: {e}")
+    
+    # Long logs are analyzed window by window and merged, so every trade counts
+    progress(0.3, 'gemini')
+    print(f"📊 Analyzing CSV with Gemini ({len(trades)} trades)...")
+    return gemini_coach.analyze_trade_data(
+        trades, local_scores=local_scores,
+        progress=lambda fraction, stage: progress(0.3 + 0.65 * fraction, stage)
+    )
 
-@app.route('/api/analyze-csv', methods=['POST'])
+@api.route('/api/analyze-csv', methods=['POST'])
 def analyze_csv():
     """
     Full CSV analysis via Gemini (replaces local bias detection for reports).
-    Input: { "trades": [...] }
+    Input: {
+        "trades": [...],
+        "mode": "hybrid" # Default: biases the local detectors can score skip Gemini; "gemini" asks for all
+    }
     """
     print("🚀 Received request at /api/analyze-csv")
     try:
@@ -111,33 +315,86 @@ def analyze_csv():
         if not trades:
             return jsonify({'error': 'No trading data provided'}), 400
             
-        # Limit to last 100 trades to fit in context window and keep costs down
-        # Sort by timestamp? Assuming they come sorted or we sort them.
-        # But for "behavior", recency matters most.
-        sample_size = 100
-        if len(trades) > sample_size:
-            # Take the last N trades
-            trades_sample = trades[-sample_size:]
-        else:
-            trades_sample = trades
-            
-        print(f"📊 Analyzing CSV with Gemini ({len(trades_sample)} trades)...")
-        analysis = gemini_coach.analyze_trade_data(trades_sample)
-        
-        return jsonify(analysis)
+        return jsonify(analyze_csv_trades(trades, data.get('mode', 'hybrid')))
         
     except Exception as e:
         print(f"❌ Error in /api/analyze-csv: {e}")
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/mock-data', methods=['GET'])
+@api.route('/api/jobs', methods=['POST'])
+def submit_job():
+    """
+    Run /api/analyze or /api/analyze-csv in the background; poll GET /api/jobs/<job_id>.
+    Input: {
+        "type": "analyze" | "analyze-csv",
+        "trades": [...], # As for the matching endpoint (analyze also takes columns)
+        "mode": "hybrid" # analyze-csv only
+    }
+    """
+    try:
+        data = request.json
+        kind = data.get('type', 'analyze')
+        trades = data.get('trades', [])
+        
+        if not trades:
+            return jsonify({'error': 'No trading data provided'}), 400
+        
+        # Parsing happens inside the job, after its first cancel checkpoint;
+        # a malformed payload fails the job with the parse error
+        if kind == 'analyze':
+            def work(job):
+                job.report(0.05, 'preparing')
+                df = trades_frame(trades)
+                if len(df) == 0:
+                    raise ValueError('No trading data provided')
+                # Last checkpoint before the detector's feature build
+                job.report(0.1, 'features')
+                return analysis_cache.analyze(df, lambda detector: build_analysis(detector, job.report),
+                                              cacheable=gemini_answered)
+        elif kind == 'analyze-csv':
+            mode = data.get('mode', 'hybrid')
+            
+            def work(job):
+                return analyze_csv_trades(trades, mode, job.report)
+        else:
+            return jsonify({'error': "type must be 'analyze' or 'analyze-csv'"}), 400
+        
+        job = job_manager.submit(kind, work)
+        response = job.snapshot()
+        response['status_url'] = f'/api/jobs/{job.id}'
+        return jsonify(response), 202
+    
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except RuntimeError as e:
+        return jsonify({'error': str(e)}), 503
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@api.route('/api/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """Job status and progress; includes the result once status is 'done'."""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown or expired job'}), 404
+    return jsonify(job.snapshot())
+
+@api.route('/api/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    """Cancel a queued or running job (running jobs stop at their next step)."""
+    job = job_manager.cancel(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown or expired job'}), 404
+    return jsonify(job.snapshot(include_result=False))
+
+@api.route('/api/mock-data', methods=['GET'])
 def mock_data():
     """Generate mock trading data for testing"""
     generator = MockDataGenerator()
     mock_trades = generator.generate()
     return jsonify({'trades': mock_trades})
 
-@app.route('/api/realtime', methods=['POST'])
+@api.route('/api/realtime', methods=['POST'])
 def realtime_intervention():
     """
     Real-time intervention for a single trade attempt.
@@ -145,38 +402,41 @@ def realtime_intervention():
         "action": "buy",
         "asset": "BTC",
         "price": 50000,
-        "history": [...] # Recent trades
+        "session_id": "...", # Optional: server keeps the history for this session
+        "history": [...] # Recent trades (only needed to seed a new session)
     }
     """
     try:
         data = request.json
-        # Check logic here...
-        # For MVP, we can just check the last few trades in 'history'
-        
-        history = data.get('history', [])
-        if not history:
-             return jsonify({'bias_detected': False, 'message': 'No history provided for analysis'}), 200
-
-        # Create DataFrame from history
-        df = pd.DataFrame(history)
+        session_id = data.get('session_id')
+        history = data.get('history')
         
-        # Append the CURRENT trade attempt to the DataFrame to analyze its impact
-        # We need to normalize the current trade to match the DataFrame structure
+        # Score the CURRENT trade attempt as if it were appended to the history
         current_trade = {
-            'Timestamp': datetime.now().isoformat(),
+            'Timestamp': data.get('timestamp') or datetime.now().isoformat(),
             'Buy/sell': data.get('action', 'buy'),
             'Asset': data.get('asset', 'Unknown'),
             'P/L': 0 # Dummy P/L for the current open attempt
         }
-        df_current = pd.DataFrame([current_trade])
-        df = pd.concat([df, df_current], ignore_index=True)
-
-        detector = BiasDetector(df)
+        
+        if session_id:
+            # Server-side state: only the new trade travels over the wire
+            with session_store.session(session_id, history) as detector:
+                if detector is None:
+                    return jsonify({'bias_detected': False, 'session_id': session_id, 'needs_history': True}), 200
+                assessment = detector.assess(current_trade)
+                detector.update(current_trade)
+        else:
+            if not history:
+                 return jsonify({'bias_detected': False, 'message': 'No history provided for analysis'}), 200
+            # Fold the history into running counters instead of a DataFrame
+            detector = StreamingBiasDetector.from_history(history)
+            assessment = detector.assess(current_trade)
         
         # Check for immediate red flags
         # We specifically want to know if the *latest* trade (the attempt) triggers these
-        revenge = detector.detect_revenge_trading()
-        overtrading = detector.detect_overtrading()
+        revenge = assessment['revenge_trading']
+        overtrading = assessment['overtrading']
         
         bias_detected = False
         bias_type = ""
@@ -192,8 +452,8 @@ def realtime_intervention():
             severity = 6 if overtrading['severity'] == 'High' else 4
             
         if bias_detected:
-            # Generate affective message via Gemini
-            message = gemini_coach.generate_intervention(bias_type, severity, data)
+            # Pre-generated affective message; the pool refills in the background
+            message = intervention_pool.get(bias_type, severity)
             
             # Calculate Human Tax Impact
             human_tax_impact = 0.0
@@ -209,13 +469,21 @@ def realtime_intervention():
                 'bias_type': bias_type,
                 'severity': severity,
                 'intervention_message': message,
-                'human_tax_impact': human_tax_impact
+                'human_tax_impact': human_tax_impact,
+                'session_id': session_id
             })
         else:
-            return jsonify({'bias_detected': False, 'human_tax_impact': 0.0})
+            return jsonify({'bias_detected': False, 'human_tax_impact': 0.0, 'session_id': session_id})
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+# Build the services and app on import. Batch workers spawned while this
+# file runs as a script import it again as __mp_main__; they only run the
+# detectors, so they skip this
+if __name__ != '__mp_main__':
+    init_services()
+    app = create_app()
+
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5001)
@@ -0,0 +1,133 @@
+import heapq
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from bias_detector import BiasDetector
+
+BIASES = {
+    'overtrading': 'Overtrading',
+    'loss_aversion': 'Loss Aversion',
+    'revenge_trading': 'Revenge Trading',
+}
+
+# Tasks per worker: enough to even out stragglers without drowning in IPC
+TASKS_PER_WORKER = 4
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def worker_count():
+    """Pool size: BATCH_WORKERS if set, otherwise one worker per core."""
+    return int(os.environ.get('BATCH_WORKERS', 0)) or os.cpu_count() or 1
+
+
+def get_executor():
+    """
+    Shared process pool, created on first use.
+
+    Workers are spawned rather than forked so they never inherit locks held
+    by the Flask server's threads.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=worker_count(),
+                                            mp_context=multiprocessing.get_context('spawn'))
+        return _executor
+
+
+def analyze_account(trades):
+    """
+    Run every local detector on one account's trades.
+
+    Returns the /api/analyze result shape with rule-based recommendations
+    (no Gemini call), or {'error': ...} if the trades cannot be analyzed.
+    """
+    try:
+        detector = BiasDetector(pd.DataFrame(trades))
+        return {
+            'overtrading': detector.detect_overtrading(),
+            'loss_aversion': detector.detect_loss_aversion(),
+            'revenge_trading': detector.detect_revenge_trading(),
+            'summary': detector.generate_summary(),
+            'recommendations': detector.generate_recommendations(),
+            'statistics': detector.get_statistics()
+        }
+    except Exception as e:
+        return {'error': str(e)}
+
+
+def _analyze_partition(partition):
+    return [(account_id, analyze_account(trades)) for account_id, trades in partition]
+
+
+def partition_accounts(accounts, num_partitions):
+    """
+    Split (account_id, trades) pairs into partitions of similar total size.
+
+    Largest accounts are placed first into the currently lightest partition
+    (LPT scheduling), which keeps one huge account from stalling a worker
+    that was also handed many small ones.
+    """
+    num_partitions = max(1, min(num_partitions, len(accounts)))
+    heap = [(0, i) for i in range(num_partitions)]
+    partitions = [[] for _ in range(num_partitions)]
+    for account_id, trades in sorted(accounts, key=lambda item: len(item[1]), reverse=True):
+        load, i = heapq.heappop(heap)
+        partitions[i].append((account_id, trades))
+        heapq.heappush(heap, (load + len(trades), i))
+    return [p for p in partitions if p]
+
+
+def analyze_accounts(accounts, executor=None, num_workers=None):
+    """
+    Analyze many accounts at once, fanned out across a process pool.
+
+    Args:
+        accounts: Mapping of account id -> list of trade dicts
+        executor: Optional concurrent.futures executor (defaults to the shared pool)
+        num_workers: Worker count used to size the partitions (defaults to worker_count())
+
+    Returns:
+        dict: {'accounts': {account_id: result}, 'aggregate': {...}}
+    """
+    items = list(accounts.items())
+    if len(items) <= 1:
+        results = dict(_analyze_partition(items))
+    else:
+        executor = executor or get_executor()
+        partitions = partition_accounts(items, (num_workers or worker_count()) * TASKS_PER_WORKER)
+        results = {}
+        for partition_results in executor.map(_analyze_partition, partitions):
+            results.update(partition_results)
+
+    # Preserve the caller's account order
+    results = {account_id: results[account_id] for account_id, _ in items}
+    return {'accounts': results, 'aggregate': aggregate_results(results)}
+
+
+def aggregate_results(results):
+    """Desk-level roll-up of per-account results."""
+    analyzed = [r for r in results.values() if 'error' not in r]
+    aggregate = {
+        'accounts': len(results),
+        'analyzed': len(analyzed),
+        'failed': len(results) - len(analyzed),
+        'total_trades': sum(r['statistics']['total_trades'] for r in analyzed),
+        'total_pnl': round(sum(float(r['statistics']['total_pnl']) for r in analyzed), 2),
+        'total_human_tax': round(sum(r['statistics']['human_tax'] for r in analyzed), 2),
+        'biases': {}
+    }
+    for key, name in BIASES.items():
+        flagged = sum(1 for r in analyzed if r[key]['detected'])
+        aggregate['biases'][name] = {
+            'accounts_detected': flagged,
+            'detection_rate': round(flagged / len(analyzed) * 100, 1) if analyzed else 0,
+            'avg_score': round(sum(float(r[key]['score']) for r in analyzed) / len(analyzed), 1) if analyzed else 0
+        }
+    return aggregate
@@ -0,0 +1,157 @@
+"""
+Timing and peak-memory baseline for the bias detection engine.
+
+Builds seeded MockDataGenerator corpora at several sizes and measures:
+  - BiasDetector construction (parsing, sorting, feature columns)
+  - each detector, get_statistics and calculate_human_tax on a cold cache
+  - the full /api/analyze handler through the Flask test client, with
+    Gemini disabled and the result cache bypassed
+
+Each case reports the median and best of --repeat runs, plus the peak
+traced allocation from a separate tracemalloc run, so tracing overhead
+never skews the timings. Save a run with --save and check a later one
+against it with --compare; cases slower than --tolerance are flagged and
+the script exits non-zero.
+
+Usage:
+    python benchmarks/bench_detectors.py
+    python benchmarks/bench_detectors.py --sizes 1000 100000 --save baseline.json
+    python benchmarks/bench_detectors.py --compare baseline.json
+"""
+import argparse
+import gc
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+# Make the top-level modules importable when run from anywhere
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from bias_detector import BiasDetector
+from mock_data_generator import MockDataGenerator
+
+DETECTOR_METHODS = [
+    'detect_overtrading',
+    'detect_loss_aversion',
+    'detect_revenge_trading',
+    'calculate_human_tax',
+    'get_statistics',
+]
+
+
+def make_corpus(size, seed):
+    return MockDataGenerator(num_trades=size, start_date=datetime(2020, 1, 1), seed=seed).generate()
+
+
+def measure(fn, repeat):
+    """(median seconds, best seconds, peak traced MiB) for fn()."""
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return statistics.median(timings), min(timings), peak / 2**20
+
+
+def detector_cases(trades):
+    df = pd.DataFrame(trades)
+    detector = BiasDetector(df)
+
+    def cold(method):
+        def run():
+            # Memoized results would turn every repeat after the first into a lookup
+            detector.invalidate_cache()
+            getattr(detector, method)()
+        return run
+
+    cases = {'BiasDetector()': lambda: BiasDetector(df)}
+    cases.update({method: cold(method) for method in DETECTOR_METHODS})
+    return cases
+
+
+def analyze_case(trades):
+    import app as app_module
+    from analysis_cache import AnalysisCache
+
+    # Local detectors only: no Gemini round-trip, no cached results
+    app_module.gemini_coach.model = None
+    client = app_module.app.test_client()
+    payload = {'trades': trades}
+
+    def run():
+        app_module.analysis_cache = AnalysisCache(max_entries=1)
+        response = client.post('/api/analyze', json=payload)
+        assert response.status_code == 200, response.get_json()
+    return run
+
+
+def run(sizes, seed, repeat):
+    results = {}
+    for size in sizes:
+        trades = make_corpus(size, seed)
+        cases = detector_cases(trades)
+        cases['/api/analyze'] = analyze_case(trades)
+        for name, fn in cases.items():
+            median, best, peak = measure(fn, repeat)
+            results[f'{name} @ {size}'] = {'median_s': median, 'best_s': best, 'peak_mib': peak}
+            print(f"{size:>9,} trades | {name:<24} median {median * 1e3:9.2f} ms  "
+                  f"best {best * 1e3:9.2f} ms  peak {peak:8.1f} MiB")
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Print cases slower than baseline by more than `tolerance`; return how many."""
+    regressions = 0
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        ratio = current['median_s'] / previous['median_s'] if previous['median_s'] else 1
+        flag = 'REGRESSION' if ratio > 1 + tolerance else ''
+        regressions += bool(flag)
+        print(f"{key:<40} {previous['median_s'] * 1e3:9.2f} -> {current['median_s'] * 1e3:9.2f} ms "
+              f"({ratio:5.2f}x)  peak {previous['peak_mib']:.1f} -> {current['peak_mib']:.1f} MiB  {flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000])
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--save', help='write results to this JSON file')
+    parser.add_argument('--compare', help='baseline JSON file from an earlier --save')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='allowed median slowdown vs baseline (default: 0.2 = 20%%)')
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.seed, args.repeat)
+
+    if args.save:
+        Path(args.save).write_text(json.dumps(results, indent=2))
+        print(f"Saved {len(results)} results to {args.save}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        print()
+        if compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+"""
+JSON and compression costs of large /api/analyze traffic.
+
+Compares the stock Flask provider (json module plus a NumPy default())
+with FastJSONProvider (orjson when installed) on seeded MockDataGenerator
+payloads:
+  - decode: an /api/analyze request body (the trades array)
+  - encode: the same trades as a response body (as /api/mock-data sends
+    them) and a weekly /api/timeline result
+  - /api/analyze end to end through the Flask test client, with Gemini
+    disabled and the result cache bypassed
+  - gzip (and br, if brotli is installed) size and time for each body
+  - /api/analyze payload formats: row objects, parallel column arrays
+    and an Arrow IPC stream, decoded into the detector's input frame
+    (time and peak traced memory; buffers Arrow allocates itself are
+    not seen by tracemalloc)
+
+Usage:
+    python benchmarks/bench_json.py
+    python benchmarks/bench_json.py --sizes 10000 200000 --repeat 3
+"""
+import argparse
+import gzip
+import io
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from flask.json.provider import DefaultJSONProvider
+
+# Make the top-level modules importable when run from anywhere
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+import app as app_module
+from analysis_cache import AnalysisCache
+from bias_detector import BiasDetector
+from json_provider import FastJSONProvider, orjson
+from mock_data_generator import MockDataGenerator
+from trade_io import read_arrow_trades, trades_frame
+
+
+class StockJSONProvider(DefaultJSONProvider):
+    """The provider app.py used before: json module plus NumPy default()."""
+    def default(self, obj):
+        if isinstance(obj, np.bool_):
+            return bool(obj)
+        if isinstance(obj, np.integer):
+            return int(obj)
+        if isinstance(obj, np.floating):
+            return float(obj)
+        if isinstance(obj, np.ndarray):
+            return obj.tolist()
+        return super().default(obj)
+
+
+def timed(fn, repeat):
+    """Median seconds of fn() and its last result."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), result
+
+
+def compression_report(label, body, repeat):
+    sizes = [f"raw {len(body) / 2**20:7.2f} MiB"]
+    seconds, packed = timed(lambda: gzip.compress(body, compresslevel=5), repeat)
+    sizes.append(f"gzip {len(packed) / 2**20:6.2f} MiB in {seconds * 1e3:7.1f} ms")
+    try:
+        import brotli
+        seconds, packed = timed(lambda: brotli.compress(body, quality=5), repeat)
+        sizes.append(f"br {len(packed) / 2**20:6.2f} MiB in {seconds * 1e3:7.1f} ms")
+    except ImportError:
+        pass
+    print(f"  {label:<22} " + "  ".join(sizes))
+
+
+def arrow_body(trades):
+    import pyarrow as pa
+
+    frame = pd.DataFrame(trades)
+    frame['Timestamp'] = pd.to_datetime(frame['Timestamp'])
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+
+def payload_report(trades, provider, repeat):
+    """Decode + frame construction for each /api/analyze payload format."""
+    columns = {key: [trade[key] for trade in trades] for key in trades[0]}
+    formats = {
+        'rows': (json.dumps({'trades': trades}).encode(),
+                 lambda body: trades_frame(provider.loads(body)['trades'])),
+        'columns': (json.dumps({'trades': columns}).encode(),
+                    lambda body: trades_frame(provider.loads(body)['trades'])),
+    }
+    try:
+        formats['arrow'] = (arrow_body(trades), read_arrow_trades)
+    except ImportError:
+        pass
+
+    for name, (body, parse) in formats.items():
+        seconds, _ = timed(lambda: parse(body), repeat)
+        tracemalloc.start()
+        try:
+            parse(body)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        print(f"  payload {name:<8} body {len(body) / 2**20:6.2f} MiB  parse {seconds * 1e3:8.1f} ms  "
+              f"peak {peak / 2**20:7.1f} MiB")
+
+
+def run(size, seed, repeat):
+    app = app_module.app
+    app_module.gemini_coach.model = None  # Local recommendations only
+    providers = {'stock': StockJSONProvider(app), 'fast': FastJSONProvider(app)}
+
+    trades = MockDataGenerator(num_trades=size, start_date=datetime(2020, 1, 1), seed=seed).generate()
+    request_body = json.dumps({'trades': trades}).encode()
+    timeline = BiasDetector(pd.DataFrame(trades)).timeline(7)
+
+    print(f"\n{size:,} trades (request body {len(request_body) / 2**20:.1f} MiB)")
+    with app.app_context():
+        for name, provider in providers.items():
+            decode, _ = timed(lambda: provider.loads(request_body), repeat)
+            encode_trades, _ = timed(lambda: provider.response(trades).get_data(), repeat)
+            encode_timeline, _ = timed(lambda: provider.response(timeline).get_data(), repeat)
+
+            app.json = provider
+            client = app.test_client()
+
+            def analyze():
+                app_module.analysis_cache = AnalysisCache(max_entries=1)
+                response = client.post('/api/analyze', data=request_body, content_type='application/json')
+                assert response.status_code == 200, response.get_json()
+            end_to_end, _ = timed(analyze, repeat)
+
+            print(f"  {name:<6} decode {decode * 1e3:8.1f} ms  encode trades {encode_trades * 1e3:8.1f} ms  "
+                  f"encode timeline {encode_timeline * 1e3:7.1f} ms  /api/analyze {end_to_end * 1e3:8.1f} ms")
+
+        app.json = providers['fast']
+        compression_report('trades response', app.json.response(trades).get_data(), repeat)
+        compression_report('timeline response', app.json.response(timeline).get_data(), repeat)
+        payload_report(trades, app.json, repeat)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"orjson {'installed' if orjson is not None else 'not installed (fast provider uses json)'}")
+    for size in args.sizes:
+        run(size, args.seed, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,306 @@
+"""
+Load test for /api/realtime and /api/analyze on one local node.
+
+Starts app.py in a subprocess (threaded Flask server, GeminiCoach replaced
+by a stub that sleeps --gemini-latency seconds and returns canned text),
+then drives each endpoint with closed-loop virtual users over keep-alive
+HTTP/1.1 connections from an asyncio client. Every --concurrency level runs
+for --duration seconds, after a short warm-up, and reports throughput and
+latency percentiles, so the level where p99 climbs is easy to spot.
+
+Traffic is replayed from seeded MockDataGenerator data:
+  - realtime: each user keeps its own session_id; the first call seeds the
+    session with history, later calls send one trade attempt each
+  - analyze: full trade logs cycled from a pool larger than the result
+    cache, so requests exercise the detectors rather than cache hits
+
+Only the standard library, numpy and the app's own dependencies are used.
+
+Usage:
+    python benchmarks/bench_load.py
+    python benchmarks/bench_load.py --endpoints realtime --concurrency 1 8 32 --duration 20
+    python benchmarks/bench_load.py --url http://127.0.0.1:5001 --json results.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import numpy as np
+
+# Make the top-level modules importable when run from anywhere
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from gemini_coach import (ANALYSIS_CONCURRENCY, ANALYSIS_MAX_WINDOW_TOKENS, ANALYSIS_MAX_WINDOWS,
+                          ANALYSIS_WINDOW_TOKENS)
+from mock_data_generator import MockDataGenerator
+
+
+class StubCoach:
+    """Stands in for GeminiCoach: fixed latency, canned responses, no network."""
+    def __init__(self, latency):
+        self.latency = latency
+        self.api_key = 'stub'
+        self.model = 'stub'
+
+    def generate_recommendations(self, bias_analysis):
+        time.sleep(self.latency)
+        return [{'bias': 'General', 'recommendation': 'Stick to your trading plan.', 'priority': 'Low'}]
+
+    def generate_intervention(self, bias_type, severity, trade_data):
+        time.sleep(self.latency)
+        return f"You're at risk of {bias_type}. Is this a strategy or a reaction?"
+
+    def request_intervention(self, bias_type, severity, trade_data):
+        time.sleep(self.latency)
+        return f"You're at risk of {bias_type}. Is this a strategy or a reaction?"
+
+    def analyze_trade_data(self, trade_data, local_scores=None, window_tokens=ANALYSIS_WINDOW_TOKENS,
+                           concurrency=ANALYSIS_CONCURRENCY, max_windows=ANALYSIS_MAX_WINDOWS,
+                           max_window_tokens=ANALYSIS_MAX_WINDOW_TOKENS, progress=None):
+        if progress:
+            progress(0.0, 'gemini')
+        time.sleep(self.latency)
+        if progress:
+            progress(1.0, 'gemini')
+        return {'biases': dict(local_scores or {}), 'primary_bias': 'None', 'discipline_score': 50,
+                'human_tax_estimate': 0, 'coaching_insight': 'Stub analysis.',
+                'trades_analyzed': len(trade_data)}
+
+
+def serve(port, gemini_latency):
+    """Run app.py's Flask app with the stubbed coach (subprocess entry point)."""
+    import app as app_module
+    from intervention_pool import InterventionPool
+
+    app_module.gemini_coach = StubCoach(gemini_latency)
+    app_module.intervention_pool = InterventionPool(app_module.gemini_coach)
+    app_module.intervention_pool.start()
+    app_module.app.run(host='127.0.0.1', port=port, threaded=True, debug=False)
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port, gemini_latency, timeout=60):
+    env = dict(os.environ, GEMINI_API_KEY='')
+    process = subprocess.Popen(
+        [sys.executable, __file__, '--serve', '--port', str(port), '--gemini-latency', str(gemini_latency)],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'Server exited with code {process.returncode}')
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.5).close()
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f'Server did not start within {timeout}s')
+
+
+class HttpConnection:
+    """Minimal keep-alive HTTP/1.1 client over asyncio streams."""
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = self.writer = None
+
+    async def request(self, method, path, body=b''):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        self.writer.write(
+            f'{method} {path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n'
+            f'Content-Type: application/json\r\nContent-Length: {len(body)}\r\n'
+            f'Connection: keep-alive\r\n\r\n'.encode() + body
+        )
+        await self.writer.drain()
+
+        status = int((await self.reader.readline()).split()[1])
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            payload = b''
+            while True:
+                size = int((await self.reader.readline()).split(b';')[0], 16)
+                if size == 0:
+                    await self.reader.readline()
+                    break
+                payload += await self.reader.readexactly(size)
+                await self.reader.readexactly(2)
+        elif 'content-length' in headers:
+            payload = await self.reader.readexactly(int(headers['content-length']))
+        else:
+            payload = await self.reader.read()
+            headers['connection'] = 'close'
+
+        if headers.get('connection', '').lower() == 'close':
+            await self.close()
+        return status, payload
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+        self.reader = self.writer = None
+
+
+class RealtimeUser:
+    """One extension user: a session seeded with history, then single trade attempts."""
+    def __init__(self, seed):
+        start = datetime(2024, 1, 1)
+        self.history = MockDataGenerator(num_trades=50, start_date=start, seed=seed).generate()
+        self.clock = datetime.fromisoformat(self.history[-1]['Timestamp'])
+        self.rng = np.random.default_rng(seed)
+        self.session_id = None
+
+    def next_body(self):
+        self.clock += timedelta(minutes=int(self.rng.integers(1, 30)))
+        body = {
+            'action': 'buy' if self.rng.random() < 0.5 else 'sell',
+            'asset': str(self.rng.choice(['AAPL', 'TSLA', 'BTC', 'ETH'])),
+            'price': 100.0,
+            'timestamp': self.clock.isoformat()
+        }
+        if self.session_id is None:
+            self.session_id = str(uuid.uuid4())
+            body['history'] = self.history
+        body['session_id'] = self.session_id
+        return json.dumps(body).encode()
+
+
+def analyze_bodies(count, trades, seed):
+    return [
+        json.dumps({'trades': MockDataGenerator(num_trades=trades, start_date=datetime(2024, 1, 1),
+                                                seed=seed + i).generate()}).encode()
+        for i in range(count)
+    ]
+
+
+async def run_level(host, port, endpoint, concurrency, duration, warmup, args):
+    """Closed-loop load at one concurrency level; returns latencies (s) and error count."""
+    latencies, errors = [], 0
+    measuring = False
+    bodies = analyze_bodies(args.analyze_pool, args.analyze_trades, args.seed) if endpoint == 'analyze' else None
+    next_body = [0]
+
+    async def user(index):
+        nonlocal errors
+        connection = HttpConnection(host, port)
+        realtime = RealtimeUser(args.seed + index) if endpoint == 'realtime' else None
+        try:
+            while not stop.is_set():
+                if realtime is not None:
+                    path, body = '/api/realtime', realtime.next_body()
+                else:
+                    path, body = '/api/analyze', bodies[next_body[0] % len(bodies)]
+                    next_body[0] += 1
+                start = time.perf_counter()
+                try:
+                    status, _ = await connection.request('POST', path, body)
+                    ok = status == 200
+                except (OSError, asyncio.IncompleteReadError, ValueError, IndexError):
+                    await connection.close()
+                    ok = False
+                if measuring:
+                    if ok:
+                        latencies.append(time.perf_counter() - start)
+                    else:
+                        errors += 1
+        finally:
+            await connection.close()
+
+    stop = asyncio.Event()
+    tasks = [asyncio.create_task(user(i)) for i in range(concurrency)]
+    await asyncio.sleep(warmup)
+    measuring = True
+    started = time.perf_counter()
+    await asyncio.sleep(duration)
+    measuring = False
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await asyncio.gather(*tasks)
+    return latencies, errors, elapsed
+
+
+def summarize(endpoint, concurrency, latencies, errors, elapsed):
+    result = {'endpoint': endpoint, 'concurrency': concurrency, 'requests': len(latencies),
+              'errors': errors, 'throughput_rps': len(latencies) / elapsed}
+    if latencies:
+        p50, p90, p99 = np.percentile(np.array(latencies) * 1e3, [50, 90, 99])
+        result.update(p50_ms=p50, p90_ms=p90, p99_ms=p99, max_ms=max(latencies) * 1e3)
+    print(f"{endpoint:<9} c={concurrency:<4} {result['throughput_rps']:8.1f} req/s  "
+          f"p50 {result.get('p50_ms', 0):8.1f}  p90 {result.get('p90_ms', 0):8.1f}  "
+          f"p99 {result.get('p99_ms', 0):8.1f}  max {result.get('max_ms', 0):8.1f} ms  errors {errors}")
+    return result
+
+
+async def run(args):
+    target = urlsplit(args.url) if args.url else None
+    host = target.hostname if target else '127.0.0.1'
+    port = target.port if target else free_port()
+    server = None if target else start_server(port, args.gemini_latency)
+    try:
+        results = []
+        for endpoint in args.endpoints:
+            for concurrency in args.concurrency:
+                latencies, errors, elapsed = await run_level(
+                    host, port, endpoint, concurrency, args.duration, args.warmup, args)
+                results.append(summarize(endpoint, concurrency, latencies, errors, elapsed))
+        return results
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--endpoints', nargs='+', choices=['realtime', 'analyze'], default=['realtime', 'analyze'])
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16, 64])
+    parser.add_argument('--duration', type=float, default=10, help='measured seconds per level')
+    parser.add_argument('--warmup', type=float, default=2, help='unmeasured seconds per level')
+    parser.add_argument('--gemini-latency', type=float, default=0.0, help='stubbed Gemini call time in seconds')
+    parser.add_argument('--analyze-trades', type=int, default=500, help='trades per /api/analyze request')
+    parser.add_argument('--analyze-pool', type=int, default=128, help='distinct /api/analyze payloads')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--url', help='target an already running server instead of starting one')
+    parser.add_argument('--json', help='write results to this JSON file')
+    parser.add_argument('--serve', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--port', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.port, args.gemini_latency)
+        return
+
+    results = asyncio.run(run(args))
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+        print(f"Saved {len(results)} results to {args.json}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Per-row memory footprint of the BiasDetector frame.
+
+Compares the legacy layout (object Asset/Buy/sell strings, Python date
+objects, int64 features) with the compact ingest path, with float64 and
+float32 P/L, on seeded MockDataGenerator data.
+
+Usage:
+    python benchmarks/bench_memory.py
+    python benchmarks/bench_memory.py --sizes 100000
+"""
+import argparse
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Make the top-level modules importable when run from anywhere
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from bias_detector import BiasDetector
+from mock_data_generator import MockDataGenerator
+
+
+def legacy_frame(df):
+    """Rebuild the frame layout BiasDetector used before compact ingestion."""
+    df = df.copy()
+    df['Timestamp'] = pd.to_datetime(df['Timestamp'])
+    df['P/L'] = pd.to_numeric(df['P/L'], errors='coerce')
+    df = df.dropna(subset=['Timestamp', 'P/L']).sort_values('Timestamp')
+    df['Date'] = df['Timestamp'].dt.date
+    df['Is_Loss'] = df['P/L'] < 0
+    df['Is_Win'] = df['P/L'] > 0
+    df['Time_Since_Prev'] = df['Timestamp'].diff().dt.total_seconds() / 60
+    df['Prev_PL'] = df['P/L'].shift(1)
+    df['Prev_Is_Loss'] = df['Is_Loss'].shift(1)
+    df['Prev_Asset'] = df['Asset'].shift(1)
+    df['Consecutive_Losses'] = np.zeros(len(df), dtype=np.int64)
+    df['Daily_Trade_Num'] = df.groupby('Date').cumcount() + 1
+    return df
+
+
+def bytes_per_row(df):
+    return df.memory_usage(deep=True).sum() / len(df)
+
+
+def run(size, seed):
+    trades = MockDataGenerator(num_trades=size, start_date=datetime(2020, 1, 1), seed=seed).generate()
+    raw = pd.DataFrame(trades)
+
+    layouts = {
+        'raw upload': raw,
+        'legacy': legacy_frame(raw),
+        'compact': BiasDetector(raw).df,
+        'compact float32': BiasDetector(raw, pnl_dtype='float32').df,
+    }
+    legacy = bytes_per_row(layouts['legacy'])
+    for name, frame in layouts.items():
+        per_row = bytes_per_row(frame)
+        print(f"{size:>9,} trades | {name:<16} {per_row:7.1f} B/row "
+              f"{per_row * size / 2**20:8.1f} MiB  ({per_row / legacy:.2f}x legacy)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        run(size, args.seed)
+
+
+if __name__ == '__main__':
+    main()
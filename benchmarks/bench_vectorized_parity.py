@@ -0,0 +1,111 @@
+"""
+Parity benchmark for the vectorized loss-streak and Human Tax engine.
+
+Runs the legacy row-by-row implementations (kept here verbatim as the
+reference) against BiasDetector on seeded MockDataGenerator data and fails
+if any output differs.
+
+Usage:
+    python benchmarks/bench_vectorized_parity.py
+    python benchmarks/bench_vectorized_parity.py --sizes 10000 100000
+"""
+import argparse
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+# Make the top-level modules importable when run from anywhere
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from bias_detector import BiasDetector
+from mock_data_generator import MockDataGenerator
+
+
+def legacy_consecutive_losses(df):
+    """Original iterrows/.at streak loop from detect_revenge_trading."""
+    df = df.copy()
+    df['Consecutive_Losses'] = 0
+    consecutive_count = 0
+    for idx, row in df.iterrows():
+        if row['Is_Loss']:
+            consecutive_count += 1
+        else:
+            consecutive_count = 0
+        df.at[idx, 'Consecutive_Losses'] = consecutive_count
+    return df['Consecutive_Losses']
+
+
+def legacy_human_tax(df):
+    """Original calculate_human_tax: copy, re-sort and walk every row."""
+    human_tax = 0.0
+
+    df = df.copy()
+    df['Timestamp'] = pd.to_datetime(df['Timestamp'])
+    df = df.sort_values('Timestamp')
+    df['Date'] = df['Timestamp'].dt.date
+
+    df['TimeDiff'] = df['Timestamp'].diff().dt.total_seconds() / 60.0
+    df['PrevPL'] = df['P/L'].shift(1)
+    df['PrevIsLoss'] = df['PrevPL'] < 0
+
+    trade_counts = df.groupby('Date').cumcount() + 1
+    df['DailyTradeNum'] = trade_counts.values
+
+    for index, row in df.iterrows():
+        if row['P/L'] >= 0:
+            continue
+
+        is_biased = False
+        if row['DailyTradeNum'] > 8:
+            is_biased = True
+        if pd.notna(row['TimeDiff']) and row['TimeDiff'] < 1.0:
+            is_biased = True
+        if pd.notna(row['TimeDiff']) and row['TimeDiff'] < 15.0 and row['PrevIsLoss']:
+            is_biased = True
+
+        if is_biased:
+            human_tax += abs(row['P/L'])
+
+    return round(human_tax, 2)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def run(size, seed):
+    trades = MockDataGenerator(num_trades=size, start_date=datetime(2020, 1, 1), seed=seed).generate()
+    detector = BiasDetector(pd.DataFrame(trades))
+    frame = detector.df[['Timestamp', 'Buy/sell', 'Asset', 'P/L', 'Is_Loss']]
+
+    legacy_streaks, legacy_streak_time = timed(legacy_consecutive_losses, frame)
+    legacy_tax, legacy_tax_time = timed(legacy_human_tax, frame)
+    tax, tax_time = timed(detector.calculate_human_tax)
+
+    streaks_match = (legacy_streaks.to_numpy() == detector.df['Consecutive_Losses'].to_numpy()).all()
+    tax_match = legacy_tax == tax
+
+    print(f"{size:>9,} trades | streaks: legacy {legacy_streak_time:8.2f}s, "
+          f"match={streaks_match} | human tax: legacy {legacy_tax_time:8.2f}s, "
+          f"vectorized {tax_time:.4f}s, {legacy_tax} vs {tax}, match={tax_match}")
+    return streaks_match and tax_match
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    ok = all([run(size, args.seed) for size in args.sizes])
+    print("✅ Parity confirmed" if ok else "❌ Parity mismatch")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
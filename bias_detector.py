@@ -5,32 +5,508 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 from collections import defaultdict
+import functools
+from pandas.api.types import union_categoricals
+
+
+def _memoized(method):
+    """
+    Cache a zero-argument BiasDetector method's result for the current frame.
+    
+    Results are shared between callers, so treat them as read-only. The cache
+    is dropped whenever self.df is reassigned or invalidate_cache() is called.
+    """
+    @functools.wraps(method)
+    def wrapper(self):
+        if method.__name__ not in self._cache:
+            self._cache[method.__name__] = method(self)
+        return self._cache[method.__name__]
+    return wrapper
+
+
+def score_overtrading(avg_trades_per_day, max_trades_per_day, rapid_trade_pct,
+                      frequency_increase_ratio, cost_to_return_ratio, total_net_return):
+    """
+    Score overtrading from its pattern metrics (callers cap the result at 100).
+    
+    Kept separate from the metric computation so batch and streaming
+    detection apply identical rules.
+    """
+    score = 0
+    
+    # Pattern 1: Excessively high trades per day (threshold: >10/day average or >25/day max for manual traders)
+    if avg_trades_per_day > 10:
+        score += min(25, (avg_trades_per_day / 10) * 10)
+    if max_trades_per_day > 25:
+        score += min(20, (max_trades_per_day / 25) * 10)
+    
+    # Pattern 2: Rapid-fire trades (>20% within 1 minute)
+    if rapid_trade_pct > 20:
+        score += min(25, (rapid_trade_pct / 20) * 10)
+    elif rapid_trade_pct > 10:
+        score += min(15, (rapid_trade_pct / 10) * 5)
+    
+    # Pattern 3: Increasing frequency after small moves (ratio > 3.0 indicates faster trading)
+    if frequency_increase_ratio > 3.0:
+        score += min(10, (frequency_increase_ratio / 3.0) * 6)
+    
+    # Pattern 4: High transaction costs relative to returns (>80% of net return)
+    if cost_to_return_ratio > 0.8 and total_net_return > 0:
+        score += min(10, (cost_to_return_ratio / 0.8) * 6)
+    elif cost_to_return_ratio > 1.5:
+        score += 15  # Costs greatly exceed returns
+    
+    return score
+
+
+def score_revenge_trading(size_increase_ratio, rapid_same_asset_pct, emotional_cluster_pct,
+                          escalation_ratio, avg_time_after_loss, avg_time_after_win,
+                          win_rate_after_loss):
+    """Score revenge trading from its pattern metrics (callers cap the result at 100)."""
+    score = 0
+    
+    # Pattern 1: Sharp increase in trade size after large loss (>50% increase)
+    if size_increase_ratio > 1.5:
+        score += 30
+    elif size_increase_ratio > 1.3:
+        score += 20
+    
+    # Pattern 2: Rapid re-entry into same asset (>30% of trades)
+    if rapid_same_asset_pct > 40:
+        score += 25
+    elif rapid_same_asset_pct > 25:
+        score += 15
+    
+    # Pattern 3: Emotional clustering (>50% within 15 minutes)
+    if emotional_cluster_pct > 50:
+        score += 30
+    elif emotional_cluster_pct > 30:
+        score += 20
+    
+    # Pattern 4: Escalating risk after consecutive losses
+    if escalation_ratio > 1.4:
+        score += 25
+    elif escalation_ratio > 1.2:
+        score += 15
+    
+    # Additional: Much faster trading after losses
+    if avg_time_after_loss < avg_time_after_win * 0.4:
+        score += 15
+    
+    # Poor win rate after losses suggests emotional trading
+    if win_rate_after_loss < 35:
+        score += 15
+    
+    return score
+
+
+def score_loss_aversion(risk_reward_ratio, loss_escalation, loss_to_win_ratio,
+                        cutting_winners_pattern, median_win, median_loss):
+    """Score loss aversion from its pattern metrics (callers cap the result at 100)."""
+    score = 0
+    
+    # Pattern 1: Small gains, large losses (poor risk-reward)
+    if risk_reward_ratio < 0.7:
+        score += 35  # Very poor ratio
+    elif risk_reward_ratio < 1.0:
+        score += 25
+    elif risk_reward_ratio < 1.3:
+        score += 15
+    
+    # Pattern 2: Losses escalating (holding losers longer)
+    if loss_escalation > 1.5:
+        score += 25
+    elif loss_escalation > 1.2:
+        score += 15
+    
+    # Pattern 3: Large losses relative to wins (breaching thresholds)
+    if loss_to_win_ratio > 3.0:
+        score += 30
+    elif loss_to_win_ratio > 2.0:
+        score += 20
+    
+    # Pattern 4: Cutting winners short (high win rate, low avg win)
+    if cutting_winners_pattern:
+        score += 20
+    
+    # Additional: Median analysis - if median loss >> median win
+    if median_loss > median_win * 2:
+        score += 15
+    
+    return score
+
+
+def build_recommendations(overtrading, loss_aversion, revenge_trading):
+    """Rule-based recommendations from the three detector results."""
+    recommendations = []
+    
+    if overtrading['detected']:
+        avg_trades = overtrading['metrics']['avg_trades_per_day']
+        recommendations.append({
+            'bias': 'Overtrading',
+            'recommendation': f'Set a daily trade limit of {max(5, int(avg_trades * 0.5))} trades per day',
+            'priority': 'High' if overtrading['severity'] == 'High' else 'Medium'
+        })
+        recommendations.append({
+            'bias': 'Overtrading',
+            'recommendation': 'Implement a mandatory 30-minute cooldown period between trades',
+            'priority': 'Medium'
+        })
+    
+    if loss_aversion['detected']:
+        rr_ratio = loss_aversion['metrics']['risk_reward_ratio']
+        recommendations.append({
+            'bias': 'Loss Aversion',
+            'recommendation': f'Set stop-loss orders at 2% and take-profit at {max(3, int(rr_ratio * 2))}% to improve risk-reward ratio',
+            'priority': 'High' if loss_aversion['severity'] == 'High' else 'Medium'
+        })
+        recommendations.append({
+            'bias': 'Loss Aversion',
+            'recommendation': 'Use trailing stop-losses to let winners run while protecting gains',
+            'priority': 'Medium'
+        })
+    
+    if revenge_trading['detected']:
+        recommendations.append({
+            'bias': 'Revenge Trading',
+            'recommendation': 'Implement a mandatory 2-hour break after any losing trade',
+            'priority': 'High' if revenge_trading['severity'] == 'High' else 'Medium'
+        })
+        recommendations.append({
+            'bias': 'Revenge Trading',
+            'recommendation': 'Reduce position size by 50% for the next 3 trades after a loss',
+            'priority': 'Medium'
+        })
+    
+    # General recommendations
+    if not recommendations:
+        recommendations.append({
+            'bias': 'General',
+            'recommendation': 'Maintain a trading journal to track emotions and decisions',
+            'priority': 'Low'
+        })
+        recommendations.append({
+            'bias': 'General',
+            'recommendation': 'Review your trading plan weekly and stick to predefined rules',
+            'priority': 'Low'
+        })
+    
+    return recommendations
+
+
+# Relative width of the log-spaced P/L buckets used by BiasDetector.timeline
+TIMELINE_GAMMA = 1.02
+# Magnitudes below the largest |P/L| divided by this share the lowest bucket
+TIMELINE_MAX_RANGE = 1e6
+# Day x bucket cells per histogram; past it the buckets get wider
+TIMELINE_MAX_CELLS = 500_000
+
+# Crowd-favourite tickers for the herd mentality heuristic
+POPULAR_ASSETS = ['TSLA', 'NVDA', 'AAPL']
+
+
+def _excess_score(rate, baseline):
+    """0-100 score for how far `rate` exceeds its chance level (3x chance -> 100)."""
+    if baseline <= 0:
+        return 0.0
+    return float(np.clip((rate / baseline - 1) * 50, 0, 100))
+
+
+def _rolling_sum(daily, window):
+    """Trailing `window`-day sums of per-day rows (axis 0), one per day."""
+    cumulative = np.concatenate([np.zeros((1,) + daily.shape[1:]), np.cumsum(daily, axis=0)])
+    ends = np.arange(1, len(daily) + 1)
+    return cumulative[ends] - cumulative[np.maximum(ends - window, 0)]
+
+
+def _window_quantile(counts, sums, q):
+    """
+    Approximate quantile of each window's values from its bucket histogram.
+    
+    Mirrors pandas' linear interpolation between order statistics, with each
+    order statistic read as the mean of the bucket it falls in.
+    """
+    n = counts.sum(axis=1)
+    rank = q * np.maximum(n - 1, 0)
+    lower = np.floor(rank)
+    upper = np.minimum(lower + 1, np.maximum(n - 1, 0))
+    cumulative = np.cumsum(counts, axis=1)
+    means = sums / np.where(counts > 0, counts, 1)
+    
+    def value_at(order):
+        bucket = np.minimum((cumulative <= order[:, None]).sum(axis=1), counts.shape[1] - 1)
+        return np.take_along_axis(means, bucket[:, None], axis=1)[:, 0]
+    
+    lower_value, upper_value = value_at(lower), value_at(upper)
+    return np.where(n > 0, lower_value + (upper_value - lower_value) * (rank - lower), np.nan)
+
+
+def _window_extreme_mean(counts, sums, k, largest):
+    """Approximate mean of the k largest (or smallest) values in each window."""
+    if largest:
+        counts, sums = counts[:, ::-1], sums[:, ::-1]
+    before = np.cumsum(counts, axis=1) - counts
+    taken = np.minimum(counts, np.maximum(k[:, None] - before, 0))
+    means = sums / np.where(counts > 0, counts, 1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (means * taken).sum(axis=1) / taken.sum(axis=1)
+
+
+def parse_timestamps(values):
+    """
+    Naive datetime64[ns] timestamps from a column of strings or datetimes.
+    
+    Timezone-aware values (e.g. ISO strings ending in 'Z') are converted to
+    UTC, as streaming_detector.parse_timestamp does; naive ones are kept.
+    """
+    return pd.to_datetime(values, utc=True).dt.tz_localize(None).astype('datetime64[ns]')
+
+
+def _aggregate(frame, key):
+    """Per-`key` (per trader and `key` with a Trader column) trade aggregates."""
+    keys = ['Trader', key] if 'Trader' in frame else key
+    return frame.groupby(keys, observed=True).agg(
+        trades=('P/L', 'size'),
+        wins=('Is_Win', 'sum'),
+        losses=('Is_Loss', 'sum'),
+        pnl=('P/L', 'sum'),
+        first_trade=('Timestamp', 'min'),
+        last_trade=('Timestamp', 'max'),
+    )
+
+
+def _merge_aggregates(head, tail, frame):
+    """
+    Aggregates of two trade sets from the aggregates of each, indexed like
+    _aggregate(frame, ...) on the combined trades.
+    """
+    both = pd.concat([head, tail])
+    merged = both.groupby(level=list(range(both.index.nlevels)), observed=True).agg(
+        {'trades': 'sum', 'wins': 'sum', 'losses': 'sum', 'pnl': 'sum',
+         'first_trade': 'min', 'last_trade': 'max'})
+    # concat turns categorical levels with different categories into object
+    levels = [
+        pd.CategoricalIndex(merged.index.get_level_values(name), categories=frame[name].cat.categories, name=name)
+        if isinstance(frame[name].dtype, pd.CategoricalDtype) else merged.index.get_level_values(name)
+        for name in merged.index.names
+    ]
+    merged.index = pd.MultiIndex.from_arrays(levels) if len(levels) > 1 else levels[0]
+    return merged.sort_index()
+
+
+def _cumulative_at(cumulative, bucket):
+    """Per-window value of a cumulative histogram at the given bucket (-1 -> 0)."""
+    padded = np.concatenate([np.zeros((len(cumulative), 1)), cumulative], axis=1)
+    return np.take_along_axis(padded, (bucket + 1)[:, None], axis=1)[:, 0]
+
 
 class BiasDetector:
-    def __init__(self, df):
+    def __init__(self, df, pnl_dtype='float64'):
         """
         Initialize the Bias Detector with trading data.
         
+        Only the trade columns are kept, in compact dtypes: nanosecond
+        datetime64 timestamps, categorical Asset and Buy/sell, and an int32
+        day index (days since epoch) instead of Python date objects.
+        Timezone-aware timestamps are converted to naive UTC.
+        
+        An optional Trader column marks several accounts in one frame; trades
+        are then ordered per trader and every per-trade feature restarts at
+        trader boundaries (see score_traders).
+        
         Args:
             df: DataFrame with columns: Timestamp, Buy/sell, Asset, P/L
+                (and optionally Trader)
+            pnl_dtype: 'float64' (default) or 'float32' to halve P/L memory
+                at the cost of ~7 significant digits
         """
-        self.df = df.copy()
-        self.df['Timestamp'] = pd.to_datetime(self.df['Timestamp'])
-        self.df['P/L'] = pd.to_numeric(self.df['P/L'], errors='coerce')
-        
-        # Remove rows with invalid data
-        self.df = self.df.dropna(subset=['Timestamp', 'P/L'])
+        self._cache = {}
+        self.df = self._prepare(df, pnl_dtype)
         
         if len(self.df) == 0:
             raise ValueError("No valid trading data found after processing")
         
-        self.df = self.df.sort_values('Timestamp')
-        self.df['Date'] = self.df['Timestamp'].dt.date
+        self._build_features()
+    
+    @staticmethod
+    def _prepare(df, pnl_dtype):
+        """Compact, cleaned and time-sorted trade columns (without features)."""
+        frame = pd.DataFrame({
+            'Timestamp': parse_timestamps(df['Timestamp']),
+            'Buy/sell': df['Buy/sell'].astype('category') if 'Buy/sell' in df else None,
+            'Asset': df['Asset'].astype('category'),
+            'P/L': pd.to_numeric(df['P/L'], errors='coerce').astype(pnl_dtype)
+        })
+        if 'Trader' in df:
+            frame['Trader'] = df['Trader'].astype('category')
+        
+        # Remove rows with invalid data
+        frame = frame.dropna(subset=['Timestamp', 'P/L'])
+        
+        sort_keys = ['Trader', 'Timestamp'] if 'Trader' in frame else 'Timestamp'
+        frame = frame.sort_values(sort_keys, kind='mergesort').reset_index(drop=True)
+        frame['Day'] = frame['Timestamp'].to_numpy().astype('datetime64[D]').astype(np.int32)
         
         # Calculate additional metrics
-        self.df['Is_Loss'] = self.df['P/L'] < 0
-        self.df['Is_Win'] = self.df['P/L'] > 0
+        frame['Is_Loss'] = frame['P/L'] < 0
+        frame['Is_Win'] = frame['P/L'] > 0
+        return frame
+    
+    @property
+    def df(self):
+        return self._df
+    
+    @df.setter
+    def df(self, value):
+        # Swapping the frame makes every memoized result stale
+        self._df = value
+        self.invalidate_cache()
+    
+    def invalidate_cache(self):
+        """Drop memoized results, e.g. after mutating self.df in place."""
+        self._cache.clear()
+    
+    FEATURE_COLUMNS = ['Time_Since_Prev', 'Prev_PL', 'Prev_Is_Loss', 'Prev_Asset',
+                       'Consecutive_Losses', 'Daily_Trade_Num', 'Trades_Last_Hour']
+    
+    def extend(self, df):
+        """
+        Detector over this detector's trades plus the trades in `df`.
+        
+        The existing trades are not parsed again. When no new trade is older
+        than the last known one (an appended log), features are computed only
+        for the new rows, using just enough of the existing frame as
+        look-back context; otherwise the combined frame is re-sorted and
+        featurized in full. Results match BiasDetector on the combined trades.
+        """
+        prefix = self.df
+        tail = self._prepare(df, prefix['P/L'].dtype)
+        if ('Trader' in tail) != ('Trader' in prefix):
+            raise ValueError("Cannot extend: both frames need the same columns")
+        if len(tail) == 0:
+            return self
+        
+        combined = pd.DataFrame({
+            col: union_categoricals([prefix[col], tail[col]], sort_categories=True)
+            if isinstance(prefix[col].dtype, pd.CategoricalDtype) and isinstance(tail[col].dtype, pd.CategoricalDtype)
+            else pd.concat([prefix[col], tail[col]], ignore_index=True)
+            for col in tail.columns
+        })
+        
+        if 'Trader' in combined or tail['Timestamp'].iloc[0] < prefix['Timestamp'].iloc[-1]:
+            sort_keys = ['Trader', 'Timestamp'] if 'Trader' in combined else 'Timestamp'
+            combined = combined.sort_values(sort_keys, kind='mergesort').reset_index(drop=True)
+            self._add_features(combined)
+            return self._from_frame(combined)
+        
+        # Every feature only looks back, so the new rows just need the
+        # existing trades that any of them can still see
+        start = self._lookback_start()
+        context = combined.iloc[start:].reset_index(drop=True)
+        self._add_features(context)
+        new_rows = context.iloc[len(prefix) - start:]
+        for col in self.FEATURE_COLUMNS:
+            head = prefix[col]
+            if isinstance(head.dtype, pd.CategoricalDtype):
+                head = head.cat.set_categories(new_rows[col].cat.categories)
+            combined[col] = pd.concat([head, new_rows[col]], ignore_index=True)
+        
+        detector = self._from_frame(combined)
+        # Fold the new trades into the aggregate tables instead of rebuilding them
+        for name, key in (('daily_aggregates', 'Day'), ('asset_aggregates', 'Asset')):
+            if name in self._cache:
+                detector._cache[name] = _merge_aggregates(self._cache[name], _aggregate(tail, key), combined)
+        return detector
+    
+    def _lookback_start(self):
+        """First row a trade appended after the last one can depend on."""
+        timestamps = self.df['Timestamp'].to_numpy()
+        days = self.df['Day'].to_numpy()
+        non_losses = np.flatnonzero(~self.df['Is_Loss'].to_numpy())
+        
+        # Trailing-hour window, the last day's trade ordinals, the open losing streak
+        hour_start = np.searchsorted(timestamps, timestamps[-1] - np.timedelta64(60, 'm'), side='right')
+        day_start = np.searchsorted(days, days[-1], side='left')
+        streak_start = non_losses[-1] if len(non_losses) else 0
+        return int(min(hour_start, day_start, streak_start, len(self.df) - 1))
+    
+    @classmethod
+    def _from_frame(cls, frame):
+        detector = cls.__new__(cls)
+        detector._cache = {}
+        detector.df = frame
+        return detector
+    
+    def _build_features(self):
+        """
+        Compute the per-trade feature columns shared by every detector.
+        
+        Runs once on the parsed, time-sorted frame so the detectors only read
+        from self.df instead of re-deriving shifts and diffs on each call.
+        With a Trader column every feature restarts at each trader's first
+        trade, so one pass covers all traders.
+        """
+        self._add_features(self.df)
+    
+    @staticmethod
+    def _add_features(frame):
+        n = len(frame)
+        if 'Trader' in frame:
+            codes = frame['Trader'].cat.codes.to_numpy()
+            group_start = np.concatenate(([True], codes[1:] != codes[:-1]))
+        else:
+            codes = None
+            group_start = np.zeros(n, dtype=bool)
+            group_start[0] = True
+        
+        # Minutes since the previous trade (NaN for the first trade)
+        frame['Time_Since_Prev'] = (frame['Timestamp'].diff().dt.total_seconds() / 60).mask(group_start)
+        
+        # Outcome and asset of the previous trade
+        frame['Prev_PL'] = frame['P/L'].shift(1).mask(group_start)
+        frame['Prev_Is_Loss'] = frame['Prev_PL'] < 0
+        frame['Prev_Asset'] = frame['Asset'].shift(1).mask(group_start)
+        
+        # Length of the losing streak ending at each trade: distance back to
+        # the most recent non-losing trade, or to just before the trader's
+        # first trade (run-length via a running max)
+        is_loss = frame['Is_Loss'].to_numpy()
+        positions = np.arange(n)
+        resets = np.where(~is_loss, positions, np.where(group_start, positions - 1, -1))
+        last_reset = np.maximum.accumulate(resets)
+        frame['Consecutive_Losses'] = np.where(is_loss, positions - last_reset, 0).astype(np.int32)
+        
+        # 1-based position of each trade within its trading day
+        day_keys = ['Trader', 'Day'] if codes is not None else 'Day'
+        frame['Daily_Trade_Num'] = (frame.groupby(day_keys, observed=True).cumcount() + 1).astype(np.int32)
+        
+        # Trades placed in the trailing hour, including the current one
+        ones = pd.Series(1, index=frame['Timestamp'])
+        if codes is not None:
+            # Groups come back in code order, which is the frame's sort order
+            hourly = ones.groupby(codes).rolling('60min').count()
+        else:
+            hourly = ones.rolling('60min').count()
+        frame['Trades_Last_Hour'] = hourly.to_numpy().astype(np.int32)
+        
+    @_memoized
+    def daily_aggregates(self):
+        """
+        One row per trading day: trades, wins, losses, pnl, first_trade and
+        last_trade.
         
+        Built once per frame (and carried over by extend()), so day-level
+        metrics read a row per day instead of scanning every trade. Indexed
+        by Day, or by (Trader, Day) when the frame has a Trader column.
+        """
+        return _aggregate(self.df, 'Day')
+    
+    @_memoized
+    def asset_aggregates(self):
+        """Like daily_aggregates(), with one row per Asset (per trader)."""
+        return _aggregate(self.df, 'Asset')
+    
+    @_memoized
     def detect_overtrading(self):
         """
         Detect overtrading bias based on harmful patterns:
@@ -39,12 +515,14 @@ class BiasDetector:
         - Increasing trade frequency after small gains or minor losses
         - High transaction costs relative to net returns
         """
-        trades_per_day = self.df.groupby('Date').size()
+        trades_per_day = self.daily_aggregates()['trades']
+        if 'Trader' in self.df:
+            trades_per_day = trades_per_day.groupby(level='Day').sum()
         avg_trades_per_day = trades_per_day.mean()
         max_trades_per_day = trades_per_day.max()
         
         # Calculate trading frequency
-        time_diffs = self.df['Timestamp'].diff().dt.total_seconds() / 60  # minutes
+        time_diffs = self.df['Time_Since_Prev']  # minutes
         avg_time_between_trades = time_diffs[time_diffs > 0].mean()
         
         # Detect rapid-fire trading (trades within very short intervals - 1 minute)
@@ -53,9 +531,6 @@ class BiasDetector:
         
         # Pattern: Increasing trade frequency after small gains or minor losses
         # Check if trade frequency increases after small P/L moves
-        self.df['Prev_PL'] = self.df['P/L'].shift(1)
-        self.df['Time_Since_Prev'] = time_diffs
-        
         # Small gains/losses: between -2% and +2% of average trade size
         avg_trade_size = abs(self.df['P/L']).mean()
         small_move_threshold = avg_trade_size * 0.02
@@ -79,30 +554,8 @@ class BiasDetector:
         total_net_return = self.df['P/L'].sum()
         cost_to_return_ratio = abs(total_estimated_costs / total_net_return) if total_net_return != 0 else 0
         
-        # Score calculation based on harmful patterns
-        score = 0
-        
-        # Pattern 1: Excessively high trades per day (threshold: >10/day average or >25/day max for manual traders)
-        if avg_trades_per_day > 10:
-            score += min(25, (avg_trades_per_day / 10) * 10)
-        if max_trades_per_day > 25:
-            score += min(20, (max_trades_per_day / 25) * 10)
-        
-        # Pattern 2: Rapid-fire trades (>20% within 1 minute)
-        if rapid_trade_pct > 20:
-            score += min(25, (rapid_trade_pct / 20) * 10)
-        elif rapid_trade_pct > 10:
-            score += min(15, (rapid_trade_pct / 10) * 5)
-        
-        # Pattern 3: Increasing frequency after small moves (ratio > 3.0 indicates faster trading)
-        if frequency_increase_ratio > 3.0:
-            score += min(10, (frequency_increase_ratio / 3.0) * 6)
-        
-        # Pattern 4: High transaction costs relative to returns (>80% of net return)
-        if cost_to_return_ratio > 0.8 and total_net_return > 0:
-            score += min(10, (cost_to_return_ratio / 0.8) * 6)
-        elif cost_to_return_ratio > 1.5:
-            score += 15  # Costs greatly exceed returns
+        score = score_overtrading(avg_trades_per_day, max_trades_per_day, rapid_trade_pct,
+                                  frequency_increase_ratio, cost_to_return_ratio, total_net_return)
         
         severity = 'Low' if score < 50 else 'Moderate' if score < 80 else 'High'
         
@@ -123,6 +576,7 @@ class BiasDetector:
             'description': self._get_overtrading_description(severity, avg_trades_per_day, rapid_trade_pct, cost_to_return_ratio)
         }
     
+    @_memoized
     def detect_loss_aversion(self):
         """
         Detect loss aversion bias based on harmful patterns:
@@ -180,35 +634,8 @@ class BiasDetector:
         cutting_winners_pattern = win_rate > 55 and risk_reward_ratio < 1.2
         
         # Score calculation based on harmful patterns
-        score = 0
-        
-        # Pattern 1: Small gains, large losses (poor risk-reward)
-        if risk_reward_ratio < 0.7:
-            score += 35  # Very poor ratio
-        elif risk_reward_ratio < 1.0:
-            score += 25
-        elif risk_reward_ratio < 1.3:
-            score += 15
-        
-        # Pattern 2: Losses escalating (holding losers longer)
-        if loss_escalation > 1.5:
-            score += 25
-        elif loss_escalation > 1.2:
-            score += 15
-        
-        # Pattern 3: Large losses relative to wins (breaching thresholds)
-        if loss_to_win_ratio > 3.0:
-            score += 30
-        elif loss_to_win_ratio > 2.0:
-            score += 20
-        
-        # Pattern 4: Cutting winners short (high win rate, low avg win)
-        if cutting_winners_pattern:
-            score += 20
-        
-        # Additional: Median analysis - if median loss >> median win
-        if median_loss > median_win * 2:
-            score += 15
+        score = score_loss_aversion(risk_reward_ratio, loss_escalation, loss_to_win_ratio,
+                                    cutting_winners_pattern, median_win, median_loss)
         
         severity = 'Low' if score < 30 else 'Moderate' if score < 60 else 'High'
         
@@ -231,6 +658,7 @@ class BiasDetector:
             'description': self._get_loss_aversion_description(severity, risk_reward_ratio, loss_to_win_ratio, cutting_winners_pattern)
         }
     
+    @_memoized
     def detect_revenge_trading(self):
         """
         Detect revenge trading bias based on harmful patterns:
@@ -248,12 +676,6 @@ class BiasDetector:
                 'description': 'Insufficient data to detect revenge trading patterns.'
             }
         
-        # Calculate time between trades
-        self.df['Time_Since_Prev'] = self.df['Timestamp'].diff().dt.total_seconds() / 60  # minutes
-        self.df['Prev_Is_Loss'] = self.df['Is_Loss'].shift(1)
-        self.df['Prev_PL'] = self.df['P/L'].shift(1)
-        self.df['Prev_Asset'] = self.df['Asset'].shift(1)
-        
         # Pattern 1: Identify large losses (top 20% of losses)
         losses = self.df[self.df['Is_Loss']]
         if len(losses) == 0:
@@ -266,12 +688,12 @@ class BiasDetector:
             }
         
         large_loss_threshold = losses['P/L'].quantile(0.2)  # Bottom 20% (most negative)
-        self.df['Prev_Is_Large_Loss'] = (self.df['Prev_PL'] <= large_loss_threshold) & (self.df['Prev_Is_Loss'] == True)
+        prev_is_large_loss = (self.df['Prev_PL'] <= large_loss_threshold) & self.df['Prev_Is_Loss']
         
-        # Trades after losses
-        after_loss = self.df[self.df['Prev_Is_Loss'] == True]
-        after_large_loss = self.df[self.df['Prev_Is_Large_Loss'] == True]
-        after_win = self.df[self.df['Prev_Is_Loss'] == False]
+        # Trades after losses (the first trade has no previous outcome)
+        after_loss = self.df[self.df['Prev_Is_Loss']]
+        after_large_loss = self.df[prev_is_large_loss]
+        after_win = self.df[self.df['Prev_PL'].notna() & ~self.df['Prev_Is_Loss']]
         
         if len(after_loss) == 0:
             return {
@@ -298,16 +720,6 @@ class BiasDetector:
         emotional_cluster_pct = (len(emotional_cluster) / len(after_loss)) * 100 if len(after_loss) > 0 else 0
         
         # Pattern 4: Escalating risk after consecutive losses
-        # Track consecutive losses
-        self.df['Consecutive_Losses'] = 0
-        consecutive_count = 0
-        for idx, row in self.df.iterrows():
-            if row['Is_Loss']:
-                consecutive_count += 1
-            else:
-                consecutive_count = 0
-            self.df.at[idx, 'Consecutive_Losses'] = consecutive_count
-        
         # Check if trade size increases with consecutive losses
         trades_after_multiple_losses = self.df[self.df['Consecutive_Losses'] >= 2]
         if len(trades_after_multiple_losses) > 0:
@@ -323,40 +735,9 @@ class BiasDetector:
         # Win rate after losses
         win_rate_after_loss = (after_loss['Is_Win'].sum() / len(after_loss)) * 100 if len(after_loss) > 0 else 0
         
-        # Score calculation based on harmful patterns
-        score = 0
-        
-        # Pattern 1: Sharp increase in trade size after large loss (>50% increase)
-        if size_increase_ratio > 1.5:
-            score += 30
-        elif size_increase_ratio > 1.3:
-            score += 20
-        
-        # Pattern 2: Rapid re-entry into same asset (>30% of trades)
-        if rapid_same_asset_pct > 40:
-            score += 25
-        elif rapid_same_asset_pct > 25:
-            score += 15
-        
-        # Pattern 3: Emotional clustering (>50% within 15 minutes)
-        if emotional_cluster_pct > 50:
-            score += 30
-        elif emotional_cluster_pct > 30:
-            score += 20
-        
-        # Pattern 4: Escalating risk after consecutive losses
-        if escalation_ratio > 1.4:
-            score += 25
-        elif escalation_ratio > 1.2:
-            score += 15
-        
-        # Additional: Much faster trading after losses
-        if avg_time_after_loss < avg_time_after_win * 0.4:
-            score += 15
-        
-        # Poor win rate after losses suggests emotional trading
-        if win_rate_after_loss < 35:
-            score += 15
+        score = score_revenge_trading(size_increase_ratio, rapid_same_asset_pct, emotional_cluster_pct,
+                                      escalation_ratio, avg_time_after_loss, avg_time_after_win,
+                                      win_rate_after_loss)
         
         severity = 'Low' if score < 30 else 'Moderate' if score < 60 else 'High'
         
@@ -377,6 +758,7 @@ class BiasDetector:
             'description': self._get_revenge_trading_description(severity, emotional_cluster_pct, rapid_same_asset_pct, escalation_ratio)
         }
     
+    @_memoized
     def generate_summary(self):
         """Generate overall summary of detected biases"""
         total_trades = len(self.df)
@@ -399,84 +781,32 @@ class BiasDetector:
             'bias_count': len(biases_detected)
         }
     
+    @_memoized
     def generate_recommendations(self):
         """Generate personalized recommendations based on detected biases"""
-        recommendations = []
-        
-        overtrading = self.detect_overtrading()
-        loss_aversion = self.detect_loss_aversion()
-        revenge_trading = self.detect_revenge_trading()
-        
-        if overtrading['detected']:
-            avg_trades = overtrading['metrics']['avg_trades_per_day']
-            recommendations.append({
-                'bias': 'Overtrading',
-                'recommendation': f'Set a daily trade limit of {max(5, int(avg_trades * 0.5))} trades per day',
-                'priority': 'High' if overtrading['severity'] == 'High' else 'Medium'
-            })
-            recommendations.append({
-                'bias': 'Overtrading',
-                'recommendation': 'Implement a mandatory 30-minute cooldown period between trades',
-                'priority': 'Medium'
-            })
-        
-        if loss_aversion['detected']:
-            rr_ratio = loss_aversion['metrics']['risk_reward_ratio']
-            recommendations.append({
-                'bias': 'Loss Aversion',
-                'recommendation': f'Set stop-loss orders at 2% and take-profit at {max(3, int(rr_ratio * 2))}% to improve risk-reward ratio',
-                'priority': 'High' if loss_aversion['severity'] == 'High' else 'Medium'
-            })
-            recommendations.append({
-                'bias': 'Loss Aversion',
-                'recommendation': 'Use trailing stop-losses to let winners run while protecting gains',
-                'priority': 'Medium'
-            })
-        
-        if revenge_trading['detected']:
-            recommendations.append({
-                'bias': 'Revenge Trading',
-                'recommendation': 'Implement a mandatory 2-hour break after any losing trade',
-                'priority': 'High' if revenge_trading['severity'] == 'High' else 'Medium'
-            })
-            recommendations.append({
-                'bias': 'Revenge Trading',
-                'recommendation': 'Reduce position size by 50% for the next 3 trades after a loss',
-                'priority': 'Medium'
-            })
-        
-        # General recommendations
-        if not recommendations:
-            recommendations.append({
-                'bias': 'General',
-                'recommendation': 'Maintain a trading journal to track emotions and decisions',
-                'priority': 'Low'
-            })
-            recommendations.append({
-                'bias': 'General',
-                'recommendation': 'Review your trading plan weekly and stick to predefined rules',
-                'priority': 'Low'
-            })
-        
-        return recommendations
+        return build_recommendations(self.detect_overtrading(), self.detect_loss_aversion(),
+                                     self.detect_revenge_trading())
     
+    @_memoized
     def get_statistics(self):
         """Get comprehensive trading statistics"""
+        daily = self.daily_aggregates()
         return {
             'total_trades': len(self.df),
-            'winning_trades': int(self.df['Is_Win'].sum()),
-            'losing_trades': int(self.df['Is_Loss'].sum()),
+            'winning_trades': int(daily['wins'].sum()),
+            'losing_trades': int(daily['losses'].sum()),
             'total_pnl': round(self.df['P/L'].sum(), 2),
             'avg_pnl': round(self.df['P/L'].mean(), 2),
             'largest_win': round(self.df['P/L'].max(), 2),
             'largest_loss': round(self.df['P/L'].min(), 2),
-            'win_rate': round((self.df['Is_Win'].sum() / len(self.df)) * 100, 1),
-            'trading_days': len(self.df['Date'].unique()),
-            'unique_assets': int(self.df['Asset'].nunique()),
+            'win_rate': round((daily['wins'].sum() / len(self.df)) * 100, 1),
+            'trading_days': int(daily.index.get_level_values('Day').nunique()),
+            'unique_assets': int(self.asset_aggregates().index.get_level_values('Asset').nunique()),
             'human_tax': self.calculate_human_tax(),
             'prosperity_projection': self.calculate_prosperity_projection()
         }
 
+    @_memoized
     def calculate_human_tax(self):
         """
         Calculate 'Human Tax': Total losses from likely biased trades.
@@ -485,46 +815,27 @@ class BiasDetector:
         2. Rapid Fire: Trades within 1 minute of previous.
         3. Revenge Trading: Trades within 15 minutes of a loss.
         """
-        human_tax = 0.0
-        
-        # Prepare data
-        df = self.df.copy()
-        df['Timestamp'] = pd.to_datetime(df['Timestamp'])
-        df = df.sort_values('Timestamp')
-        df['Date'] = df['Timestamp'].dt.date
-        
-        # Calculate time diffs and previous outcomes
-        df['TimeDiff'] = df['Timestamp'].diff().dt.total_seconds() / 60.0
-        df['PrevPL'] = df['P/L'].shift(1)
-        df['PrevIsLoss'] = df['PrevPL'] < 0
-        
-        # Daily trade count
-        trade_counts = df.groupby('Date').cumcount() + 1
-        df['DailyTradeNum'] = trade_counts.values # Assign back correctly
-
-        for index, row in df.iterrows():
-            if row['P/L'] >= 0:
-                continue # Only count losses
-            
-            is_biased = False
-            
-            # 1. Overtrading (> 8 trades/day) - Adjusted to be slightly more lenient than 5
-            if row['DailyTradeNum'] > 8:
-                is_biased = True
-                
-            # 2. Rapid Fire (< 1 min)
-            if pd.notna(row['TimeDiff']) and row['TimeDiff'] < 1.0:
-                is_biased = True
-                
-            # 3. Revenge Trading (< 15 mins after loss)
-            if pd.notna(row['TimeDiff']) and row['TimeDiff'] < 15.0 and row['PrevIsLoss']:
-                is_biased = True
-                
-            if is_biased:
-                human_tax += abs(row['P/L'])
-                
+        human_tax = float(self.df.loc[self._human_tax_mask(), 'P/L'].abs().sum())
+        
         return round(human_tax, 2)
+    
+    def _human_tax_mask(self):
+        """Boolean mask of the losing trades counted towards the Human Tax."""
+        time_since_prev = self.df['Time_Since_Prev']
+        
+        # 1. Overtrading (> 8 trades/day) - Adjusted to be slightly more lenient than 5
+        overtrading = self.df['Daily_Trade_Num'] > 8
+        
+        # 2. Rapid Fire (< 1 min)
+        rapid_fire = time_since_prev < 1.0
+        
+        # 3. Revenge Trading (< 15 mins after loss)
+        revenge = (time_since_prev < 15.0) & self.df['Prev_Is_Loss']
+        
+        # Only losses count towards the tax (NaN diffs compare False)
+        return self.df['Is_Loss'] & (overtrading | rapid_fire | revenge)
 
+    @_memoized
     def calculate_prosperity_projection(self):
         """
         Project 10-year growth of the Human Tax at 7% annual return.
@@ -535,7 +846,411 @@ class BiasDetector:
         projection = tax * ((1 + rate) ** years)
         return round(projection, 2)
     
-    def _get_overtrading_description(self, severity, avg_trades, rapid_pct, cost_ratio):
+    @_memoized
+    def score_local_biases(self):
+        """
+        0-100 scores for the analysis biases that can be read off the log.
+        
+        Keys match the Gemini analysis so the two can be combined. Loss
+        aversion and revenge trading come from the detectors; the rest are
+        cheap heuristics:
+        - Herd Mentality: share of trades in POPULAR_ASSETS above 30%
+        - Disposition Effect: average loss larger than the average win
+        - Sunk Cost Fallacy: same asset and side re-entered right after a
+          loss on it, against the chance rate
+        - Recency Bias: asset picked among the previous 3 trades' assets,
+          against the chance rate
+        """
+        asset_codes = self.df['Asset'].cat.codes.to_numpy()
+        asset_share = np.bincount(asset_codes) / len(asset_codes)
+        
+        # Herd mentality
+        popular_pct = self.df['Asset'].isin(POPULAR_ASSETS).mean() * 100
+        herd = float(np.clip((popular_pct - 30) / 70 * 100, 0, 100))
+        
+        # Disposition effect
+        avg_win = self.df.loc[self.df['Is_Win'], 'P/L'].mean()
+        avg_loss = abs(self.df.loc[self.df['Is_Loss'], 'P/L'].mean())
+        disposition = float(np.clip((avg_loss / avg_win - 1) * 100, 0, 100)) if avg_win > 0 and avg_loss > 0 else 0.0
+        
+        # Sunk cost: the trade after a loss doubles down on the same position
+        after_loss = self.df['Prev_Is_Loss'].to_numpy()
+        same_position = self.df['Asset'] == self.df['Prev_Asset']
+        chance = (asset_share ** 2).sum()
+        if self.df['Buy/sell'].notna().all():
+            same_position &= self.df['Buy/sell'] == self.df['Buy/sell'].shift(1)
+            side_share = self.df['Buy/sell'].value_counts(normalize=True).to_numpy()
+            chance *= (side_share ** 2).sum()
+        sunk_cost = _excess_score(same_position.to_numpy()[after_loss].mean(), chance) if after_loss.any() else 0.0
+        
+        # Recency: the asset repeats one of the last 3 trades' assets
+        recency = 0.0
+        if len(asset_codes) > 3:
+            current = asset_codes[3:]
+            repeats = ((current == asset_codes[2:-1]) | (current == asset_codes[1:-2]) |
+                       (current == asset_codes[:-3]))
+            chance = (asset_share * (1 - (1 - asset_share) ** 3)).sum()
+            recency = _excess_score(repeats.mean(), chance)
+        
+        return {
+            'Loss Aversion': self.detect_loss_aversion()['score'],
+            'Revenge Trading': self.detect_revenge_trading()['score'],
+            'Herd Mentality': round(herd, 1),
+            'Disposition Effect': round(disposition, 1),
+            'Sunk Cost Fallacy': round(sunk_cost, 1),
+            'Recency Bias': round(recency, 1)
+        }
+    
+    @_memoized
+    def score_traders(self):
+        """
+        Score every trader in a multi-trader frame in one vectorized pass.
+        
+        Each metric is a groupby aggregation over the shared feature columns,
+        so 10k traders cost a handful of column operations rather than 10k
+        detector instances. Per-trader numbers match running a separate
+        BiasDetector on each trader's trades.
+        
+        Returns:
+            DataFrame indexed by Trader with score/severity/detected columns
+            for each bias, their key metrics, and the get_statistics fields
+        
+        Raises:
+            ValueError: If the frame has no Trader column
+        """
+        if 'Trader' not in self.df:
+            raise ValueError("score_traders() requires a 'Trader' column")
+        
+        df = self.df
+        trader = df['Trader']
+        codes = trader.cat.codes.to_numpy()
+        
+        def per_trader(values, how='sum'):
+            return values.groupby(trader, observed=True).agg(how)
+        
+        def per_trade(values):
+            # Broadcast a per-trader Series back onto the trade rows
+            return values.reindex(trader.cat.categories).to_numpy()[codes]
+        
+        pnl = df['P/L']
+        abs_pnl = pnl.abs()
+        time_since_prev = df['Time_Since_Prev']
+        is_win = df['Is_Win']
+        is_loss = df['Is_Loss']
+        
+        out = pd.DataFrame(index=per_trader(pnl, 'size').index)
+        n = per_trader(pnl, 'size')
+        wins = per_trader(is_win)
+        losses = per_trader(is_loss)
+        avg_abs_pnl = per_trader(abs_pnl, 'mean')
+        total_pnl = per_trader(pnl)
+        
+        # --- Overtrading ---
+        daily = self.daily_aggregates()
+        trades_per_day = daily['trades'].groupby(level='Trader', observed=True)
+        avg_trades_per_day = trades_per_day.mean()
+        max_trades_per_day = trades_per_day.max()
+        avg_time_between_trades = per_trader(time_since_prev.where(time_since_prev > 0), 'mean')
+        rapid_trade_pct = per_trader(time_since_prev < 1) / n * 100
+        
+        small_move_threshold = per_trade(avg_abs_pnl) * 0.02
+        small_moves = df['Prev_PL'].abs() <= small_move_threshold
+        avg_time_after_small_move = per_trader(time_since_prev.where(small_moves), 'mean')
+        frequency_increase_ratio = (avg_time_between_trades / avg_time_after_small_move).where(
+            avg_time_after_small_move > 0, 1)
+        
+        total_estimated_costs = n * (avg_abs_pnl * 0.001)
+        cost_to_return_ratio = (total_estimated_costs / total_pnl).abs().where(total_pnl != 0, 0)
+        
+        overtrading = [
+            score_overtrading(*args) for args in zip(
+                avg_trades_per_day, max_trades_per_day, rapid_trade_pct,
+                frequency_increase_ratio, cost_to_return_ratio, total_pnl)
+        ]
+        self._add_scores(out, 'overtrading', overtrading, moderate=50, high=80, detect=50)
+        out['avg_trades_per_day'] = avg_trades_per_day.round(2)
+        out['max_trades_per_day'] = max_trades_per_day.astype(np.int32)
+        out['rapid_trade_percentage'] = rapid_trade_pct.round(1)
+        out['avg_minutes_between_trades'] = avg_time_between_trades.round(1).fillna(0)
+        out['cost_to_return_ratio'] = (cost_to_return_ratio * 100).round(1)
+        
+        # --- Loss aversion ---
+        win_pnl = pnl.where(is_win)
+        loss_pnl = pnl.where(is_loss)
+        avg_win = per_trader(win_pnl, 'mean')
+        avg_loss = per_trader(loss_pnl, 'mean').abs()
+        risk_reward_ratio = (avg_win / avg_loss).where(avg_loss > 0, 0)
+        
+        # Mean of the largest vs smallest third of each trader's losses
+        loss_rank = abs_pnl.where(is_loss).groupby(trader, observed=True).rank(method='first', ascending=False)
+        loss_count = per_trade(losses)
+        third = np.maximum(1, loss_count // 3)
+        recent_losses = per_trader(abs_pnl.where(loss_rank <= third), 'mean')
+        earlier_losses = per_trader(abs_pnl.where(loss_rank > loss_count - third), 'mean')
+        loss_escalation = (recent_losses / earlier_losses).where((losses > 1) & (earlier_losses > 0), 1)
+        
+        largest_win = per_trader(win_pnl, 'max')
+        largest_loss = per_trader(loss_pnl, 'min').abs()
+        loss_to_win_ratio = (largest_loss / largest_win).where(largest_win > 0, 0)
+        median_win = per_trader(win_pnl, 'median')
+        median_loss = per_trader(loss_pnl, 'median').abs()
+        win_rate = wins / n * 100
+        cutting_winners_pattern = (win_rate > 55) & (risk_reward_ratio < 1.2)
+        
+        loss_aversion = [
+            score_loss_aversion(*args) if has_both else 0 for has_both, *args in zip(
+                (wins > 0) & (losses > 0), risk_reward_ratio, loss_escalation, loss_to_win_ratio,
+                cutting_winners_pattern, median_win, median_loss)
+        ]
+        self._add_scores(out, 'loss_aversion', loss_aversion, moderate=30, high=60, detect=25)
+        out['risk_reward_ratio'] = risk_reward_ratio.round(2)
+        out['loss_to_win_ratio'] = loss_to_win_ratio.round(2)
+        out['loss_escalation_factor'] = loss_escalation.round(2)
+        
+        # --- Revenge trading ---
+        large_loss_threshold = per_trade(loss_pnl.groupby(trader, observed=True).quantile(0.2))
+        after_loss = df['Prev_Is_Loss']
+        after_large_loss = after_loss & (df['Prev_PL'] <= large_loss_threshold)
+        after_win = df['Prev_PL'].notna() & ~after_loss
+        after_loss_count = per_trader(after_loss)
+        
+        avg_abs_pnl_after_large_loss = per_trader(abs_pnl.where(after_large_loss), 'mean').fillna(0)
+        size_increase_ratio = (avg_abs_pnl_after_large_loss / avg_abs_pnl).where(avg_abs_pnl > 0, 1)
+        same_asset_rapid = after_loss & (df['Asset'] == df['Prev_Asset']) & (time_since_prev < 30)
+        rapid_same_asset_pct = per_trader(same_asset_rapid) / after_loss_count * 100
+        emotional_cluster_pct = per_trader(after_loss & (time_since_prev < 15)) / after_loss_count * 100
+        
+        multiple_losses = df['Consecutive_Losses'] >= 2
+        escalation_ratio = (per_trader(abs_pnl.where(multiple_losses), 'mean') / avg_abs_pnl).where(
+            per_trader(multiple_losses) > 0, 1).where(avg_abs_pnl > 0, 1)
+        avg_time_after_loss = per_trader(time_since_prev.where(after_loss), 'mean')
+        avg_time_after_win = per_trader(time_since_prev.where(after_win), 'mean').fillna(avg_time_after_loss)
+        win_rate_after_loss = per_trader(after_loss & is_win) / after_loss_count * 100
+        
+        revenge_trading = [
+            score_revenge_trading(*args) if eligible else 0 for eligible, *args in zip(
+                (n >= 2) & (losses > 0) & (after_loss_count > 0), size_increase_ratio,
+                rapid_same_asset_pct, emotional_cluster_pct, escalation_ratio,
+                avg_time_after_loss, avg_time_after_win, win_rate_after_loss)
+        ]
+        self._add_scores(out, 'revenge_trading', revenge_trading, moderate=30, high=60, detect=25)
+        out['emotional_cluster_pct'] = emotional_cluster_pct.round(1).fillna(0)
+        out['rapid_same_asset_pct'] = rapid_same_asset_pct.round(1).fillna(0)
+        out['risk_escalation_ratio'] = escalation_ratio.round(2)
+        
+        # --- Statistics ---
+        human_tax = per_trader(abs_pnl.where(self._human_tax_mask(), 0)).round(2)
+        out['total_trades'] = n
+        out['winning_trades'] = wins
+        out['losing_trades'] = losses
+        out['total_pnl'] = total_pnl.round(2)
+        out['avg_pnl'] = per_trader(pnl, 'mean').round(2)
+        out['largest_win'] = per_trader(pnl, 'max').round(2)
+        out['largest_loss'] = per_trader(pnl, 'min').round(2)
+        out['win_rate'] = win_rate.round(1)
+        out['trading_days'] = daily.groupby(level='Trader', observed=True).size()
+        out['unique_assets'] = self.asset_aggregates().groupby(level='Trader', observed=True).size()
+        out['human_tax'] = human_tax
+        out['prosperity_projection'] = (human_tax * (1.07 ** 10)).round(2)
+        out['bias_count'] = (out['overtrading_detected'].astype(int) + out['loss_aversion_detected']
+                             + out['revenge_trading_detected'])
+        
+        return out
+    
+    def timeline(self, window_days=7):
+        """
+        Overtrading, loss aversion and revenge scores over trailing windows.
+        
+        One window ends on every calendar day from the first to the last
+        trade. Counts and sums are additive, so each metric comes from
+        rolling sums of per-day aggregates instead of re-running the
+        detectors on every slice. Order statistics (medians, the large-loss
+        threshold, loss thirds, the small-move threshold) come from per-day
+        log-spaced P/L histograms and are accurate to about 1% (less for
+        histories spanning years, whose buckets are wider). Per-trade
+        features such as time since the previous trade look back across
+        window edges.
+        
+        Args:
+            window_days: Window length in whole days (1 = daily, 7 = weekly)
+        
+        Returns:
+            dict of parallel lists: dates (window end), trades, pnl and one
+            score series per bias
+        
+        Raises:
+            ValueError: If window_days is not a whole number of days >= 1
+        """
+        if isinstance(window_days, (bool, np.bool_)) or not float(window_days).is_integer() or window_days < 1:
+            raise ValueError("window_days must be a whole number of days, at least 1")
+        window_days = int(window_days)
+        key = f'timeline_{window_days}'
+        if key not in self._cache:
+            self._cache[key] = self._build_timeline(window_days)
+        return self._cache[key]
+    
+    def _build_timeline(self, window):
+        df = self.df
+        first_day = int(df['Day'].min())
+        num_days = int(df['Day'].max()) - first_day + 1
+        day = (df['Day'].to_numpy() - first_day).astype(np.int64)
+        
+        pnl = df['P/L'].to_numpy(dtype=float)
+        abs_pnl = np.abs(pnl)
+        prev_pnl = df['Prev_PL'].to_numpy(dtype=float)
+        time_since_prev = df['Time_Since_Prev'].to_numpy(dtype=float)
+        has_prev = ~np.isnan(prev_pnl)
+        is_win = df['Is_Win'].to_numpy()
+        is_loss = df['Is_Loss'].to_numpy()
+        after_loss = df['Prev_Is_Loss'].to_numpy()
+        after_win = has_prev & ~after_loss
+        
+        def rolled(mask=None, weights=None):
+            # Trailing-window sum of `weights` (or a count) over trades in `mask`
+            values = np.ones(len(day)) if weights is None else np.nan_to_num(weights)
+            if mask is not None:
+                values = np.where(mask, values, 0)
+            return _rolling_sum(np.bincount(day, weights=values, minlength=num_days), window)
+        
+        # Log-spaced magnitude buckets; bucket 0 holds exact zeros. The range
+        # and bucket count are bounded so histogram memory stays bounded
+        # whatever the P/L values or date span
+        log_gamma = np.log(TIMELINE_GAMMA)
+        positive = abs_pnl[abs_pnl > 0]
+        if len(positive):
+            high = np.log(positive.max())
+            low = max(np.log(positive.min()), high - np.log(TIMELINE_MAX_RANGE))
+            max_buckets = max(16, TIMELINE_MAX_CELLS // num_days)
+            log_gamma = max(log_gamma, (high - low) / (max_buckets - 3))
+            offset = int(np.ceil(low / log_gamma)) - 1
+            num_buckets = int(np.ceil(high / log_gamma)) - offset + 1
+        else:
+            offset, num_buckets = 0, 1
+        
+        def bucket_of(values):
+            with np.errstate(divide='ignore', invalid='ignore'):
+                index = np.ceil(np.log(values) / log_gamma) - offset
+            index = np.where(values > 0, np.maximum(index, 1), 0)
+            return np.clip(np.nan_to_num(index), 0, num_buckets - 1).astype(np.int64)
+        
+        def rolled_histogram(mask, magnitudes, weights):
+            # Trailing-window (counts, weight sums) per magnitude bucket
+            cells = day[mask] * num_buckets + bucket_of(magnitudes[mask])
+            shape = (num_days, num_buckets)
+            counts = np.bincount(cells, minlength=num_days * num_buckets).reshape(shape)
+            sums = np.bincount(cells, weights=weights[mask], minlength=num_days * num_buckets).reshape(shape)
+            return _rolling_sum(counts, window), _rolling_sum(sums, window)
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            n = rolled()
+            total_pnl = rolled(weights=pnl)
+            avg_abs_pnl = rolled(weights=abs_pnl) / n
+            
+            # Overtrading
+            daily_trades = np.bincount(day, minlength=num_days)
+            avg_trades_per_day = n / _rolling_sum((daily_trades > 0).astype(float), window)
+            max_trades_per_day = pd.Series(daily_trades).rolling(window, min_periods=1).max().to_numpy()
+            positive_gap = time_since_prev > 0
+            avg_time_between_trades = rolled(positive_gap, time_since_prev) / rolled(positive_gap)
+            rapid_trade_pct = rolled(time_since_prev < 1) / n * 100
+            
+            prev_counts, prev_minutes = rolled_histogram(has_prev, np.abs(prev_pnl), time_since_prev)
+            small_bucket = bucket_of(avg_abs_pnl * 0.02)
+            small_count = _cumulative_at(np.cumsum(prev_counts, axis=1), small_bucket)
+            avg_time_after_small_move = _cumulative_at(np.cumsum(prev_minutes, axis=1), small_bucket) / small_count
+            frequency_increase_ratio = np.where(
+                (small_count > 0) & (avg_time_after_small_move > 0),
+                avg_time_between_trades / avg_time_after_small_move, 1)
+            
+            total_estimated_costs = n * avg_abs_pnl * 0.001
+            cost_to_return_ratio = np.where(total_pnl != 0, np.abs(total_estimated_costs / total_pnl), 0)
+            
+            # Loss aversion
+            wins, losses = rolled(is_win), rolled(is_loss)
+            avg_win = rolled(is_win, pnl) / wins
+            avg_loss = np.abs(rolled(is_loss, pnl) / losses)
+            risk_reward_ratio = np.where(avg_loss > 0, avg_win / avg_loss, 0)
+            
+            loss_counts, loss_sums = rolled_histogram(is_loss, abs_pnl, abs_pnl)
+            win_counts, win_sums = rolled_histogram(is_win, abs_pnl, abs_pnl)
+            third = np.maximum(1, losses // 3)
+            recent_losses = _window_extreme_mean(loss_counts, loss_sums, third, largest=True)
+            earlier_losses = _window_extreme_mean(loss_counts, loss_sums, third, largest=False)
+            loss_escalation = np.where((losses > 1) & (earlier_losses > 0), recent_losses / earlier_losses, 1)
+            
+            daily_max = lambda values: pd.Series(values).groupby(day).max().reindex(range(num_days))
+            largest_win = daily_max(np.where(is_win, pnl, np.nan)).rolling(window, min_periods=1).max().to_numpy()
+            largest_loss = daily_max(np.where(is_loss, abs_pnl, np.nan)).rolling(window, min_periods=1).max().to_numpy()
+            loss_to_win_ratio = np.where(largest_win > 0, largest_loss / largest_win, 0)
+            median_win = _window_quantile(win_counts, win_sums, 0.5)
+            median_loss = _window_quantile(loss_counts, loss_sums, 0.5)
+            win_rate = wins / n * 100
+            
+            # Revenge trading: the large-loss threshold is the 20% quantile of
+            # losses, i.e. the 80% quantile of loss magnitudes
+            after_loss_count = rolled(after_loss)
+            large_bucket = bucket_of(_window_quantile(loss_counts, loss_sums, 0.8))
+            prev_loss_counts, prev_loss_sizes = rolled_histogram(after_loss, np.abs(prev_pnl), abs_pnl)
+            large_count = prev_loss_counts.sum(axis=1) - _cumulative_at(np.cumsum(prev_loss_counts, axis=1), large_bucket - 1)
+            large_sizes = prev_loss_sizes.sum(axis=1) - _cumulative_at(np.cumsum(prev_loss_sizes, axis=1), large_bucket - 1)
+            size_increase_ratio = np.where(
+                avg_abs_pnl > 0, np.where(large_count > 0, large_sizes / large_count, 0) / avg_abs_pnl, 1)
+            
+            same_asset = (df['Asset'] == df['Prev_Asset']).to_numpy()
+            rapid_same_asset_pct = rolled(after_loss & same_asset & (time_since_prev < 30)) / after_loss_count * 100
+            emotional_cluster_pct = rolled(after_loss & (time_since_prev < 15)) / after_loss_count * 100
+            multiple_losses = df['Consecutive_Losses'].to_numpy() >= 2
+            multiple_loss_count = rolled(multiple_losses)
+            escalation_ratio = np.where(
+                (multiple_loss_count > 0) & (avg_abs_pnl > 0),
+                rolled(multiple_losses, abs_pnl) / multiple_loss_count / avg_abs_pnl, 1)
+            avg_time_after_loss = rolled(after_loss, time_since_prev) / after_loss_count
+            after_win_count = rolled(after_win)
+            avg_time_after_win = np.where(after_win_count > 0,
+                                          rolled(after_win, time_since_prev) / after_win_count, avg_time_after_loss)
+            win_rate_after_loss = rolled(after_loss & is_win) / after_loss_count * 100
+        
+        overtrading, loss_aversion, revenge_trading = [], [], []
+        for i in range(num_days):
+            if n[i] == 0:
+                overtrading.append(0)
+                loss_aversion.append(0)
+                revenge_trading.append(0)
+                continue
+            overtrading.append(score_overtrading(
+                avg_trades_per_day[i], max_trades_per_day[i], rapid_trade_pct[i],
+                frequency_increase_ratio[i], cost_to_return_ratio[i], total_pnl[i]))
+            loss_aversion.append(score_loss_aversion(
+                risk_reward_ratio[i], loss_escalation[i], loss_to_win_ratio[i],
+                win_rate[i] > 55 and risk_reward_ratio[i] < 1.2, median_win[i], median_loss[i])
+                if wins[i] > 0 and losses[i] > 0 else 0)
+            revenge_trading.append(score_revenge_trading(
+                size_increase_ratio[i], rapid_same_asset_pct[i], emotional_cluster_pct[i],
+                escalation_ratio[i], avg_time_after_loss[i], avg_time_after_win[i],
+                win_rate_after_loss[i])
+                if n[i] >= 2 and losses[i] > 0 and after_loss_count[i] > 0 else 0)
+        
+        dates = np.arange(first_day, first_day + num_days).astype('datetime64[D]').astype(str)
+        return {
+            'window_days': window,
+            'dates': dates.tolist(),
+            'trades': n.astype(int).tolist(),
+            'pnl': np.round(total_pnl, 2).tolist(),
+            'overtrading': [min(100, round(float(score), 1)) for score in overtrading],
+            'loss_aversion': [min(100, round(float(score), 1)) for score in loss_aversion],
+            'revenge_trading': [min(100, round(float(score), 1)) for score in revenge_trading]
+        }
+    
+    @staticmethod
+    def _add_scores(out, bias, scores, moderate, high, detect):
+        """Add <bias>_score/_severity/_detected columns using the detectors' thresholds."""
+        out[f'{bias}_score'] = [min(100, round(score, 1)) for score in scores]
+        scores = np.asarray(scores, dtype=float)
+        out[f'{bias}_severity'] = np.where(scores < moderate, 'Low', np.where(scores < high, 'Moderate', 'High'))
+        out[f'{bias}_detected'] = scores > detect
+    
+    @staticmethod
+    def _get_overtrading_description(severity, avg_trades, rapid_pct, cost_ratio):
         if severity == 'High':
             return f"You're averaging {avg_trades:.1f} trades per day with {rapid_pct:.1f}% occurring within 1 minute. Transaction costs represent {cost_ratio:.1f}% of your net returns. This suggests impulsive, strategy-less trading."
         elif severity == 'Moderate':
@@ -543,7 +1258,8 @@ class BiasDetector:
         else:
             return "Your trading frequency appears reasonable (<10/day), but continue to monitor for impulsive trades."
     
-    def _get_loss_aversion_description(self, severity, rr_ratio, loss_win_ratio, cutting_winners):
+    @staticmethod
+    def _get_loss_aversion_description(severity, rr_ratio, loss_win_ratio, cutting_winners):
         if severity == 'High':
             desc = f"Your risk-reward ratio ({rr_ratio:.2f}) shows small average gains but large average losses. "
             if loss_win_ratio > 2:
@@ -556,7 +1272,8 @@ class BiasDetector:
         else:
             return "Your risk-reward management appears balanced."
     
-    def _get_revenge_trading_description(self, severity, emotional_pct, rapid_same_asset, escalation):
+    @staticmethod
+    def _get_revenge_trading_description(severity, emotional_pct, rapid_same_asset, escalation):
         if severity == 'High':
             desc = f"You're clustering {emotional_pct:.1f}% of trades within 15 minutes after losses. "
             if rapid_same_asset > 30:
@@ -200,23 +200,31 @@ class TradingViewObserver {
             // app.js handles history. Here we are in content script.
             // We can retrieve history from chrome.storage.local
 
-            const storage = await chrome.storage.local.get(['tradeHistory', 'session_human_tax']);
+            const storage = await chrome.storage.local.get(['tradeHistory', 'session_human_tax', 'zentrade_session_id']);
             const history = storage.tradeHistory || [];
 
-            const payload = {
-                ...tradeData,
-                history: history
-            };
+            // The backend keeps history per session, so we only resend it when asked
+            let sessionId = storage.zentrade_session_id;
+            if (!sessionId) {
+                sessionId = crypto.randomUUID();
+                await chrome.storage.local.set({ zentrade_session_id: sessionId });
+            }
 
-            const response = await fetch('http://127.0.0.1:5001/api/realtime', {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json'
-                },
-                body: JSON.stringify(payload)
-            });
+            const postRealtime = async (payload) => {
+                const response = await fetch('http://127.0.0.1:5001/api/realtime', {
+                    method: 'POST',
+                    headers: {
+                        'Content-Type': 'application/json'
+                    },
+                    body: JSON.stringify(payload)
+                });
+                return response.json();
+            };
 
-            const result = await response.json();
+            let result = await postRealtime({ ...tradeData, session_id: sessionId });
+            if (result.needs_history) {
+                result = await postRealtime({ ...tradeData, session_id: sessionId, history: history });
+            }
 
             if (result.bias_detected) {
                 this.showIntervention(result);
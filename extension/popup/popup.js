@@ -39,6 +39,9 @@ document.getElementById('uploadCSV').addEventListener('click', () => {
 
 document.getElementById('clearHistory').addEventListener('click', () => {
     chrome.storage.local.set({ tradeHistory: [] });
+    // The server keeps history per session, so start a fresh one; the
+    // content script creates a new session_id on the next trade
+    chrome.storage.local.remove('zentrade_session_id');
     // UI update handled by storage listener
 });
 
@@ -128,15 +131,11 @@ async function fetchRecommendations(trades) {
 
     try {
         console.log('Fetching recommendations for', trades.length, 'trades...');
-        // Correct endpoint is /api/analyze-csv
-        const response = await fetch('http://127.0.0.1:5001/api/analyze-csv', {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ trades: trades })
+        // Run /api/analyze-csv as a background job so large logs can't time out
+        const data = await runAnalysisJob({ type: 'analyze-csv', trades: trades }, (job) => {
+            contentDiv.innerHTML = `<p style="color: #787b86;">Asking Gemini for advice... ${Math.round(job.progress * 100)}%</p>`;
         });
 
-        const data = await response.json();
-
         if (data.error) {
             console.error('Gemini API Error:', data.error);
             contentDiv.innerHTML = `<p style="color: #ff4757;">AI Coach Error: ${data.error}</p>`;
@@ -166,6 +165,31 @@ async function fetchRecommendations(trades) {
     }
 }
 
+// Submit an analysis job, poll until it finishes and return its result
+async function runAnalysisJob(payload, onProgress) {
+    const submitted = await fetch('http://127.0.0.1:5001/api/jobs', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(payload)
+    });
+    let job = await submitted.json();
+    if (job.error) {
+        return { error: job.error };
+    }
+
+    while (job.status === 'queued' || job.status === 'running') {
+        onProgress(job);
+        await new Promise(resolve => setTimeout(resolve, 1000));
+        const response = await fetch(`http://127.0.0.1:5001/api/jobs/${job.job_id}`);
+        job = await response.json();
+    }
+
+    if (job.status !== 'done') {
+        return { error: job.error || `Analysis ${job.status}` };
+    }
+    return job.result;
+}
+
 function displayRecommendations(recs) {
     const container = document.getElementById('recommendationsContent');
     let html = '';
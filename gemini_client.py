@@ -0,0 +1,148 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+import requests
+from requests.adapters import HTTPAdapter
+
+BASE_URL = "https://generativelanguage.googleapis.com/v1beta/models"
+
+# Response body is read in chunks so a call past its deadline stops reading
+READ_CHUNK_BYTES = 64 * 1024
+
+# Worker threads per call type, so long analysis windows never hold the
+# workers that short recommendation and intervention calls wait on
+LANES = {'analysis': 8, 'recommendations': 4, 'interventions': 4, 'default': 2}
+
+
+class GeminiError(Exception):
+    """A Gemini call failed, timed out or returned no usable text."""
+
+
+class GeminiClient:
+    """
+    Pooled, keep-alive client for the Gemini generateContent REST API.
+
+    One client is shared by every GeminiCoach method, so concurrent requests
+    reuse open TLS connections instead of each paying the handshake. Calls go
+    through a requests.Session (thread-safe for concurrent Flask workers).
+
+    Every call takes a deadline in seconds that bounds the whole call,
+    including a slowly streamed response: the request runs on a worker
+    thread and the caller stops waiting once the deadline passes, after
+    which the worker also stops reading. Each call type (`lane`) has its
+    own workers, sized by `lanes` (defaults in LANES), so one kind of call
+    can only queue behind calls of the same kind.
+    """
+    def __init__(self, api_key, lanes=None, connect_timeout=5, base_url=BASE_URL):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.lanes = {**LANES, **(lanes or {})}
+        self.connect_timeout = connect_timeout
+
+        self._session = None
+        self._executors = {}  # lane -> ThreadPoolExecutor, created on first use
+        self._lock = threading.Lock()
+
+    def _url(self, model):
+        return f"{self.base_url}/{model}:generateContent"
+
+    def _payload(self, prompt, generation_config):
+        payload = {"contents": [{"parts": [{"text": prompt}]}]}
+        if generation_config:
+            payload["generationConfig"] = generation_config
+        return payload
+
+    def _headers(self):
+        return {"x-goog-api-key": self.api_key, "Content-Type": "application/json"}
+
+    @staticmethod
+    def _text(status, body):
+        """Extract the response text, raising GeminiError for API errors."""
+        if status >= 400:
+            message = body.get("error", {}).get("message") if isinstance(body, dict) else None
+            raise GeminiError(message or f"Gemini API returned HTTP {status}")
+        if not isinstance(body, dict) or not body.get("candidates"):
+            raise GeminiError("No response candidates from Gemini")
+        try:
+            return body["candidates"][0]["content"]["parts"][0]["text"].strip()
+        except (KeyError, IndexError, TypeError) as e:
+            raise GeminiError(f"Unexpected Gemini response shape: {e}")
+
+    @staticmethod
+    def _json(content):
+        try:
+            return json.loads(content)
+        except ValueError:
+            return {}
+
+    def _get_session(self):
+        with self._lock:
+            if self._session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=sum(self.lanes.values()))
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._session = session
+            return self._session
+
+    def _get_executor(self, lane):
+        with self._lock:
+            if lane not in self._executors:
+                self._executors[lane] = ThreadPoolExecutor(max_workers=self.lanes[lane],
+                                                           thread_name_prefix=f"gemini-{lane}")
+            return self._executors[lane]
+
+    def generate(self, prompt, model, deadline, generation_config=None, lane='default'):
+        """
+        Blocking generateContent call that returns within `deadline` seconds.
+
+        `lane` is the call type whose workers run it (a key of `lanes`).
+
+        Returns:
+            str: Response text
+
+        Raises:
+            GeminiError: On HTTP errors, timeouts or empty responses
+        """
+        expires = time.monotonic() + deadline
+        future = self._get_executor(lane).submit(self._post, prompt, model, expires, generation_config)
+        try:
+            return future.result(timeout=deadline)
+        except FutureTimeout:
+            future.cancel()
+            raise GeminiError(f"Gemini call exceeded its {deadline}s deadline")
+
+    def _post(self, prompt, model, expires, generation_config):
+        remaining = expires - time.monotonic()
+        if remaining <= 0:
+            # Waited for a free worker until the caller gave up
+            raise GeminiError("Gemini call expired before it was sent")
+        try:
+            with self._get_session().post(
+                self._url(model),
+                json=self._payload(prompt, generation_config),
+                headers=self._headers(),
+                timeout=(min(self.connect_timeout, remaining), remaining),
+                stream=True
+            ) as response:
+                content = bytearray()
+                for chunk in response.iter_content(READ_CHUNK_BYTES):
+                    if time.monotonic() > expires:
+                        raise GeminiError("Gemini response still streaming at its deadline")
+                    content += chunk
+        except requests.exceptions.Timeout:
+            raise GeminiError("Gemini call timed out")
+        except requests.exceptions.RequestException as e:
+            raise GeminiError(str(e))
+        return self._text(response.status_code, self._json(bytes(content)))
+
+    def close(self):
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+            for executor in self._executors.values():
+                executor.shutdown(wait=False, cancel_futures=True)
+            self._executors = {}
@@ -1,16 +1,65 @@
 import os
-import google.generativeai as genai
 import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from gemini_client import GeminiClient
+from recommendation_cache import RecommendationCache, signature
+from prompt_encoding import encode_json, encode_trades, estimate_tokens
+
+# Per-call deadlines (seconds). Interventions sit in the real-time trade path,
+# so they give up quickly and fall back to a canned message.
+RECOMMENDATIONS_DEADLINE = 30
+INTERVENTION_DEADLINE = 8
+ANALYSIS_DEADLINE = 120  # Extended for thinking models
+
+# Long logs are analyzed in windows of about ANALYSIS_WINDOW_TOKENS prompt
+# tokens of trades, ANALYSIS_CONCURRENCY at a time, and the per-window scores
+# merged. A request never makes more than ANALYSIS_MAX_WINDOWS calls of at
+# most ANALYSIS_MAX_WINDOW_TOKENS each, however long the log.
+ANALYSIS_WINDOW_TOKENS = 20_000
+ANALYSIS_CONCURRENCY = 8
+ANALYSIS_MAX_WINDOWS = 8
+ANALYSIS_MAX_WINDOW_TOKENS = 200_000
+
+# The bias catalogue for analyze_trade_data, with the hint given to Gemini
+ANALYSIS_BIASES = [
+    ("Loss Aversion", "Holding losers too long"),
+    ("Confirmation Bias", "Only trading one asset despite losses"),
+    ("Revenge Trading", "Increasing size after a loss"),
+    ("Herd Mentality", "Trading only popular tickers: TSLA, NVDA, AAPL"),
+    ("Sunk Cost Fallacy", "Averaging down on a failing trade"),
+    ("Overconfidence", "Spiking risk after a win streak"),
+    ("Availability Bias", "Trading what's in the news"),
+    ("Recency Bias", "Overweighting the last 3 trades"),
+    ("Anchoring Bias", "Fixating on a previous price level"),
+    ("Gambler's Fallacy", "Predicting a reversal just because of a streak"),
+    ("Mental Accounting", "Taking high risk with 'house money'"),
+    ("Disposition Effect", "Selling winners too early"),
+    ("Clean Trades", "Trades that follow discipline"),
+]
+
+ANALYSIS_CONFIG = {
+    "temperature": 0.5, # Lower temperature for more deterministic JSON
+    "maxOutputTokens": 2048
+}
 
 class GeminiCoach:
-    def __init__(self):
+    def __init__(self, client=None, recommendation_cache=None):
         self.api_key = os.environ.get("GEMINI_API_KEY")
         if self.api_key:
-            genai.configure(api_key=self.api_key)
+            # One pooled client shared by every method (keep-alive connections)
+            self.client = client or GeminiClient(self.api_key)
             # Use gemini-2.5-flash (other models quota exceeded)
-            self.model = genai.GenerativeModel('gemini-2.5-flash')
+            self.model = 'gemini-2.5-flash'
+            # Similar bias profiles get the same advice, so reuse it
+            if recommendation_cache is None:
+                recommendation_cache = RecommendationCache.from_env()
+            self.recommendation_cache = recommendation_cache
         else:
+            self.client = None
             self.model = None
+            self.recommendation_cache = None
+        # Use gemini-2.0-flash (valid model, quota exceeded)
+        self.analysis_model = 'gemini-2.0-flash'
 
     def generate_recommendations(self, bias_analysis):
         """
@@ -24,7 +73,25 @@ class GeminiCoach:
         """
         if not self.model:
             return []
+        
+        key = signature(bias_analysis)
+        cached = self.recommendation_cache.get(key)
+        if cached is not None:
+            print("⚡ Using cached recommendations for a matching bias profile.")
+            return cached
+        
+        try:
+            print("✨ Requesting recommendations from Gemini...")
+            text = self.client.generate(self._recommendations_prompt(bias_analysis), self.model,
+                                        RECOMMENDATIONS_DEADLINE, lane='recommendations')
+            return self._remember_recommendations(key, self._parse_recommendations(text))
+            
+        except Exception as e:
+            print(f"❌ Error generating recommendations with Gemini: {e}")
+            return []
 
+    @staticmethod
+    def _recommendations_prompt(bias_analysis):
         # Extract relevant information for the prompt
         summary = bias_analysis.get('summary', {})
         overtrading = bias_analysis.get('overtrading', {})
@@ -54,7 +121,7 @@ class GeminiCoach:
         You are an expert trading psychology coach. Analyze the following trading behavior data and provide personalized, actionable recommendations to improve the trader's performance and mindset.
         
         The system has detected the following patterns:
-        {json.dumps(metrics_summary, indent=2)}
+        {encode_json(metrics_summary)}
         
         Please provide 3-5 specific recommendations. Each recommendation should address a specific detected bias or general trading improvement if no strong biases are detected.
         
@@ -69,24 +136,25 @@ class GeminiCoach:
         
         Return ONLY the JSON.
         """
+        return prompt
+
+    def _remember_recommendations(self, key, recommendations):
+        # Only cache usable advice so a bad response is retried next time
+        if isinstance(recommendations, list) and recommendations:
+            self.recommendation_cache.put(key, recommendations)
+        return recommendations
+
+    @staticmethod
+    def _parse_recommendations(text):
+        # Clean up the response to ensure it's valid JSON
+        if text.startswith('```json'):
+            text = text[7:]
+        if text.endswith('```'):
+            text = text[:-3]
         
-        try:
-            print("✨ Requesting recommendations from Gemini...")
-            response = self.model.generate_content(prompt)
-            # Clean up the response to ensure it's valid JSON
-            text = response.text.strip()
-            if text.startswith('```json'):
-                text = text[7:]
-            if text.endswith('```'):
-                text = text[:-3]
-            
-            recommendations = json.loads(text.strip())
-            print(f"✅ Gemini returned {len(recommendations)} recommendations.")
-            return recommendations
-            
-        except Exception as e:
-            print(f"❌ Error generating recommendations with Gemini: {e}")
-            return []
+        recommendations = json.loads(text.strip())
+        print(f"✅ Gemini returned {len(recommendations)} recommendations.")
+        return recommendations
 
     def generate_intervention(self, bias_type, severity, trade_data):
         """
@@ -102,12 +170,33 @@ class GeminiCoach:
         """
         if not self.model:
             return "⚠️ Bias detected. Please pause and review your strategy."
+        
+        try:
+            print(f"✨ Requesting intervention for {bias_type}...")
+            return self.request_intervention(bias_type, severity, trade_data)
+            
+        except Exception as e:
+            print(f"❌ Error generating intervention: {e}")
+            return f"⚠️ High risk of {bias_type} detected. Pause and reset."
+
+    def request_intervention(self, bias_type, severity, trade_data):
+        """
+        generate_intervention() without the fallback message.
+        
+        Raises:
+            GeminiError: If Gemini fails or times out
+        """
+        text = self.client.generate(self._intervention_prompt(bias_type, severity, trade_data), self.model,
+                                    INTERVENTION_DEADLINE, lane='interventions')
+        return self._clean_intervention(text)
 
+    @staticmethod
+    def _intervention_prompt(bias_type, severity, trade_data):
         prompt = f"""
         You are the ZenTrade Protocol AI, a high-performance behavioral risk coach.
         
         A trader is about to make a trade, but we detected a high risk of {bias_type} (Severity: {severity}/10).
-        Trade Context: {json.dumps(trade_data, indent=2)}
+        Trade Context: {encode_json(trade_data)}
         
         Your Goal: Stop the impulsive action using "Affective Labeling".
         
@@ -119,59 +208,175 @@ class GeminiCoach:
         
         Draft the intervention message now.
         """
-        
-        try:
-            print(f"✨ Requesting intervention for {bias_type}...")
-            response = self.model.generate_content(prompt)
-            message = response.text.strip()
-            # Remove quotes if present
-            if message.startswith('"') and message.endswith('"'):
-                message = message[1:-1]
-            return message
-            
-        except Exception as e:
-            print(f"❌ Error generating intervention: {e}")
-            return f"⚠️ High risk of {bias_type} detected. Pause and reset."
-    def analyze_trade_data(self, trade_data_sample):
+        return prompt
+
+    @staticmethod
+    def _clean_intervention(message):
+        # Remove quotes if present
+        if message.startswith('"') and message.endswith('"'):
+            message = message[1:-1]
+        return message
+
+    def analyze_trade_data(self, trade_data, local_scores=None, window_tokens=ANALYSIS_WINDOW_TOKENS,
+                           concurrency=ANALYSIS_CONCURRENCY, max_windows=ANALYSIS_MAX_WINDOWS,
+                           max_window_tokens=ANALYSIS_MAX_WINDOW_TOKENS, progress=None):
         """
         Analyze a trading log for behavioral biases using Gemini REST API.
         
+        Logs longer than `window_tokens` (estimated prompt tokens) are split
+        into consecutive windows that are analyzed in parallel (at most
+        `concurrency` calls in flight) and merged. There are never more than
+        `max_windows` windows: longer logs get larger windows, up to
+        `max_window_tokens`, and past that each window sends only its most
+        recent trades (trades_analyzed in the result says how many).
+        
         Args:
-            trade_data_sample (list): List of trade dictionaries
+            trade_data (list): List of trade dictionaries, oldest first
+            local_scores (dict): Optional bias scores already computed
+                locally (BiasDetector.score_local_biases); Gemini only scores
+                the remaining biases and these are merged into the result
+            progress (callable): Optional `progress(fraction, stage)`, called
+                before the first window and after each one finishes; if it
+                raises (e.g. a cancelled job), windows not yet started are
+                dropped and the exception propagates
             
         Returns:
             dict: Analysis results with bias scores and insights
         """
-        import requests
-        
         if not self.api_key:
             return {"error": "Gemini API key not configured"}
+        
+        local_scores = local_scores or {}
+        progress = progress or (lambda fraction, stage: None)
+        windows = self._analysis_windows(trade_data, window_tokens, max_windows, max_window_tokens)
+        progress(0.0, 'gemini')
+        if len(windows) == 1:
+            return self._with_local_scores(self._analyze_window(windows[0], local_scores), local_scores)
+        
+        print(f"✨ Analyzing {len(trade_data)} trades in {len(windows)} windows...")
+        executor = ThreadPoolExecutor(max_workers=min(concurrency, len(windows)))
+        try:
+            futures = [executor.submit(self._analyze_window, window, local_scores) for window in windows]
+            for finished, _ in enumerate(as_completed(futures), 1):
+                progress(finished / len(windows), 'gemini')
+        finally:
+            # If progress() raised, skip queued windows instead of waiting on them
+            executor.shutdown(wait=False, cancel_futures=True)
+        results = [future.result() for future in futures]
+        return self._with_local_scores(self._merge_analyses(results, [len(window) for window in windows]),
+                                       local_scores)
 
+    def _analyze_window(self, trade_data_sample, local_scores):
+        try:
+            prompt = self._analysis_prompt(trade_data_sample, local_scores)
+            print(f"✨ Requesting comprehensive bias analysis for {len(trade_data_sample)} trades "
+                  f"(~{estimate_tokens(prompt)} tokens)...")
+            text = self.client.generate(prompt, self.analysis_model, ANALYSIS_DEADLINE, ANALYSIS_CONFIG,
+                                        lane='analysis')
+        except Exception as e:
+            # One failed window is left out of the merge instead of failing the log
+            print(f"❌ HTTP Error: {e}")
+            return {"error": str(e)}
+        return self._parse_analysis(text)
+
+    @staticmethod
+    def _analysis_windows(trade_data, window_tokens, max_windows=ANALYSIS_MAX_WINDOWS,
+                          max_window_tokens=ANALYSIS_MAX_WINDOW_TOKENS):
+        """
+        Split trades into the fewest consecutive windows of near-equal size,
+        at most `max_windows` of them, each cut to its last
+        `max_window_tokens` worth of trades.
+        """
+        # Size windows from the encoded cost of a sample of trades
+        sample = trade_data[:200]
+        tokens_per_trade = max(1, estimate_tokens(encode_trades(sample)) / max(1, len(sample)))
+        window_size = max(1, int(window_tokens / tokens_per_trade))
+        count = max(1, min(max_windows, -(-len(trade_data) // window_size)))
+        bounds = [i * len(trade_data) // count for i in range(count + 1)]
+        # Contiguous tails keep trade sequences (e.g. revenge runs) intact
+        limit = max(1, int(max_window_tokens / tokens_per_trade))
+        return [trade_data[max(start, stop - limit):stop] for start, stop in zip(bounds, bounds[1:])]
+
+    @staticmethod
+    def _merge_analyses(results, sizes):
+        """
+        Reduce per-window analyses into one, weighting scores by window size.
+        
+        Bias and discipline scores are trade-weighted means, the human tax is
+        summed and the coaching insight comes from the window where the
+        overall primary bias scored highest.
+        """
+        valid = [(result, size) for result, size in zip(results, sizes)
+                 if isinstance(result, dict) and 'error' not in result]
+        if not valid:
+            return results[0]
+        
+        def number(value):
+            return value if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+        
+        def weighted_mean(values):
+            values = [(value, size) for value, size in values if value is not None]
+            if not values:
+                return None
+            return round(sum(value * size for value, size in values) / sum(size for _, size in values), 1)
+        
+        bias_names = []
+        for result, _ in valid:
+            for name in (result.get('biases') or {}):
+                if name not in bias_names:
+                    bias_names.append(name)
+        biases = {
+            name: weighted_mean([(number((result.get('biases') or {}).get(name)), size) for result, size in valid])
+            for name in bias_names
+        }
+        biases = {name: score for name, score in biases.items() if score is not None}
+        
+        candidates = {name: score for name, score in biases.items() if name != 'Clean Trades'}
+        primary_bias = max(candidates, key=candidates.get) if candidates else valid[0][0].get('primary_bias')
+        insight_source = max(
+            (result for result, _ in valid),
+            key=lambda result: number((result.get('biases') or {}).get(primary_bias)) or 0
+        )
+        
+        merged = {
+            'biases': biases,
+            'primary_bias': primary_bias,
+            'discipline_score': weighted_mean([(number(result.get('discipline_score')), size)
+                                               for result, size in valid]),
+            'human_tax_estimate': round(sum(number(result.get('human_tax_estimate')) or 0
+                                            for result, _ in valid), 2),
+            'coaching_insight': insight_source.get('coaching_insight'),
+            'windows_analyzed': len(valid),
+            'trades_analyzed': sum(size for _, size in valid)
+        }
+        if len(valid) < len(results):
+            merged['windows_failed'] = len(results) - len(valid)
+        print(f"✅ Merged {len(valid)}/{len(results)} window analyses.")
+        return merged
+
+    @staticmethod
+    def _analysis_prompt(trade_data_sample, local_scores=None):
+        local_scores = local_scores or {}
+        biases = [(name, hint) for name, hint in ANALYSIS_BIASES if name not in local_scores]
+        bias_list = "\n".join(f"        {i}. {name} ({hint})" for i, (name, hint) in enumerate(biases, 1))
+        local_note = f"""
+        These biases were already scored from the same log; do not score them again, but take them into
+        account for primary_bias and coaching_insight: {encode_json(local_scores)}
+""" if local_scores else ""
+        
         prompt = f"""
-        Analyze this trading log for 13 specific behavioral biases. 
+        Analyze this trading log for {len(biases)} specific behavioral biases. 
         Return a JSON object where each key is the bias name and the value is a score from 0-100 based on frequency and severity.
 
         Biases to analyze:
-        1. Loss Aversion (Holding losers too long)
-        2. Confirmation Bias (Only trading one asset despite losses)
-        3. Revenge Trading (Increasing size after a loss)
-        4. Herd Mentality (Trading only popular tickers: TSLA, NVDA, AAPL)
-        5. Sunk Cost Fallacy (Averaging down on a failing trade)
-        6. Overconfidence (Spiking risk after a win streak)
-        7. Availability Bias (Trading what's in the news)
-        8. Recency Bias (Overweighting the last 3 trades)
-        9. Anchoring Bias (Fixating on a previous price level)
-        10. Gambler's Fallacy (Predicting a reversal just because of a streak)
-        11. Mental Accounting (Taking high risk with 'house money')
-        12. Disposition Effect (Selling winners too early)
-        13. Clean Trades (Trades that follow discipline)
-
-        Data to analyze:
-        {json.dumps(trade_data_sample, indent=2)}
+{bias_list}
+{local_note}
+        Data to analyze (CSV, one trade per row):
+        {encode_trades(trade_data_sample)}
 
         Response Format:
         {{
-          "biases": {{ "Loss Aversion": 85, ... }},
+          "biases": {{ "{biases[0][0]}": 85, ... }},
           "primary_bias": "string",
           "discipline_score": number,
           "human_tax_estimate": number,
@@ -180,68 +385,47 @@ class GeminiCoach:
         
         Return ONLY the JSON.
         """
+        return prompt
+
+    @staticmethod
+    def _with_local_scores(analysis, local_scores):
+        """Overlay locally computed bias scores on a Gemini analysis."""
+        if not local_scores or 'error' in analysis:
+            return analysis
         
+        biases = dict(analysis.get('biases') or {})
+        biases.update(local_scores)
+        ordered = {name: biases[name] for name, _ in ANALYSIS_BIASES if name in biases}
+        ordered.update({name: score for name, score in biases.items() if name not in ordered})
+        
+        candidates = {name: score for name, score in ordered.items()
+                      if name != 'Clean Trades' and isinstance(score, (int, float))}
+        analysis['biases'] = ordered
+        if candidates:
+            analysis['primary_bias'] = max(candidates, key=candidates.get)
+        analysis['locally_scored'] = list(local_scores)
+        return analysis
+
+    @staticmethod
+    def _parse_analysis(text):
         try:
-            print(f"✨ Requesting comprehensive bias analysis for {len(trade_data_sample)} trades...")
+            print(f"📄 Raw Gemini Response: {text[:500]}...") # Print first 500 chars for debug
             
-            # Use gemini-2.0-flash (valid model, quota exceeded)
-            url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent?key={self.api_key}"
-            
-            payload = {
-                "contents": [
-                    {
-                        "parts": [
-                            {"text": prompt}
-                        ]
-                    }
-                ],
-                "generationConfig": {
-                    "temperature": 0.5, # Lower temperature for more deterministic JSON
-                    "maxOutputTokens": 2048
-                }
-            }
-            
-            response = requests.post(url, json=payload, timeout=120)  # Extended for thinking models
-            response.raise_for_status()
-            
-            result = response.json()
-            
-            # Extract text from response
-            try:
-                # Check if candidates exist
-                if "candidates" not in result or not result["candidates"]:
-                    print(f"❌ No candidates in response: {result}")
-                    return {"error": "No response candidates from Gemini"}
-                    
-                text = result["candidates"][0]["content"]["parts"][0]["text"].strip()
-                print(f"📄 Raw Gemini Response: {text[:500]}...") # Print first 500 chars for debug
-                
-                # Clean up markdown code blocks if present
-                if text.startswith('```json'):
-                    text = text[7:]
-                if text.startswith('```'):
-                    text = text[3:]
-                if text.endswith('```'):
-                    text = text[:-3]
-                
-                text = text.strip()
-                analysis = json.loads(text)
-                print("✅ Gemini analysis complete.")
-                return analysis
-            except Exception as parse_err:
-                print(f"❌ JSON Parse Error: {parse_err}")
-                print(f"❌ Problematic Text: {text}")
-                return {"error": f"Failed to parse Gemini response: {parse_err}"}
+            # Clean up markdown code blocks if present
+            if text.startswith('```json'):
+                text = text[7:]
+            if text.startswith('```'):
+                text = text[3:]
+            if text.endswith('```'):
+                text = text[:-3]
             
-        except requests.exceptions.HTTPError as e:
-            error_msg = str(e)
-            try:
-                error_detail = e.response.json()
-                error_msg = error_detail.get("error", {}).get("message", str(e))
-            except:
-                pass
-            print(f"❌ HTTP Error: {error_msg}")
-            return {"error": error_msg}
-        except Exception as e:
-            print(f"❌ Error analyzing trades with Gemini: {e}")
-            return {"error": str(e)}
+            text = text.strip()
+            analysis = json.loads(text)
+            if not isinstance(analysis, dict) or not isinstance(analysis.get('biases'), dict):
+                raise ValueError("expected a JSON object with a 'biases' object")
+            print("✅ Gemini analysis complete.")
+            return analysis
+        except Exception as parse_err:
+            print(f"❌ JSON Parse Error: {parse_err}")
+            print(f"❌ Problematic Text: {text}")
+            return {"error": f"Failed to parse Gemini response: {parse_err}"}
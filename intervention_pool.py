@@ -0,0 +1,123 @@
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# Every (bias_type, severity) pair /api/realtime can raise
+INTERVENTION_KEYS = [
+    ("Revenge Trading", 8),
+    ("Revenge Trading", 5),
+    ("Overtrading", 6),
+    ("Overtrading", 4),
+]
+
+# Pooled messages are shown for any trade attempt, so the prompt gets a
+# generic context instead of one trade's details
+POOL_TRADE_CONTEXT = {
+    "note": "Shown to the trader at the moment of any trade attempt; do not mention a specific asset or price."
+}
+
+
+class InterventionPool:
+    """
+    Pre-generated intervention messages per (bias_type, severity).
+
+    `get` never waits on Gemini: it hands out a pooled message and tops the
+    pool back up on a background thread. Messages older than
+    `max_age_seconds` are discarded so the wording keeps changing. Until a
+    pool has been filled, the last message served for that key (or the
+    coach's canned fallback) is returned instead.
+
+    Nothing is generated until start() or the first get(), so building a
+    pool (e.g. at import time) makes no Gemini calls.
+    """
+    def __init__(self, coach, pool_size=5, max_age_seconds=3600, workers=2):
+        self.coach = coach
+        self.pool_size = pool_size
+        self.max_age_seconds = max_age_seconds
+
+        self._pools = {}  # (bias_type, severity) -> deque of (message, created)
+        self._last_served = {}
+        self._refilling = set()
+        self._started = False
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="intervention-pool")
+
+    @classmethod
+    def from_env(cls, coach):
+        """Configure from INTERVENTION_POOL_SIZE and INTERVENTION_POOL_MAX_AGE."""
+        return cls(
+            coach,
+            pool_size=int(os.environ.get("INTERVENTION_POOL_SIZE", 5)),
+            max_age_seconds=int(os.environ.get("INTERVENTION_POOL_MAX_AGE", 3600))
+        )
+
+    def start(self):
+        """Fill every pool in the background (once; later calls do nothing)."""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        for bias_type, severity in INTERVENTION_KEYS:
+            self._schedule_refill((bias_type, severity))
+
+    def size(self, bias_type, severity):
+        with self._lock:
+            return len(self._pools.get((bias_type, severity), ()))
+
+    def get(self, bias_type, severity):
+        """
+        An intervention message for `bias_type` at `severity`, immediately.
+
+        Returns:
+            str: The intervention message
+        """
+        if not self.coach.model:
+            # No Gemini: the coach answers with a canned message right away
+            return self.coach.generate_intervention(bias_type, severity, POOL_TRADE_CONTEXT)
+
+        self.start()
+        key = (bias_type, severity)
+        now = time.time()
+        with self._lock:
+            pool = self._pools.setdefault(key, deque())
+            while pool and now - pool[0][1] > self.max_age_seconds:
+                pool.popleft()
+            if pool:
+                message = pool.popleft()[0]
+                self._last_served[key] = message
+            else:
+                message = self._last_served.get(key)
+        self._schedule_refill(key)
+
+        if message is None:
+            return f"⚠️ High risk of {bias_type} detected. Pause and reset."
+        return message
+
+    def _schedule_refill(self, key):
+        with self._lock:
+            if key in self._refilling or len(self._pools.get(key, ())) >= self.pool_size:
+                return
+            self._refilling.add(key)
+        self._executor.submit(self._refill, key)
+
+    def _refill(self, key):
+        bias_type, severity = key
+        try:
+            while self.size(bias_type, severity) < self.pool_size:
+                try:
+                    message = self.coach.request_intervention(bias_type, severity, POOL_TRADE_CONTEXT)
+                except Exception as e:
+                    # Try again on the next get() rather than hammering a failing API
+                    print(f"❌ Error refilling {bias_type} intervention pool: {e}")
+                    return
+                with self._lock:
+                    self._pools.setdefault(key, deque()).append((message, time.time()))
+            print(f"✅ {bias_type} (severity {severity}) intervention pool filled.")
+        finally:
+            with self._lock:
+                self._refilling.discard(key)
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,174 @@
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# Job lifecycle: queued -> running -> done | failed | cancelled
+FINISHED_STATES = ('done', 'failed', 'cancelled')
+
+
+class JobCancelled(Exception):
+    """Raised inside a job at its next progress checkpoint after cancel()."""
+
+
+class Job:
+    def __init__(self, kind):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = 'queued'
+        self.progress = 0.0
+        self.stage = 'queued'
+        self.result = None
+        self.error = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+
+        self.future = None
+        self._cancel = threading.Event()
+
+    def report(self, progress, stage):
+        """
+        Record progress (0-1) and the current stage from inside the job.
+
+        Doubles as the cancellation checkpoint: raises JobCancelled once
+        the job has been cancelled.
+        """
+        if self._cancel.is_set():
+            raise JobCancelled()
+        self.progress = round(min(1.0, max(self.progress, progress)), 3)
+        self.stage = stage
+
+    def snapshot(self, include_result=True):
+        info = {
+            'job_id': self.id,
+            'type': self.kind,
+            'status': self.status,
+            'progress': self.progress,
+            'stage': self.stage,
+            'created': self.created,
+            'started': self.started,
+            'finished': self.finished
+        }
+        if self.status == 'done' and include_result:
+            info['result'] = self.result
+        if self.error is not None:
+            info['error'] = self.error
+        return info
+
+
+class JobManager:
+    """
+    Long-running analyses on a local thread pool, for submit/poll clients.
+
+    `submit` returns at once with a Job; the work function runs on one of
+    `workers` threads and reports progress through job.report(). Finished
+    jobs keep their result for `retention_seconds` and at most `max_jobs`
+    jobs are kept in total (oldest finished ones are dropped first).
+    Cancelling a queued job removes it from the queue; a running job stops
+    at its next progress checkpoint.
+    """
+    def __init__(self, workers=2, retention_seconds=3600, max_jobs=1000):
+        self.retention_seconds = retention_seconds
+        self.max_jobs = max_jobs
+
+        self._jobs = OrderedDict()  # job_id -> Job, oldest first
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="analysis-job")
+
+    @classmethod
+    def from_env(cls):
+        """Configure from JOB_WORKERS and JOB_RETENTION_SECONDS."""
+        return cls(
+            workers=int(os.environ.get("JOB_WORKERS", 2)),
+            retention_seconds=int(os.environ.get("JOB_RETENTION_SECONDS", 3600))
+        )
+
+    def __len__(self):
+        return len(self._jobs)
+
+    def submit(self, kind, work):
+        """
+        Queue `work(job)`; its return value becomes the job's result.
+
+        Raises:
+            RuntimeError: If max_jobs unfinished jobs are already queued or running
+        """
+        job = Job(kind)
+        with self._lock:
+            self._prune()
+            if len(self._jobs) >= self.max_jobs:
+                raise RuntimeError("Too many analysis jobs in progress, try again later")
+            self._jobs[job.id] = job
+        job.future = self._executor.submit(self._run, job, work)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            self._prune()
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        """Cancel a job; returns it, or None if unknown."""
+        job = self.get(job_id)
+        if job is None or job.status in FINISHED_STATES:
+            return job
+        job._cancel.set()
+        if job.future.cancel():
+            # Never started: finish it here
+            self._finish(job, 'cancelled')
+        else:
+            with self._lock:
+                if job.status not in FINISHED_STATES:
+                    job.stage = 'cancelling'
+        return job
+
+    def _run(self, job, work):
+        with self._lock:
+            cancelled = job._cancel.is_set()
+            if not cancelled:
+                job.status = 'running'
+                job.stage = 'starting'
+                job.started = time.time()
+        if cancelled:
+            self._finish(job, 'cancelled')
+            return
+        try:
+            result = work(job)
+        except JobCancelled:
+            self._finish(job, 'cancelled')
+        except Exception as e:
+            print(f"❌ Analysis job {job.id} failed: {e}")
+            self._finish(job, 'failed', error=str(e))
+        else:
+            self._finish(job, 'done', result=result)
+
+    def _finish(self, job, status, result=None, error=None):
+        # Under the lock so _prune and cancel never see a half-finished job
+        with self._lock:
+            if status == 'done':
+                job.result = result
+                job.progress = 1.0
+            job.error = error
+            job.stage = status
+            job.finished = time.time()
+            job.status = status
+
+    def _prune(self):
+        """Drop finished jobs past retention, then the oldest finished beyond max_jobs."""
+        now = time.time()
+        finished = [job for job in self._jobs.values() if job.status in FINISHED_STATES]
+        for job in finished:
+            if now - job.finished > self.retention_seconds:
+                del self._jobs[job.id]
+        for job in finished:
+            if len(self._jobs) < self.max_jobs:
+                break
+            self._jobs.pop(job.id, None)
+
+    def close(self):
+        for job in list(self._jobs.values()):
+            job._cancel.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
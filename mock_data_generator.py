@@ -1,67 +1,167 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-import random
+
+BIAS_TYPES = ['overtrading', 'loss_aversion', 'revenge', 'normal']
+OVERTRADING, LOSS_AVERSION, REVENGE, NORMAL = range(len(BIAS_TYPES))
+
+DEFAULT_CHUNKSIZE = 1_000_000
 
 class MockDataGenerator:
-    def __init__(self, num_trades=50, start_date=None):
+    def __init__(self, num_trades=50, start_date=None, seed=None, num_traders=1, bias_mix=None):
+        """
+        Mock trade generator with realistic bias patterns.
+
+        Args:
+            num_trades: Total trades, split evenly across traders
+            start_date: First trader clock start (defaults to 30 days ago)
+            seed: Seed for reproducible output (same seed and chunksize ->
+                same trades)
+            num_traders: Number of traders; adds a Trader column when > 1
+            bias_mix: Weights per bias type ('overtrading', 'loss_aversion',
+                'revenge', 'normal'; equal by default), or a list of such
+                dicts assigned to traders round-robin
+        """
         self.num_trades = num_trades
         self.start_date = start_date or datetime.now() - timedelta(days=30)
         self.assets = ['AAPL', 'TSLA', 'MSFT', 'GOOGL', 'AMZN', 'NVDA', 'BTC', 'ETH']
-        
+        self.seed = seed
+        self.num_traders = max(1, num_traders)
+        mixes = bias_mix if isinstance(bias_mix, (list, tuple)) else [bias_mix]
+        self.bias_mixes = np.array([self._mix_probabilities(mix) for mix in mixes])
+
+    @staticmethod
+    def _mix_probabilities(mix):
+        if mix is None:
+            return np.full(len(BIAS_TYPES), 1 / len(BIAS_TYPES))
+        unknown = set(mix) - set(BIAS_TYPES)
+        if unknown:
+            raise ValueError(f"Unknown bias types in bias_mix: {sorted(unknown)}")
+        weights = np.array([mix.get(bias, 0) for bias in BIAS_TYPES], dtype=float)
+        if (weights < 0).any() or weights.sum() <= 0:
+            raise ValueError("bias_mix weights must be non-negative and not all zero")
+        return weights / weights.sum()
+
     def generate(self):
         """Generate mock trading data with realistic bias patterns"""
-        trades = []
-        current_time = self.start_date
-        previous_pl = 0
-        
-        for i in range(self.num_trades):
-            # Simulate different bias patterns
-            bias_type = random.choice(['overtrading', 'loss_aversion', 'revenge', 'normal'])
-            
-            # Determine time gap based on bias
-            if bias_type == 'revenge' and previous_pl < 0:
-                # Revenge trading: trade quickly after loss
-                minutes_gap = random.randint(5, 30)
-            elif bias_type == 'overtrading':
-                # Overtrading: frequent trades
-                minutes_gap = random.randint(10, 60)
-            else:
-                # Normal: 1-4 hours
-                minutes_gap = random.randint(60, 240)
-            
-            current_time += timedelta(minutes=minutes_gap)
-            
-            # Determine buy/sell
-            action = random.choice(['Buy', 'Sell'])
-            
-            # Determine asset
-            asset = random.choice(self.assets)
-            
-            # Determine P/L based on bias
-            if bias_type == 'loss_aversion':
-                # Loss aversion: small wins, large losses
-                if random.random() > 0.4:  # 60% win rate but small wins
-                    pl = random.uniform(10, 50)
-                else:
-                    pl = random.uniform(-100, -30)  # Larger losses
-            elif bias_type == 'revenge' and previous_pl < 0:
-                # Revenge trading: often loses more after a loss
-                pl = random.uniform(-80, 20)  # More likely to lose
-            else:
-                # Normal or overtrading: more balanced
-                if random.random() > 0.45:
-                    pl = random.uniform(20, 100)
-                else:
-                    pl = random.uniform(-60, -10)
-            
-            previous_pl = pl
-            
-            trades.append({
-                'Timestamp': current_time.isoformat(),
-                'Buy/sell': action,
-                'Asset': asset,
-                'P/L': round(pl, 2)
-            })
-        
-        return trades
+        df = self.generate_frame()
+        timestamps = df['Timestamp'].to_numpy()
+        # Match datetime.isoformat(): microseconds only when present
+        unit = 'us' if (timestamps.astype(np.int64) % 1_000_000_000).any() else 's'
+        df['Timestamp'] = np.datetime_as_string(timestamps, unit=unit)
+        return df.astype(object).to_dict('records')
+
+    def generate_frame(self):
+        """All trades as one DataFrame."""
+        return pd.concat(self.iter_frames(), ignore_index=True)
+
+    def iter_frames(self, chunksize=DEFAULT_CHUNKSIZE):
+        """
+        Yield trades as DataFrames of at most `chunksize` rows.
+
+        Trades are ordered by trader, then time. Only one chunk is in memory
+        at a time; trader clocks and loss streaks carry across chunk edges.
+        """
+        rng = np.random.default_rng(self.seed)
+        base, extra = divmod(self.num_trades, self.num_traders)
+        counts = np.full(self.num_traders, base, dtype=np.int64)
+        counts[:extra] += 1
+        offsets = np.concatenate([[0], np.cumsum(counts)])
+        trader_names = [f'trader_{i:0{len(str(self.num_traders - 1))}d}' for i in range(self.num_traders)]
+
+        state = {'trader': -1, 'time': None, 'loss': False}
+        for start in range(0, self.num_trades, chunksize):
+            stop = min(start + chunksize, self.num_trades)
+            trader = np.searchsorted(offsets, np.arange(start, stop), side='right') - 1
+            yield self._generate_chunk(rng, trader, state, trader_names)
+
+    def _generate_chunk(self, rng, trader, state, trader_names):
+        n = len(trader)
+        positions = np.arange(n)
+        segment_first = np.ones(n, dtype=bool)
+        segment_first[1:] = trader[1:] != trader[:-1]
+        segment_start = np.maximum.accumulate(np.where(segment_first, positions, 0))
+        # Does the chunk open mid-way through the previous chunk's last trader?
+        continues = trader[0] == state['trader']
+
+        # Simulate different bias patterns
+        if len(self.bias_mixes) == 1:
+            bias_type = rng.choice(len(BIAS_TYPES), size=n, p=self.bias_mixes[0])
+        else:
+            cumulative = self.bias_mixes[trader % len(self.bias_mixes)].cumsum(axis=1)
+            bias_type = np.minimum((rng.random(n)[:, None] > cumulative).sum(axis=1), len(BIAS_TYPES) - 1)
+        is_revenge = bias_type == REVENGE
+
+        # Loss or win, which for revenge trades depends on the previous
+        # outcome: a trade is a loss with probability p_after_loss if the
+        # previous one lost, p_after_win otherwise. With one uniform draw
+        # per trade, non-revenge trades fix the outcome outright and revenge
+        # trades drawn between the two probabilities repeat the previous
+        # outcome, so each outcome is the last fixed one (or the trader's
+        # starting state) - a running max instead of a loop.
+        p_base = np.where(bias_type == LOSS_AVERSION, 0.4, 0.45)
+        p_after_loss = np.where(is_revenge, 0.8, p_base)  # Revenge trading: often loses more after a loss
+        p_after_win = np.where(is_revenge, 0.45, p_base)
+        draw = rng.random(n)
+        fixed = (draw < p_after_loss) == (draw < p_after_win)
+        last_fixed = np.maximum.accumulate(np.where(fixed, positions, -1))
+        initial = np.zeros(n, dtype=bool)
+        initial[0] = continues and state['loss']
+        starting_loss = initial[segment_start]
+        is_loss = np.where(last_fixed >= segment_start, (draw < p_after_win)[np.maximum(last_fixed, 0)], starting_loss)
+        prev_loss = np.where(segment_first, starting_loss, np.roll(is_loss, 1))
+        revenge_after_loss = is_revenge & prev_loss
+
+        # Determine time gap based on bias
+        gap_low = np.select([revenge_after_loss, bias_type == OVERTRADING], [5, 10], 60)
+        gap_high = np.select([revenge_after_loss, bias_type == OVERTRADING], [30, 60], 240)
+        gap_minutes = gap_low + (rng.random(n) * (gap_high - gap_low + 1)).astype(np.int64)
+        elapsed = np.cumsum(gap_minutes * 60_000_000_000)
+        elapsed -= (elapsed - gap_minutes * 60_000_000_000)[segment_start]
+        clock = np.full(n, np.datetime64(self.start_date, 'ns').astype(np.int64))
+        if continues:
+            clock[segment_start == 0] = state['time']
+        timestamps = (clock + elapsed).astype('datetime64[ns]')
+
+        # Determine P/L based on bias
+        # Loss aversion: small wins, large losses; revenge after a loss: mostly losing
+        conditions = [bias_type == LOSS_AVERSION, revenge_after_loss]
+        low = np.where(is_loss, np.select(conditions, [-100, -80], -60), np.select(conditions, [10, 0], 20))
+        high = np.where(is_loss, np.select(conditions, [-30, 0], -10), np.select(conditions, [50, 20], 100))
+        pl = np.round(low + rng.random(n) * (high - low), 2)
+
+        state.update(trader=trader[-1], time=int(timestamps[-1].astype(np.int64)), loss=bool(is_loss[-1]))
+
+        frame = pd.DataFrame({
+            'Timestamp': timestamps,
+            'Buy/sell': pd.Categorical.from_codes(rng.integers(0, 2, n), ['Buy', 'Sell']),
+            'Asset': pd.Categorical.from_codes(rng.integers(0, len(self.assets), n), self.assets),
+            'P/L': pl
+        })
+        if self.num_traders > 1:
+            frame['Trader'] = pd.Categorical.from_codes(trader, trader_names)
+        return frame
+
+    def to_parquet(self, path, chunksize=DEFAULT_CHUNKSIZE):
+        """Write all trades to a Parquet file, one row group per chunk."""
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ValueError('Parquet output requires pyarrow (pip install pyarrow)')
+
+        writer = None
+        try:
+            for frame in self.iter_frames(chunksize):
+                table = pa.Table.from_pandas(frame, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+
+    def to_csv(self, path, chunksize=DEFAULT_CHUNKSIZE):
+        """Write all trades to a CSV file, appending one chunk at a time."""
+        for i, frame in enumerate(self.iter_frames(chunksize)):
+            frame.to_csv(path, mode='w' if i == 0 else 'a', header=i == 0, index=False)
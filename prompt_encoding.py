@@ -0,0 +1,84 @@
+import csv
+import io
+import json
+import math
+import re
+
+# Gemini's tokenizer splits numbers into single digits and long words into
+# pieces of about four characters; whitespace mostly merges into the next token
+_TOKEN_PATTERN = re.compile(r"[A-Za-z]+|\d|\n|[^\sA-Za-z\d]")
+
+# ISO timestamps, with or without seconds, fractions and an offset
+_ISO_TIMESTAMP = re.compile(r"^(\d{4}-\d{2}-\d{2})[T ](\d{2}:\d{2})(:\d{2}(\.\d+)?)?([+-]\d{2}:\d{2}|Z)?$")
+
+
+def estimate_tokens(text):
+    """
+    Rough Gemini input-token count for `text`, without an API call.
+
+    Counts one token per digit, newline and punctuation mark and one per
+    four letters of each word. Meant for sizing prompts, not billing.
+    """
+    tokens = 0
+    for match in _TOKEN_PATTERN.finditer(text):
+        piece = match.group()
+        tokens += math.ceil(len(piece) / 4) if piece[0].isalpha() else 1
+    return tokens
+
+
+def _plain(value):
+    """JSON-safe Python value for NumPy/pandas scalars."""
+    if hasattr(value, 'item'):
+        return value.item()
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+
+def _cell(value):
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return ''
+    if hasattr(value, 'item'):
+        value = value.item()
+    if isinstance(value, float):
+        # 12.5 rather than 12.500000000000002, 100 rather than 100.0
+        value = round(value, 6)
+        return str(int(value)) if value.is_integer() else repr(value)
+    if hasattr(value, 'isoformat'):
+        value = value.isoformat()
+    value = str(value)
+    # Keep seconds (rapid-fire and revenge gaps are measured in them) but
+    # drop fractional seconds, which no bias depends on
+    match = _ISO_TIMESTAMP.match(value)
+    if match:
+        seconds = match.group(3)[:3] if match.group(3) else ':00'
+        return f"{match.group(1)} {match.group(2)}{seconds}{match.group(5) or ''}"
+    return value
+
+
+def encode_trades(trades):
+    """
+    Trades as CSV text: one header row, then one row per trade.
+
+    Keys are only spelled out once, there is no indentation and timestamps
+    lose their fractional seconds, so this takes about a third of the
+    tokens of indented JSON. Columns are every key seen, in first-seen order; missing
+    values are left empty.
+    """
+    columns = []
+    for trade in trades:
+        for key in trade:
+            if key not in columns:
+                columns.append(key)
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(columns)
+    for trade in trades:
+        writer.writerow([_cell(trade.get(column)) for column in columns])
+    return buffer.getvalue().rstrip('\n')
+
+
+def encode_json(data):
+    """Single-line JSON without padding; NumPy scalars are converted."""
+    return json.dumps(data, separators=(',', ':'), default=_plain)
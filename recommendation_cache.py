@@ -0,0 +1,91 @@
+import hashlib
+import json
+import math
+import os
+
+from tiered_cache import TieredCache
+
+BIASES = ['overtrading', 'loss_aversion', 'revenge_trading']
+
+# Metric buckets: win rate in 5-point steps, everything else on a log scale
+# where neighbouring buckets differ by 25%
+WIN_RATE_STEP = 5
+LOG_BUCKET_RATIO = 1.25
+
+
+def quantize(value):
+    """Bucket a metric so traders with similar numbers share a signature."""
+    if value is None or isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        return value
+    value = float(value)
+    if math.isnan(value) or value == 0:
+        return 'zero'
+    bucket = round(math.log(abs(value)) / math.log(LOG_BUCKET_RATIO))
+    return bucket if value > 0 else f'-{bucket}'
+
+
+def signature(bias_analysis):
+    """
+    Quantized key for the recommendation prompt built from `bias_analysis`.
+
+    Covers exactly what the prompt sees: which biases were detected, their
+    severity, the bucketed metrics of detected biases, win rate and trade
+    count.
+    """
+    summary = bias_analysis.get('summary', {})
+    parts = {
+        'win_rate': round((summary.get('win_rate') or 0) / WIN_RATE_STEP),
+        'total_trades': quantize(summary.get('total_trades')),
+    }
+    for bias in BIASES:
+        result = bias_analysis.get(bias, {})
+        detected = bool(result.get('detected'))
+        parts[bias] = {
+            'detected': detected,
+            'severity': result.get('severity'),
+            'metrics': {name: quantize(value) for name, value in sorted((result.get('metrics') or {}).items())}
+            if detected else None
+        }
+    return hashlib.sha1(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+
+
+class RecommendationCache:
+    """
+    Gemini recommendations keyed by a quantized bias signature.
+
+    Entries expire `ttl_seconds` after they were generated and the least
+    recently used are dropped beyond `max_entries`. When `path` is set,
+    entries are also kept in a local SQLite file so they survive restarts
+    and can be shared by several server processes.
+    """
+    def __init__(self, ttl_seconds=86400, max_entries=1024, path=None, max_disk_entries=10000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.path = path
+        self.max_disk_entries = max_disk_entries
+
+        self._entries = TieredCache(
+            'recommendations', max_entries=max_entries, path=path,
+            max_disk_entries=max_disk_entries, ttl_seconds=ttl_seconds
+        )
+
+    @classmethod
+    def from_env(cls):
+        """Configure from RECOMMENDATION_CACHE_TTL, _SIZE and _PATH."""
+        return cls(
+            ttl_seconds=int(os.environ.get("RECOMMENDATION_CACHE_TTL", 86400)),
+            max_entries=int(os.environ.get("RECOMMENDATION_CACHE_SIZE", 1024)),
+            path=os.environ.get("RECOMMENDATION_CACHE_PATH") or None
+        )
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Cached recommendations for `key`, or None if missing or expired."""
+        return self._entries.get(key)
+
+    def put(self, key, recommendations):
+        self._entries.put(key, recommendations)
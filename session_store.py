@@ -0,0 +1,109 @@
+import os
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+
+from streaming_detector import StreamingBiasDetector
+from tiered_cache import TieredCache
+
+
+class TraderSessionStore:
+    """
+    Per-session StreamingBiasDetector state for the real-time endpoint.
+
+    Sessions live in memory and expire after `ttl_seconds` without use. When
+    `snapshot_path` is set, detector state is also written to a local SQLite
+    file every `snapshot_interval` seconds (and on eviction), so a restarted
+    server can pick sessions back up without the client resending history.
+
+    Each session has its own lock, so requests for different sessions run
+    concurrently and requests for the same session take turns.
+    """
+    def __init__(self, ttl_seconds=3600, snapshot_path=None, snapshot_interval=30, max_sessions=10000):
+        self.ttl_seconds = ttl_seconds
+        self.snapshot_path = snapshot_path
+        self.snapshot_interval = snapshot_interval
+        self.max_sessions = max_sessions
+
+        self._sessions = TieredCache(
+            'sessions', max_entries=max_sessions, path=snapshot_path,
+            ttl_seconds=ttl_seconds, on_evict=self._persist_evicted
+        )
+        self._session_locks = weakref.WeakValueDictionary()  # session_id -> Lock while in use
+        self._dirty = set()
+        self._lock = threading.Lock()  # Guards _session_locks, _dirty and _last_snapshot only
+        self._last_snapshot = time.monotonic()
+
+    @classmethod
+    def from_env(cls):
+        """Configure from SESSION_TTL_SECONDS and SESSION_SNAPSHOT_PATH."""
+        return cls(
+            ttl_seconds=int(os.environ.get("SESSION_TTL_SECONDS", 3600)),
+            snapshot_path=os.environ.get("SESSION_SNAPSHOT_PATH") or None
+        )
+
+    def __len__(self):
+        return len(self._sessions)
+
+    @contextmanager
+    def session(self, session_id, history=None):
+        """
+        Check out the detector for `session_id` under its session lock.
+
+        An unknown session is seeded from `history` when one is given;
+        otherwise the context yields None so the caller can ask for it.
+        Any changes made to the detector inside the block are kept.
+        """
+        with self._lock_for(session_id):
+            detector = self._sessions.get(session_id)
+            if detector is None and history is not None:
+                detector = StreamingBiasDetector.from_history(history)
+            yield detector
+            if detector is not None:
+                self._sessions.put(session_id, detector, persist=False)
+                with self._lock:
+                    self._dirty.add(session_id)
+        self._maybe_snapshot()
+
+    def discard(self, session_id):
+        with self._lock_for(session_id):
+            with self._lock:
+                self._dirty.discard(session_id)
+            self._sessions.delete(session_id)
+
+    def snapshot(self):
+        """Flush modified sessions to the SQLite snapshot, if configured."""
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+            self._last_snapshot = time.monotonic()
+        if self.snapshot_path:
+            # A session checked out elsewhere is pickled once it is handed back
+            self._sessions.persist(dirty, guard=self._lock_for)
+
+    def _lock_for(self, session_id):
+        with self._lock:
+            lock = self._session_locks.get(session_id)
+            if lock is None:
+                lock = self._session_locks[session_id] = threading.Lock()
+            return lock
+
+    def _maybe_snapshot(self):
+        if self.snapshot_path and time.monotonic() - self._last_snapshot >= self.snapshot_interval:
+            self.snapshot()
+
+    def _persist_evicted(self, session_id, detector, last_seen):
+        with self._lock:
+            if session_id not in self._dirty:
+                return
+            self._dirty.discard(session_id)
+            lock = self._session_locks.get(session_id)
+        if lock is None:
+            self._sessions.save(session_id, detector, last_seen)
+        elif lock.acquire(blocking=False):
+            # Persist before forgetting so a returning client resumes from disk
+            try:
+                self._sessions.save(session_id, detector, last_seen)
+            finally:
+                lock.release()
+        # Otherwise it is checked out right now and goes back in when released
@@ -59,27 +59,46 @@ async function loadMockData() {
     }
 }
 
+// Parallel column arrays: keys are sent once instead of once per trade
+function toColumns(trades) {
+    const columns = { 'Timestamp': [], 'Buy/sell': [], 'Asset': [], 'P/L': [] };
+    trades.forEach(trade => {
+        for (const key in columns) {
+            columns[key].push(trade[key]);
+        }
+    });
+    return columns;
+}
+
 async function analyzeData() {
     showLoading();
     try {
-        const response = await fetch('/api/analyze', {
+        // Streamed: each part is rendered as soon as the server finishes it
+        const response = await fetch('/api/analyze/stream', {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json'
             },
-            body: JSON.stringify({ trades: tradingData })
+            body: JSON.stringify({ trades: toColumns(tradingData) })
         });
 
-        const results = await response.json();
-
-        if (results.error) {
+        if (!response.ok) {
+            const results = await response.json();
             alert('Error: ' + results.error);
             hideLoading();
             return;
         }
 
-        displayResults(results);
-        hideLoading();
+        const results = {};
+        await readEvents(response, (name, data) => {
+            if (name === 'error') {
+                throw new Error(data.error);
+            }
+            if (name !== 'done') {
+                results[name] = data;
+                displayPart(name, results);
+            }
+        });
     } catch (error) {
         console.error('Error analyzing data:', error);
         alert('Error analyzing data: ' + error.message);
@@ -87,24 +106,61 @@ async function analyzeData() {
     }
 }
 
-function displayResults(results) {
+// Parse a text/event-stream body, calling onEvent(name, data) per event
+async function readEvents(response, onEvent) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const block = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+
+            let name = 'message';
+            let data = '';
+            block.split('\n').forEach(line => {
+                if (line.startsWith('event: ')) name = line.slice(7);
+                else if (line.startsWith('data: ')) data += line.slice(6);
+            });
+            onEvent(name, JSON.parse(data || '{}'));
+        }
+    }
+}
+
+function showResults() {
+    hideLoading();
     const resultsDiv = document.getElementById('results');
     resultsDiv.classList.remove('hidden');
     resultsDiv.classList.add('animate-fade-in');
+}
 
-    // Display summary
-    displaySummary(results.summary, results.statistics);
-
-    // Display biases
-    displayBias('overtradingCard', results.overtrading, 'Overtrading');
-    displayBias('lossAversionCard', results.loss_aversion, 'Loss Aversion');
-    displayBias('revengeTradingCard', results.revenge_trading, 'Revenge Trading');
-
-    // Display recommendations
-    displayRecommendations(results.recommendations);
-
-    // Display charts
-    displayCharts(results);
+function displayPart(name, results) {
+    showResults();
+    switch (name) {
+        case 'overtrading':
+            displayBias('overtradingCard', results.overtrading, 'Overtrading');
+            break;
+        case 'loss_aversion':
+            displayBias('lossAversionCard', results.loss_aversion, 'Loss Aversion');
+            break;
+        case 'revenge_trading':
+            displayBias('revengeTradingCard', results.revenge_trading, 'Revenge Trading');
+            break;
+        case 'statistics':
+            // Summary arrives just before statistics; charts need both plus the detectors
+            displaySummary(results.summary, results.statistics);
+            displayCharts(results);
+            break;
+        case 'recommendations':
+            displayRecommendations(results.recommendations);
+            break;
+    }
 }
 
 function displaySummary(summary, stats) {
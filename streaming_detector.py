@@ -0,0 +1,717 @@
+import bisect
+import copy
+import math
+from collections import deque
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+
+from bias_detector import (
+    BiasDetector,
+    build_recommendations,
+    score_loss_aversion,
+    score_overtrading,
+    score_revenge_trading,
+)
+
+NS_PER_MINUTE = 60 * 10**9
+NS_PER_DAY = 24 * 60 * NS_PER_MINUTE
+EPOCH_DAY = date(1970, 1, 1)
+
+
+def parse_timestamp(value):
+    """
+    Parse a trade timestamp into a naive datetime.
+
+    Timezone-aware values (e.g. the extension's ISO strings ending in 'Z') are
+    converted to UTC so they compare cleanly with naive ones.
+    """
+    if isinstance(value, datetime):
+        ts = value
+    else:
+        try:
+            ts = datetime.fromisoformat(str(value))
+        except ValueError:
+            ts = pd.Timestamp(value).to_pydatetime()
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
+    return ts
+
+
+class _StreamingQuantile:
+    """
+    P-square running estimate of a single quantile (Jain & Chlamtac, 1985).
+
+    Keeps five markers regardless of how many values were added. Exact (with
+    the same linear interpolation as pandas) until five values are seen.
+    """
+    def __init__(self, p):
+        self.p = p
+        self.count = 0
+        self.heights = []
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5]
+        self.increments = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def add(self, x):
+        self.count += 1
+        q, n = self.heights, self.positions
+        if self.count <= 5:
+            bisect.insort(q, x)
+            return
+
+        # Find the cell holding x and stretch the outer markers if needed
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = bisect.bisect_right(q, x) - 1
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        # Nudge the three middle markers towards their desired positions
+        for i in range(1, 4):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                parabolic = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+                )
+                if q[i - 1] < parabolic < q[i + 1]:
+                    q[i] = parabolic
+                else:
+                    q[i] = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                n[i] += d
+
+    def reseed(self, count, quantile_at):
+        """
+        Restart the markers from `count` values described by `quantile_at(f)`.
+
+        Used after bulk updates, where feeding every value through add()
+        would cost a Python call per value.
+        """
+        self.count = count
+        if count <= 5:
+            self.heights = sorted(quantile_at(i / max(count - 1, 1)) for i in range(count))
+            self.positions = [1, 2, 3, 4, 5]
+            self.desired = [1, 1 + 2 * self.p, 1 + 4 * self.p, 3 + 2 * self.p, 5]
+            return
+
+        fractions = [0, self.p / 2, self.p, (1 + self.p) / 2, 1]
+        self.heights = [quantile_at(f) for f in fractions]
+        self.desired = [1 + (count - 1) * f for f in fractions]
+        positions = [1]
+        for i, target in enumerate(self.desired[1:4], start=1):
+            # Markers must stay strictly ordered with room for the ones above
+            positions.append(min(max(round(target), positions[-1] + 1), count - (4 - i)))
+        positions.append(count)
+        self.positions = positions
+
+    def value(self):
+        if self.count == 0:
+            return math.nan
+        if self.count <= 5:
+            rank = self.p * (self.count - 1)
+            lower = int(rank)
+            upper = min(lower + 1, self.count - 1)
+            return self.heights[lower] + (self.heights[upper] - self.heights[lower]) * (rank - lower)
+        return self.heights[2]
+
+
+class _MagnitudeSketch:
+    """
+    Log-bucketed histogram of positive values with ~1% relative error.
+
+    Memory grows with the number of distinct buckets (a few hundred for
+    realistic P/L ranges), not with the number of values added.
+    """
+    GAMMA = 1.02
+
+    def __init__(self):
+        self.bins = {}
+        self.count = 0
+        self._log_gamma = math.log(self.GAMMA)
+
+    def add(self, value):
+        index = math.ceil(math.log(value) / self._log_gamma)
+        self.bins[index] = self.bins.get(index, 0) + 1
+        self.count += 1
+
+    def add_many(self, values):
+        if len(values) == 0:
+            return
+        indices, counts = np.unique(np.ceil(np.log(values) / self._log_gamma).astype(np.int64),
+                                    return_counts=True)
+        for index, count in zip(indices.tolist(), counts.tolist()):
+            self.bins[index] = self.bins.get(index, 0) + count
+        self.count += len(values)
+
+    def _buckets(self):
+        indices = np.array(sorted(self.bins), dtype=np.int64)
+        counts = np.array([self.bins[i] for i in indices.tolist()], dtype=np.int64)
+        values = 2 * self.GAMMA ** indices.astype(float) / (self.GAMMA + 1)
+        return values, counts
+
+    def quantile(self, q):
+        """Approximate quantile using pandas' linear interpolation between order statistics."""
+        if self.count == 0:
+            return math.nan
+        values, counts = self._buckets()
+        cumulative = np.cumsum(counts)
+        rank = q * (self.count - 1)
+        lower = int(rank)
+        upper = min(lower + 1, self.count - 1)
+        lower_value, upper_value = values[np.searchsorted(cumulative, [lower + 1, upper + 1])]
+        return float(lower_value + (upper_value - lower_value) * (rank - lower))
+
+    def extreme_mean(self, k, largest):
+        """Approximate mean of the k largest (or smallest) values."""
+        if self.count == 0 or k <= 0:
+            return math.nan
+        values, counts = self._buckets()
+        if largest:
+            values, counts = values[::-1], counts[::-1]
+        taken = np.minimum(counts, np.maximum(k - (np.cumsum(counts) - counts), 0))
+        return float((values * taken).sum() / taken.sum())
+
+
+class StreamingBiasDetector:
+    """
+    Incremental bias detection for one trader.
+
+    Holds a fixed set of running counters and sketches instead of the trade
+    history, so update() and assess() cost O(1) however many trades have been
+    seen, and update_frame() ingests whole chunks of an export at NumPy speed.
+    Results mirror BiasDetector's, with three approximations: the "small
+    move" threshold uses the mean |P/L| seen so far, the "large loss" cut-off
+    is a running estimate of the 20th loss percentile, and loss-aversion
+    medians/tails come from ~1%-accurate magnitude sketches.
+
+    Trades must arrive in chronological order; from_history() sorts for you.
+    """
+    ROLLING_WINDOW_MINUTES = 60
+
+    def __init__(self):
+        self.total_trades = 0
+        self.total_pnl = 0.0
+        self.total_abs_pnl = 0.0
+        self.max_pnl = None
+        self.min_pnl = None
+        self.assets = set()
+        self.out_of_order_trades = 0
+
+        # Previous trade
+        self.last_timestamp = None
+        self.last_pnl = None
+        self.last_asset = None
+        self.loss_streak = 0
+
+        # Per-day counters
+        self.current_day = None
+        self.trades_today = 0
+        self.trading_days = 0
+        self.max_trades_per_day = 0
+
+        # Trade spacing (minutes)
+        self.positive_gap_sum = 0.0
+        self.positive_gap_count = 0
+        self.rapid_trades = 0
+        self.small_move_gap_sum = 0.0
+        self.small_move_count = 0
+
+        # Win/loss distribution
+        self.wins = 0
+        self.win_sum = 0.0
+        self.largest_win = None
+        self.losses = 0
+        self.loss_sum = 0.0
+        self.largest_loss = None
+        self.win_sketch = _MagnitudeSketch()
+        self.loss_sketch = _MagnitudeSketch()
+        self.loss_quantile = _StreamingQuantile(0.2)
+
+        # Loss follow-up
+        self.after_loss_count = 0
+        self.after_loss_gap_sum = 0.0
+        self.after_loss_wins = 0
+        self.rapid_same_asset = 0
+        self.emotional_cluster = 0
+        self.after_large_loss_count = 0
+        self.after_large_loss_abs_sum = 0.0
+        self.after_win_count = 0
+        self.after_win_gap_sum = 0.0
+        self.multi_loss_count = 0
+        self.multi_loss_abs_sum = 0.0
+        self.human_tax = 0.0
+
+        # Timestamps inside the trailing rolling window
+        self.recent = deque()
+
+    @classmethod
+    def from_history(cls, trades):
+        """Build a detector from a list of trade dicts (any order)."""
+        detector = cls()
+        parsed = [t for t in (cls._normalize(trade) for trade in trades) if t is not None]
+        parsed.sort(key=lambda t: t[0])
+        for trade in parsed:
+            detector._apply(*trade)
+        return detector
+
+    @staticmethod
+    def _normalize(trade):
+        """Return (timestamp, asset, pnl) or None when the row is unusable."""
+        try:
+            timestamp = parse_timestamp(trade['Timestamp'])
+            pnl = float(trade.get('P/L', 0))
+        except (KeyError, TypeError, ValueError):
+            return None
+        if math.isnan(pnl):
+            return None
+        return timestamp, trade.get('Asset'), pnl
+
+    def update(self, trade):
+        """Fold a trade dict (Timestamp, Buy/sell, Asset, P/L) into the running state."""
+        normalized = self._normalize(trade)
+        if normalized is None:
+            return False
+        self._apply(*normalized)
+        return True
+
+    def assess(self, trade):
+        """
+        Score the history as if `trade` were appended, without recording it.
+
+        Returns:
+            dict: {'overtrading': {...}, 'revenge_trading': {...}}
+        """
+        probe = copy.copy(self)
+        # The sketches and asset set only feed loss aversion and statistics,
+        # which a probe never reports, so skip copying them
+        probe.assets = set()
+        probe.win_sketch = _MagnitudeSketch()
+        probe.loss_sketch = _MagnitudeSketch()
+        probe.loss_quantile = copy.deepcopy(self.loss_quantile)
+        probe.recent = deque(self.recent)
+        probe.update(trade)
+        return {
+            'overtrading': probe.detect_overtrading(),
+            'revenge_trading': probe.detect_revenge_trading()
+        }
+
+    def _apply(self, timestamp, asset, pnl):
+        gap = None
+        if self.last_timestamp is not None:
+            gap = (timestamp - self.last_timestamp).total_seconds() / 60
+            if gap < 0:
+                self.out_of_order_trades += 1
+
+        # Day boundaries
+        day = timestamp.date()
+        if day != self.current_day:
+            self.current_day = day
+            self.trades_today = 0
+            self.trading_days += 1
+        self.trades_today += 1
+        self.max_trades_per_day = max(self.max_trades_per_day, self.trades_today)
+
+        # Rolling window
+        self.recent.append(timestamp)
+        window_start = timestamp - timedelta(minutes=self.ROLLING_WINDOW_MINUTES)
+        while self.recent[0] <= window_start:
+            self.recent.popleft()
+
+        is_loss = pnl < 0
+        abs_pnl = abs(pnl)
+        self.loss_streak = self.loss_streak + 1 if is_loss else 0
+        is_biased = self.trades_today > 8
+
+        if gap is not None:
+            if gap > 0:
+                self.positive_gap_sum += gap
+                self.positive_gap_count += 1
+            if gap < 1:
+                self.rapid_trades += 1
+                is_biased = True
+
+            # Small previous move relative to the average trade so far
+            if abs(self.last_pnl) <= (self.total_abs_pnl / self.total_trades) * 0.02:
+                self.small_move_gap_sum += gap
+                self.small_move_count += 1
+
+            if self.last_pnl < 0:
+                self.after_loss_count += 1
+                self.after_loss_gap_sum += gap
+                if pnl > 0:
+                    self.after_loss_wins += 1
+                if gap < 15:
+                    self.emotional_cluster += 1
+                    is_biased = True
+                if gap < 30 and asset == self.last_asset:
+                    self.rapid_same_asset += 1
+                if self.last_pnl <= self.loss_quantile.value():
+                    self.after_large_loss_count += 1
+                    self.after_large_loss_abs_sum += abs_pnl
+            else:
+                self.after_win_count += 1
+                self.after_win_gap_sum += gap
+
+        if self.loss_streak >= 2:
+            self.multi_loss_count += 1
+            self.multi_loss_abs_sum += abs_pnl
+        if is_loss:
+            self.losses += 1
+            self.loss_sum += pnl
+            self.largest_loss = pnl if self.largest_loss is None else min(self.largest_loss, pnl)
+            self.loss_sketch.add(abs_pnl)
+            self.loss_quantile.add(pnl)
+            if is_biased:
+                self.human_tax += abs_pnl
+        elif pnl > 0:
+            self.wins += 1
+            self.win_sum += pnl
+            self.largest_win = pnl if self.largest_win is None else max(self.largest_win, pnl)
+            self.win_sketch.add(pnl)
+
+        self.total_trades += 1
+        self.total_pnl += pnl
+        self.total_abs_pnl += abs_pnl
+        self.max_pnl = pnl if self.max_pnl is None else max(self.max_pnl, pnl)
+        self.min_pnl = pnl if self.min_pnl is None else min(self.min_pnl, pnl)
+        self.assets.add(asset)
+        self.last_timestamp = timestamp
+        self.last_pnl = pnl
+        self.last_asset = asset
+
+    def update_frame(self, chunk):
+        """
+        Fold a DataFrame chunk (Timestamp, Asset, P/L columns) into the state.
+
+        Vectorized equivalent of calling update() per row: rows are sorted by
+        time within the chunk, and unparseable rows are skipped. Returns the
+        number of trades ingested.
+        """
+        timestamps = pd.to_datetime(chunk['Timestamp'], errors='coerce', utc=True).dt.tz_localize(None)
+        pnl = pd.to_numeric(chunk['P/L'], errors='coerce')
+        valid = (timestamps.notna() & pnl.notna()).to_numpy()
+        if not valid.any():
+            return 0
+
+        t = timestamps.to_numpy()[valid].astype('datetime64[ns]').astype(np.int64)
+        order = np.argsort(t, kind='stable')
+        t = t[order]
+        pnl = pnl.to_numpy(dtype=float)[valid][order]
+        asset = chunk['Asset'].to_numpy(dtype=object)[valid][order]
+        n = len(t)
+
+        abs_pnl = np.abs(pnl)
+        is_loss = pnl < 0
+        is_win = pnl > 0
+
+        # Previous-trade views, carrying the last row of the previous chunk
+        has_carry = self.last_timestamp is not None
+        if has_carry:
+            last_ns = pd.Timestamp(self.last_timestamp).value
+            self.out_of_order_trades += int((t < last_ns).sum())
+            prev_t = np.concatenate(([last_ns], t[:-1]))
+            prev_pnl = np.concatenate(([self.last_pnl], pnl[:-1]))
+            prev_asset = np.concatenate((np.array([self.last_asset], dtype=object), asset[:-1]))
+            gap = (t - prev_t) / NS_PER_MINUTE
+        else:
+            prev_pnl = np.concatenate(([np.nan], pnl[:-1]))
+            prev_asset = np.concatenate((np.array([None], dtype=object), asset[:-1]))
+            gap = np.concatenate(([np.nan], np.diff(t) / NS_PER_MINUTE))
+        has_prev = ~np.isnan(gap)
+        prev_loss = has_prev & (prev_pnl < 0)
+        prev_win = has_prev & (prev_pnl >= 0)
+
+        # Daily ordinal, continuing the open day from the previous chunk
+        day = t // NS_PER_DAY
+        positions = np.arange(n)
+        day_start = np.concatenate(([True], day[1:] != day[:-1]))
+        daily_num = positions - np.maximum.accumulate(np.where(day_start, positions, 0)) + 1
+        carry_day = (self.current_day - EPOCH_DAY).days if self.current_day is not None else None
+        continues_day = carry_day == int(day[0])
+        if continues_day:
+            first_run = positions < (np.argmax(day_start[1:]) + 1 if day_start[1:].any() else n)
+            daily_num[first_run] += self.trades_today
+        self.trading_days += int(day_start.sum()) - int(continues_day)
+        self.max_trades_per_day = max(self.max_trades_per_day, int(daily_num.max()))
+        self.current_day = EPOCH_DAY + timedelta(days=int(day[-1]))
+        self.trades_today = int(daily_num[-1])
+
+        # Loss streaks, continuing the streak open at the end of the previous chunk
+        last_reset = np.maximum.accumulate(np.where(is_loss, -1, positions))
+        streak = np.where(is_loss, positions - last_reset, 0)
+        streak[is_loss & (last_reset == -1)] += self.loss_streak
+        multi_loss = streak >= 2
+
+        # Small-move threshold uses the mean |P/L| up to and including the previous trade
+        abs_before = self.total_abs_pnl + np.cumsum(abs_pnl) - abs_pnl
+        count_before = self.total_trades + positions
+        with np.errstate(invalid='ignore', divide='ignore'):
+            small_move = has_prev & (np.abs(prev_pnl) <= abs_before / count_before * 0.02)
+
+        # Loss distribution first, so this chunk's large-loss cut-off includes its own losses
+        self.loss_sketch.add_many(abs_pnl[is_loss])
+        self.win_sketch.add_many(pnl[is_win])
+        self.losses += int(is_loss.sum())
+        large_loss_cutoff = -self.loss_sketch.quantile(0.8)
+        self.loss_quantile.reseed(self.losses, self._loss_quantile_at)
+        after_large_loss = prev_loss & (prev_pnl <= large_loss_cutoff)
+
+        self.positive_gap_sum += float(gap[has_prev & (gap > 0)].sum())
+        self.positive_gap_count += int((has_prev & (gap > 0)).sum())
+        self.rapid_trades += int((gap < 1).sum())
+        self.small_move_gap_sum += float(gap[small_move].sum())
+        self.small_move_count += int(small_move.sum())
+
+        self.after_loss_count += int(prev_loss.sum())
+        self.after_loss_gap_sum += float(gap[prev_loss].sum())
+        self.after_loss_wins += int((prev_loss & is_win).sum())
+        self.emotional_cluster += int((prev_loss & (gap < 15)).sum())
+        self.rapid_same_asset += int((prev_loss & (gap < 30) & (asset == prev_asset)).sum())
+        self.after_large_loss_count += int(after_large_loss.sum())
+        self.after_large_loss_abs_sum += float(abs_pnl[after_large_loss].sum())
+        self.after_win_count += int(prev_win.sum())
+        self.after_win_gap_sum += float(gap[prev_win].sum())
+        self.multi_loss_count += int(multi_loss.sum())
+        self.multi_loss_abs_sum += float(abs_pnl[multi_loss].sum())
+
+        is_biased = is_loss & ((daily_num > 8) | (gap < 1) | (prev_loss & (gap < 15)))
+        self.human_tax += float(abs_pnl[is_biased].sum())
+
+        self.wins += int(is_win.sum())
+        self.win_sum += float(pnl[is_win].sum())
+        self.loss_sum += float(pnl[is_loss].sum())
+        if is_win.any():
+            chunk_best = float(pnl[is_win].max())
+            self.largest_win = chunk_best if self.largest_win is None else max(self.largest_win, chunk_best)
+        if is_loss.any():
+            chunk_worst = float(pnl[is_loss].min())
+            self.largest_loss = chunk_worst if self.largest_loss is None else min(self.largest_loss, chunk_worst)
+
+        self.total_trades += n
+        self.total_pnl += float(pnl.sum())
+        self.total_abs_pnl += float(abs_pnl.sum())
+        self.max_pnl = float(pnl.max()) if self.max_pnl is None else max(self.max_pnl, float(pnl.max()))
+        self.min_pnl = float(pnl.min()) if self.min_pnl is None else min(self.min_pnl, float(pnl.min()))
+        self.assets.update(pd.unique(asset).tolist())
+
+        # Rolling window keeps only the trailing hour, across the chunk boundary
+        window_start = t[-1] - self.ROLLING_WINDOW_MINUTES * NS_PER_MINUTE
+        recent_ns = t[t > window_start]
+        cutoff = pd.Timestamp(window_start).to_pydatetime()
+        kept = [ts for ts in self.recent if ts > cutoff] if len(recent_ns) == n else []
+        self.recent = deque(kept + [ts.to_pydatetime() for ts in pd.to_datetime(recent_ns)])
+
+        self.last_timestamp = pd.Timestamp(t[-1]).to_pydatetime()
+        self.last_pnl = float(pnl[-1])
+        self.last_asset = asset[-1]
+        self.loss_streak = int(streak[-1])
+        return n
+
+    def _loss_quantile_at(self, fraction):
+        """Quantile of loss P/L (negative values) read from the magnitude sketch."""
+        if fraction <= 0:
+            return self.largest_loss
+        return -self.loss_sketch.quantile(1 - fraction)
+
+    @property
+    def trades_last_hour(self):
+        return len(self.recent)
+
+    def detect_overtrading(self):
+        """Overtrading result in the same shape as BiasDetector.detect_overtrading."""
+        if self.total_trades == 0:
+            return {'detected': False, 'severity': 'Low', 'score': 0, 'metrics': {},
+                    'description': 'Insufficient data to detect overtrading patterns.'}
+
+        avg_trades_per_day = self.total_trades / self.trading_days
+        rapid_trade_pct = (self.rapid_trades / self.total_trades) * 100
+        avg_time_between_trades = (self.positive_gap_sum / self.positive_gap_count
+                                   if self.positive_gap_count else math.nan)
+
+        avg_time_after_small_move = (self.small_move_gap_sum / self.small_move_count
+                                     if self.small_move_count else 0)
+        frequency_increase_ratio = (avg_time_between_trades / avg_time_after_small_move
+                                    if avg_time_after_small_move > 0 else 1)
+
+        total_estimated_costs = self.total_abs_pnl * 0.001
+        cost_to_return_ratio = abs(total_estimated_costs / self.total_pnl) if self.total_pnl != 0 else 0
+
+        score = score_overtrading(avg_trades_per_day, self.max_trades_per_day, rapid_trade_pct,
+                                  frequency_increase_ratio, cost_to_return_ratio, self.total_pnl)
+        severity = 'Low' if score < 50 else 'Moderate' if score < 80 else 'High'
+
+        return {
+            'detected': score > 50,
+            'severity': severity,
+            'score': min(100, round(score, 1)),
+            'metrics': {
+                'avg_trades_per_day': round(avg_trades_per_day, 2),
+                'max_trades_per_day': self.max_trades_per_day,
+                'trades_today': self.trades_today,
+                'trades_last_hour': self.trades_last_hour,
+                'rapid_trade_percentage': round(rapid_trade_pct, 1),
+                'avg_minutes_between_trades': round(avg_time_between_trades, 1) if not math.isnan(avg_time_between_trades) else 0,
+                'frequency_increase_after_small_moves': round(frequency_increase_ratio, 2),
+                'cost_to_return_ratio': round(cost_to_return_ratio * 100, 1) if cost_to_return_ratio > 0 else 0,
+                'total_estimated_costs': round(total_estimated_costs, 2),
+                'total_net_return': round(self.total_pnl, 2)
+            },
+            'description': BiasDetector._get_overtrading_description(severity, avg_trades_per_day, rapid_trade_pct, cost_to_return_ratio)
+        }
+
+    def detect_loss_aversion(self):
+        """Loss aversion result in the same shape as BiasDetector.detect_loss_aversion."""
+        if self.wins == 0 or self.losses == 0:
+            return {
+                'detected': False,
+                'severity': 'Low',
+                'score': 0,
+                'metrics': {},
+                'description': 'Insufficient data to detect loss aversion patterns.'
+            }
+
+        avg_win = self.win_sum / self.wins
+        avg_loss = abs(self.loss_sum / self.losses)
+        risk_reward_ratio = avg_win / avg_loss if avg_loss > 0 else 0
+
+        if self.losses > 1:
+            third = max(1, self.losses // 3)
+            earlier = self.loss_sketch.extreme_mean(third, largest=False)
+            loss_escalation = self.loss_sketch.extreme_mean(third, largest=True) / earlier if earlier > 0 else 1
+        else:
+            loss_escalation = 1
+
+        largest_win = self.largest_win
+        largest_loss = abs(self.largest_loss)
+        loss_to_win_ratio = largest_loss / largest_win if largest_win > 0 else 0
+
+        median_win = self.win_sketch.quantile(0.5)
+        median_loss = self.loss_sketch.quantile(0.5)
+        win_rate = (self.wins / self.total_trades) * 100
+        cutting_winners_pattern = win_rate > 55 and risk_reward_ratio < 1.2
+
+        score = score_loss_aversion(risk_reward_ratio, loss_escalation, loss_to_win_ratio,
+                                    cutting_winners_pattern, median_win, median_loss)
+        severity = 'Low' if score < 30 else 'Moderate' if score < 60 else 'High'
+
+        return {
+            'detected': score > 25,
+            'severity': severity,
+            'score': min(100, round(score, 1)),
+            'metrics': {
+                'risk_reward_ratio': round(risk_reward_ratio, 2),
+                'avg_win': round(avg_win, 2),
+                'avg_loss': round(avg_loss, 2),
+                'median_win': round(median_win, 2),
+                'median_loss': round(median_loss, 2),
+                'win_rate': round(win_rate, 1),
+                'largest_win': round(largest_win, 2),
+                'largest_loss': round(largest_loss, 2),
+                'loss_to_win_ratio': round(loss_to_win_ratio, 2),
+                'loss_escalation_factor': round(loss_escalation, 2)
+            },
+            'description': BiasDetector._get_loss_aversion_description(severity, risk_reward_ratio, loss_to_win_ratio, cutting_winners_pattern)
+        }
+
+    def detect_revenge_trading(self):
+        """Revenge trading result in the same shape as BiasDetector.detect_revenge_trading."""
+        if self.total_trades < 2 or self.losses == 0 or self.after_loss_count == 0:
+            return {'detected': False, 'severity': 'Low', 'score': 0, 'metrics': {},
+                    'description': 'Insufficient data to detect revenge trading patterns.'}
+
+        avg_abs_pl_normal = self.total_abs_pnl / self.total_trades
+        avg_abs_pl_after_large_loss = (self.after_large_loss_abs_sum / self.after_large_loss_count
+                                       if self.after_large_loss_count else 0)
+        size_increase_ratio = avg_abs_pl_after_large_loss / avg_abs_pl_normal if avg_abs_pl_normal > 0 else 1
+
+        rapid_same_asset_pct = (self.rapid_same_asset / self.after_loss_count) * 100
+        emotional_cluster_pct = (self.emotional_cluster / self.after_loss_count) * 100
+
+        if self.multi_loss_count:
+            avg_size_after_multiple = self.multi_loss_abs_sum / self.multi_loss_count
+            escalation_ratio = avg_size_after_multiple / avg_abs_pl_normal if avg_abs_pl_normal > 0 else 1
+        else:
+            escalation_ratio = 1
+
+        avg_time_after_loss = self.after_loss_gap_sum / self.after_loss_count
+        avg_time_after_win = (self.after_win_gap_sum / self.after_win_count
+                              if self.after_win_count else avg_time_after_loss)
+        win_rate_after_loss = (self.after_loss_wins / self.after_loss_count) * 100
+
+        score = score_revenge_trading(size_increase_ratio, rapid_same_asset_pct, emotional_cluster_pct,
+                                      escalation_ratio, avg_time_after_loss, avg_time_after_win,
+                                      win_rate_after_loss)
+        severity = 'Low' if score < 30 else 'Moderate' if score < 60 else 'High'
+
+        return {
+            'detected': score > 25,
+            'severity': severity,
+            'score': min(100, round(score, 1)),
+            'metrics': {
+                'avg_minutes_after_loss': round(avg_time_after_loss, 1),
+                'avg_minutes_after_win': round(avg_time_after_win, 1),
+                'rapid_same_asset_pct': round(rapid_same_asset_pct, 1),
+                'emotional_cluster_pct': round(emotional_cluster_pct, 1),
+                'win_rate_after_loss': round(win_rate_after_loss, 1),
+                'size_increase_after_large_loss': round(size_increase_ratio, 2),
+                'risk_escalation_ratio': round(escalation_ratio, 2),
+                'trades_after_consecutive_losses': self.multi_loss_count,
+                'current_loss_streak': self.loss_streak
+            },
+            'description': BiasDetector._get_revenge_trading_description(severity, emotional_cluster_pct, rapid_same_asset_pct, escalation_ratio)
+        }
+
+    def generate_summary(self):
+        """Summary in the same shape as BiasDetector.generate_summary."""
+        biases_detected = []
+        if self.detect_overtrading()['detected']:
+            biases_detected.append('Overtrading')
+        if self.detect_loss_aversion()['detected']:
+            biases_detected.append('Loss Aversion')
+        if self.detect_revenge_trading()['detected']:
+            biases_detected.append('Revenge Trading')
+
+        return {
+            'total_trades': self.total_trades,
+            'total_pnl': round(self.total_pnl, 2),
+            'win_rate': round((self.wins / self.total_trades) * 100, 1) if self.total_trades else 0,
+            'biases_detected': biases_detected,
+            'bias_count': len(biases_detected)
+        }
+
+    def generate_recommendations(self):
+        return build_recommendations(self.detect_overtrading(), self.detect_loss_aversion(),
+                                     self.detect_revenge_trading())
+
+    def calculate_human_tax(self):
+        return round(self.human_tax, 2)
+
+    def calculate_prosperity_projection(self):
+        return round(self.calculate_human_tax() * ((1 + 0.07) ** 10), 2)
+
+    def get_statistics(self):
+        """Statistics in the same shape as BiasDetector.get_statistics."""
+        return {
+            'total_trades': self.total_trades,
+            'winning_trades': self.wins,
+            'losing_trades': self.losses,
+            'total_pnl': round(self.total_pnl, 2),
+            'avg_pnl': round(self.total_pnl / self.total_trades, 2) if self.total_trades else 0,
+            'largest_win': round(self.max_pnl, 2) if self.total_trades else 0,
+            'largest_loss': round(self.min_pnl, 2) if self.total_trades else 0,
+            'win_rate': round((self.wins / self.total_trades) * 100, 1) if self.total_trades else 0,
+            'trading_days': self.trading_days,
+            'unique_assets': len(self.assets),
+            'human_tax': self.calculate_human_tax(),
+            'prosperity_projection': self.calculate_prosperity_projection()
+        }
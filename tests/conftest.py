@@ -0,0 +1,6 @@
+import os
+
+# Keep tests offline and in memory whatever the developer's .env holds
+# (load_dotenv never overrides variables that are already set)
+for name in ("GEMINI_API_KEY", "ANALYSIS_CACHE_PATH", "RECOMMENDATION_CACHE_PATH", "SESSION_SNAPSHOT_PATH"):
+    os.environ[name] = ""
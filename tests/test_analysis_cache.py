@@ -0,0 +1,142 @@
+import pickle
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from analysis_cache import AnalysisCache
+from bias_detector import BiasDetector
+from mock_data_generator import MockDataGenerator
+from tiered_cache import connect
+
+
+@pytest.fixture(scope='module')
+def log():
+    return MockDataGenerator(num_trades=400, start_date=datetime(2024, 1, 1), seed=11).generate_frame()
+
+
+class Builds:
+    """build() stand-in that records the detectors it was handed."""
+    def __init__(self):
+        self.detectors = []
+
+    def __call__(self, detector):
+        self.detectors.append(detector)
+        return {'trades': len(detector.df), 'statistics': detector.get_statistics()}
+
+
+def test_fingerprint_ignores_formatting_and_extra_columns(log):
+    cache = AnalysisCache()
+    reformatted = log.assign(
+        Timestamp=log['Timestamp'].dt.strftime('%Y-%m-%dT%H:%M:%S.000Z'),
+        **{'P/L': log['P/L'].astype(str), 'Note': 'exported'}
+    )
+    assert cache._key(log)[2] == cache._key(reformatted)[2]
+
+
+def test_fingerprint_depends_on_trades_and_order(log):
+    cache = AnalysisCache()
+    fingerprint = cache._key(log)[2]
+    assert cache._key(log.iloc[::-1])[2] != fingerprint
+    assert cache._key(log.assign(**{'P/L': log['P/L'] + 0.01}))[2] != fingerprint
+    assert cache._key(log.copy())[2] == fingerprint
+
+
+def test_missing_labels_stay_missing(log):
+    gappy = log.assign(Asset=log['Asset'].astype(object), Trader='desk').head(50)
+    gappy.loc[gappy.index[::5], 'Asset'] = None
+    gappy.loc[gappy.index[::7], 'Trader'] = float('nan')
+    normalized = AnalysisCache.normalize(gappy)
+    assert normalized['Asset'].isna().sum() == gappy['Asset'].isna().sum()
+    assert normalized['Trader'].isna().sum() == gappy['Trader'].isna().sum()
+    assert not normalized['Asset'].isin(['nan', 'None']).any()
+    single = gappy.drop(columns='Trader')
+    assert (BiasDetector(AnalysisCache.normalize(single)).get_statistics()['unique_assets']
+            == BiasDetector(single).get_statistics()['unique_assets'])
+
+
+def test_identical_log_is_served_from_cache(log):
+    cache, build = AnalysisCache(), Builds()
+    first = cache.analyze(log, build)
+    assert cache.analyze(log.copy(), build) is first
+    assert len(build.detectors) == 1
+
+
+def test_appended_log_extends_cached_detector(log, monkeypatch):
+    extended = []
+    original = BiasDetector.extend
+    monkeypatch.setattr(BiasDetector, 'extend', lambda self, df: extended.append(len(df)) or original(self, df))
+
+    cache, build = AnalysisCache(), Builds()
+    cache.analyze(log.iloc[:300], build)
+    result = cache.analyze(log, build)
+    assert extended == [100]
+    assert result['trades'] == 400
+    assert result['statistics'] == BiasDetector(AnalysisCache.normalize(log)).get_statistics()
+    assert len(cache) == 2
+
+
+def test_least_recently_used_entry_is_evicted(log):
+    cache, build = AnalysisCache(max_entries=2), Builds()
+    logs = [log.iloc[i * 100:(i + 1) * 100] for i in range(3)]
+    cache.analyze(logs[0], build)
+    cache.analyze(logs[1], build)
+    cache.analyze(logs[0], build)
+    cache.analyze(logs[2], build)
+    assert len(cache) == 2 and len(build.detectors) == 3
+    cache.analyze(logs[0], build)
+    assert len(build.detectors) == 3
+    cache.analyze(logs[1], build)
+    assert len(build.detectors) == 4
+
+
+def test_row_budget_evicts_but_keeps_newest(log):
+    cache, build = AnalysisCache(max_rows=250), Builds()
+    cache.analyze(log.iloc[:200], build)
+    cache.analyze(log.iloc[200:], build)
+    assert len(cache) == 1
+    cache.analyze(log, build)
+    assert len(cache) == 1
+
+
+def test_sqlite_tier_survives_restart(log, tmp_path):
+    path = str(tmp_path / 'analyses.db')
+    first = AnalysisCache(path=path).analyze(log, Builds())
+
+    build = Builds()
+    restarted = AnalysisCache(path=path)
+    assert restarted.analyze(log, build) == first
+    assert build.detectors == []
+    # Detectors stay in memory: an appended log is built afresh after a restart
+    longer = pd.concat([log, log.tail(5).assign(Timestamp=log['Timestamp'].max() + pd.Timedelta(minutes=5))])
+    assert restarted.analyze(longer, build)['trades'] == 405
+    assert len(build.detectors) == 1
+
+
+def test_sqlite_tier_stores_results_without_detectors(log, tmp_path):
+    path = str(tmp_path / 'analyses.db')
+    cache = AnalysisCache(path=path)
+    cache.analyze(log.iloc[:100], Builds(), cacheable=lambda detector, result: False)
+    cache.analyze(log, Builds())
+    with connect(path) as conn:
+        rows = [pickle.loads(value) for value, in conn.execute('SELECT value FROM analyses')]
+    assert [(rows, result['trades'], detector) for rows, result, detector in rows] == [(400, 400, None)]
+
+
+def test_rejected_result_is_rebuilt_on_the_same_detector(log):
+    cache, build = AnalysisCache(), Builds()
+    never = lambda detector, result: False
+    cache.analyze(log, build, cacheable=never)
+    cache.analyze(log, build, cacheable=never)
+    assert len(build.detectors) == 2
+    assert build.detectors[0] is build.detectors[1]
+    cache.analyze(log, build)
+    cache.analyze(log, build)
+    assert len(build.detectors) == 3
+
+
+def test_iter_analyze_caches_assembled_parts(log):
+    cache = AnalysisCache()
+    parts = lambda detector: iter([('trades', len(detector.df)), ('days', detector.get_statistics()['trading_days'])])
+    first = list(cache.iter_analyze(log, parts))
+    assert list(cache.iter_analyze(log, lambda detector: iter(()))) == first
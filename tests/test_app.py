@@ -0,0 +1,106 @@
+import threading
+import time
+
+import pytest
+
+import app as app_module
+from analysis_cache import AnalysisCache
+from bias_detector import BiasDetector
+from job_queue import JobManager
+
+UTC_TRADES = [
+    {'Timestamp': '2024-01-02T09:30:00Z', 'Buy/sell': 'Buy', 'Asset': 'AAPL', 'P/L': 120},
+    {'Timestamp': '2024-01-02T09:31:00Z', 'Buy/sell': 'Sell', 'Asset': 'AAPL', 'P/L': -80},
+    {'Timestamp': '2024-01-02T09:35:00Z', 'Buy/sell': 'Buy', 'Asset': 'AAPL', 'P/L': -150},
+    {'Timestamp': '2024-01-03T10:00:00Z', 'Buy/sell': 'Sell', 'Asset': 'TSLA', 'P/L': 60},
+]
+
+
+@pytest.fixture
+def client():
+    return app_module.app.test_client()
+
+
+def test_analyze_accepts_utc_timestamps(client):
+    response = client.post('/api/analyze', json={'trades': UTC_TRADES})
+    assert response.status_code == 200
+    assert response.get_json()['statistics']['trading_days'] == 2
+
+
+def test_timeline_accepts_utc_timestamps(client):
+    response = client.post('/api/timeline', json={'trades': UTC_TRADES, 'window_days': 1})
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize('window', [[7], {'days': 7}, 'monthly', 0, 2.5, True])
+def test_timeline_rejects_bad_windows(client, window):
+    response = client.post('/api/timeline', json={'trades': UTC_TRADES, 'window': window})
+    assert response.status_code == 400
+
+
+def test_fallback_recommendations_are_not_cached(client, monkeypatch):
+    calls = []
+    # Fresh fallback lists each time: caching must go by the flag, not identity
+    fallback = BiasDetector.generate_recommendations
+    monkeypatch.setattr(BiasDetector, 'generate_recommendations', lambda self: list(fallback(self)))
+
+    def failing(bias_analysis):
+        calls.append(bias_analysis)
+        raise TimeoutError('Gemini timed out')
+
+    monkeypatch.setattr(app_module, 'analysis_cache', AnalysisCache())
+    monkeypatch.setattr(app_module.gemini_coach, 'model', 'gemini-test')
+    monkeypatch.setattr(app_module.gemini_coach, 'generate_recommendations', failing)
+    for _ in range(2):
+        response = client.post('/api/analyze', json={'trades': UTC_TRADES})
+        assert response.status_code == 200
+        assert response.get_json()['recommendations']
+        assert response.get_json()['from_gemini'] is False
+    assert len(calls) == 2
+
+    monkeypatch.setattr(app_module.gemini_coach, 'generate_recommendations',
+                        lambda bias_analysis: [{'bias': 'General', 'recommendation': 'Pause.', 'priority': 'Low'}])
+    for _ in range(2):
+        response = client.post('/api/analyze', json={'trades': UTC_TRADES})
+        assert response.get_json()['recommendations'][0]['recommendation'] == 'Pause.'
+        assert response.get_json()['from_gemini'] is True
+    monkeypatch.setattr(app_module.gemini_coach, 'generate_recommendations', failing)
+    assert client.post('/api/analyze', json={'trades': UTC_TRADES}).get_json()['recommendations'][0]['priority'] == 'Low'
+    assert len(calls) == 2
+
+
+@pytest.fixture
+def jobs(monkeypatch):
+    manager = JobManager(workers=1)
+    monkeypatch.setattr(app_module, 'job_manager', manager)
+    yield manager
+    manager.close()
+
+
+def wait_for_job(client, job_id):
+    for _ in range(500):
+        info = client.get(f'/api/jobs/{job_id}').get_json()
+        if info['status'] in ('done', 'failed', 'cancelled'):
+            return info
+        time.sleep(0.01)
+    raise AssertionError('job did not finish')
+
+
+def test_cancelled_analyze_job_never_parses_trades(client, jobs, monkeypatch):
+    parsed = []
+    monkeypatch.setattr(app_module, 'trades_frame', lambda trades: parsed.append(trades))
+    release = threading.Event()
+    jobs.submit('analyze', lambda job: release.wait(5))
+
+    job_id = client.post('/api/jobs', json={'type': 'analyze', 'trades': UTC_TRADES}).get_json()['job_id']
+    assert client.delete(f'/api/jobs/{job_id}').get_json()['status'] == 'cancelled'
+    release.set()
+    assert wait_for_job(client, job_id)['status'] == 'cancelled'
+    assert parsed == []
+
+
+def test_malformed_analyze_job_fails_with_the_parse_error(client, jobs):
+    response = client.post('/api/jobs', json={'type': 'analyze', 'trades': [{'Asset': 'AAPL'}]})
+    assert response.status_code == 202
+    info = wait_for_job(client, response.get_json()['job_id'])
+    assert info['status'] == 'failed' and info['error']
@@ -0,0 +1,47 @@
+import runpy
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import batch_analysis
+from batch_analysis import analyze_accounts, partition_accounts
+
+APP_PATH = Path(__file__).resolve().parent.parent / 'app.py'
+
+
+def account(pnl):
+    return [{'Timestamp': f'2024-01-02 10:{minute:02d}:00', 'Buy/sell': 'Buy', 'Asset': 'AAPL', 'P/L': value}
+            for minute, value in enumerate(pnl)]
+
+
+ACCOUNTS = {
+    'a': account([100, -50, -60, 20]),
+    'b': account([-10, 30]),
+    'broken': [{'Timestamp': None, 'Buy/sell': 'Buy', 'Asset': 'AAPL', 'P/L': 1}],
+}
+
+
+def test_results_keep_account_order_and_errors():
+    with ThreadPoolExecutor(2) as executor:
+        result = analyze_accounts(ACCOUNTS, executor=executor, num_workers=2)
+    assert list(result['accounts']) == ['a', 'b', 'broken']
+    assert 'error' in result['accounts']['broken']
+    assert result['aggregate']['analyzed'] == 2 and result['aggregate']['failed'] == 1
+    assert result['aggregate']['total_trades'] == 6
+
+
+def test_process_pool_matches_in_process_run():
+    expected = {account_id: batch_analysis.analyze_account(trades) for account_id, trades in ACCOUNTS.items()}
+    assert analyze_accounts(ACCOUNTS, num_workers=1)['accounts'] == expected
+
+
+def test_partitions_balance_trade_counts():
+    accounts = [(str(i), [None] * size) for i, size in enumerate([10, 9, 1, 1, 1, 1])]
+    loads = sorted(sum(len(trades) for _, trades in p) for p in partition_accounts(accounts, 2))
+    assert loads == [11, 12]
+
+
+def test_spawned_worker_import_skips_server():
+    # What a spawn-context worker runs when the server was started as `python app.py`
+    namespace = runpy.run_path(str(APP_PATH), run_name='__mp_main__')
+    for name in ('app', 'gemini_coach', 'analysis_cache', 'session_store', 'job_manager', 'intervention_pool'):
+        assert name not in namespace
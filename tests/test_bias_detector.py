@@ -0,0 +1,193 @@
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bias_detector import BiasDetector
+from mock_data_generator import MockDataGenerator
+
+NAIVE = ['2024-01-02 09:30:00', '2024-01-02 09:31:00', '2024-01-02 23:50:00', '2024-01-03 10:00:00']
+
+
+def trades(timestamps, pnl=(120.0, -80.0, -40.0, 60.0)):
+    return pd.DataFrame({
+        'Timestamp': timestamps,
+        'Buy/sell': ['Buy', 'Sell', 'Buy', 'Sell'],
+        'Asset': ['AAPL', 'AAPL', 'TSLA', 'AAPL'],
+        'P/L': list(pnl),
+    })
+
+
+@pytest.mark.parametrize('timestamps', [
+    ['2024-01-02T09:30:00Z', '2024-01-02T09:31:00Z', '2024-01-02T23:50:00Z', '2024-01-03T10:00:00Z'],
+    ['2024-01-02T09:30:00.000Z', '2024-01-02T09:31:00.000Z', '2024-01-02T23:50:00.000Z', '2024-01-03T10:00:00.000Z'],
+    pd.to_datetime(NAIVE).tz_localize('UTC'),
+])
+def test_utc_timestamps_match_naive(timestamps):
+    expected = BiasDetector(trades(NAIVE))
+    detector = BiasDetector(trades(timestamps))
+    assert detector.df['Timestamp'].dtype == 'datetime64[ns]'
+    assert detector.df['Timestamp'].tolist() == expected.df['Timestamp'].tolist()
+    assert detector.get_statistics() == expected.get_statistics()
+
+
+def test_offset_timestamps_are_converted_to_utc():
+    detector = BiasDetector(trades(['2024-01-03T01:30:00+05:00', '2024-01-03T01:31:00+05:00',
+                                    '2024-01-03T04:50:00+05:00', '2024-01-03T15:00:00+05:00']))
+    assert detector.df['Timestamp'].tolist() == pd.to_datetime(
+        ['2024-01-02 20:30:00', '2024-01-02 20:31:00', '2024-01-02 23:50:00', '2024-01-03 10:00:00']).tolist()
+    assert detector.get_statistics()['trading_days'] == 2
+
+
+def test_rows_without_timestamp_or_pnl_are_dropped():
+    df = trades(NAIVE, pnl=(120.0, np.nan, -40.0, 60.0))
+    df.loc[0, 'Timestamp'] = None
+    detector = BiasDetector(df)
+    assert len(detector.df) == 2
+
+
+def test_empty_log_is_rejected():
+    with pytest.raises(ValueError):
+        BiasDetector(trades(NAIVE, pnl=(np.nan,) * 4))
+
+
+@pytest.fixture(scope='module')
+def desk():
+    return MockDataGenerator(num_trades=3000, start_date=datetime(2024, 1, 1), seed=7, num_traders=4).generate_frame()
+
+
+def test_score_traders_matches_one_detector_per_trader(desk):
+    scores = BiasDetector(desk).score_traders()
+    assert sorted(scores.index) == sorted(desk['Trader'].unique())
+    for trader, trades in desk.groupby('Trader'):
+        single = BiasDetector(trades.drop(columns='Trader'))
+        row = scores.loc[trader]
+        for bias, detect in (('overtrading', single.detect_overtrading),
+                             ('loss_aversion', single.detect_loss_aversion),
+                             ('revenge_trading', single.detect_revenge_trading)):
+            result = detect()
+            assert row[f'{bias}_score'] == pytest.approx(result['score'], abs=0.1)
+            assert row[f'{bias}_detected'] == result['detected']
+        statistics = single.get_statistics()
+        for field in ('total_trades', 'winning_trades', 'losing_trades', 'trading_days', 'unique_assets'):
+            assert row[field] == statistics[field]
+        assert row['total_pnl'] == pytest.approx(statistics['total_pnl'])
+        assert row['human_tax'] == pytest.approx(statistics['human_tax'])
+
+
+def test_score_traders_requires_trader_column():
+    with pytest.raises(ValueError):
+        BiasDetector(trades(NAIVE)).score_traders()
+
+
+@pytest.fixture(scope='module')
+def history():
+    return MockDataGenerator(num_trades=2000, start_date=datetime(2024, 1, 1), seed=5).generate_frame()
+
+
+def test_timeline_has_one_window_per_calendar_day(history):
+    timeline = BiasDetector(history).timeline(7)
+    days = pd.date_range(history['Timestamp'].min().normalize(), history['Timestamp'].max().normalize())
+    assert timeline['dates'] == [day.strftime('%Y-%m-%d') for day in days]
+    assert timeline['window_days'] == 7
+    for series in ('trades', 'pnl', 'overtrading', 'loss_aversion', 'revenge_trading'):
+        assert len(timeline[series]) == len(days)
+
+
+def test_timeline_windows_sum_trailing_days(history):
+    timeline = BiasDetector(history).timeline(7)
+    per_day = history.groupby(history['Timestamp'].dt.normalize())['P/L'].agg(['size', 'sum'])
+    per_day = per_day.reindex(pd.to_datetime(timeline['dates']), fill_value=0)
+    assert timeline['trades'] == per_day['size'].rolling(7, min_periods=1).sum().astype(int).tolist()
+    assert timeline['pnl'] == pytest.approx(per_day['sum'].rolling(7, min_periods=1).sum().round(2).tolist())
+
+
+def test_timeline_window_covering_history_matches_detectors(history):
+    detector = BiasDetector(history)
+    last = {name: series[-1] for name, series in detector.timeline(len(history)).items() if isinstance(series, list)}
+    assert last['trades'] == len(history)
+    assert last['overtrading'] == pytest.approx(detector.detect_overtrading()['score'], abs=1)
+    assert last['loss_aversion'] == pytest.approx(detector.detect_loss_aversion()['score'], abs=1)
+    assert last['revenge_trading'] == pytest.approx(detector.detect_revenge_trading()['score'], abs=1)
+
+
+def test_timeline_window_is_normalized_before_caching(history):
+    detector = BiasDetector(history)
+    assert detector.timeline(7.0) is detector.timeline(7)
+    assert detector.timeline(np.int64(7)) is detector.timeline(7)
+
+
+@pytest.mark.parametrize('window_days', [0, -3, 7.5, True])
+def test_timeline_rejects_partial_or_non_positive_windows(history, window_days):
+    with pytest.raises(ValueError):
+        BiasDetector(history).timeline(window_days)
+
+
+def timeline_peak_bytes(pnl, timestamps):
+    detector = BiasDetector(trades(timestamps, pnl))
+    tracemalloc.start()
+    try:
+        detector.timeline(7)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.mark.parametrize('timestamps', [
+    ['2024-01-01 10:00', '2024-03-01 10:00', '2024-06-02 10:00', '2024-06-03 10:00'],
+    ['2015-01-01 10:00', '2018-03-01 10:00', '2021-06-02 10:00', '2024-12-31 10:00'],
+])
+def test_timeline_memory_is_bounded_for_extreme_pnl(timestamps):
+    extreme = timeline_peak_bytes((1e-100, -1e100, 5.0, -1e-300), timestamps)
+    ordinary = timeline_peak_bytes((120.0, -80.0, -40.0, 60.0), timestamps)
+    assert extreme < 2 * ordinary + 16 * 2 ** 20
+
+
+def assert_same_results(detector, expected):
+    assert detector.df.equals(expected.df)
+    assert detector.detect_overtrading() == expected.detect_overtrading()
+    assert detector.detect_loss_aversion() == expected.detect_loss_aversion()
+    assert detector.detect_revenge_trading() == expected.detect_revenge_trading()
+    assert detector.get_statistics() == expected.get_statistics()
+
+
+def test_extend_with_appended_trades_matches_full_build(history):
+    detector = BiasDetector(history.iloc[:1500]).extend(history.iloc[1500:])
+    assert_same_results(detector, BiasDetector(history))
+
+
+@pytest.mark.parametrize('new_asset', [False, True])
+def test_extend_carries_aggregates_that_match_full_build(history, new_asset):
+    history = history.assign(Asset=history['Asset'].astype(object))
+    if new_asset:
+        history.loc[1800:, 'Asset'] = 'NEWCO'
+    head = BiasDetector(history.iloc[:1500])
+    head.daily_aggregates(), head.asset_aggregates()
+    detector = head.extend(history.iloc[1500:])
+    expected = BiasDetector(history)
+    assert 'asset_aggregates' in detector._cache
+    for name in ('daily_aggregates', 'asset_aggregates'):
+        pd.testing.assert_frame_equal(getattr(detector, name)(), getattr(expected, name)(), check_exact=False)
+    assert isinstance(detector.asset_aggregates().index, pd.CategoricalIndex)
+
+
+def test_extend_with_older_trades_matches_full_build(history):
+    detector = BiasDetector(history.iloc[500:]).extend(history.iloc[:500])
+    assert_same_results(detector, BiasDetector(history))
+
+
+def test_extend_multi_trader_frame_matches_full_build(desk):
+    detector = BiasDetector(desk.iloc[:2000]).extend(desk.iloc[2000:])
+    assert_same_results(detector, BiasDetector(desk))
+
+
+def test_extend_rejects_mismatched_columns(history, desk):
+    with pytest.raises(ValueError):
+        BiasDetector(history).extend(desk)
+
+
+def test_extend_without_new_trades_returns_same_detector(history):
+    detector = BiasDetector(history)
+    assert detector.extend(history.iloc[:0]) is detector
@@ -0,0 +1,90 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from gemini_client import GeminiClient, GeminiError
+
+REPLY = json.dumps({'candidates': [{'content': {'parts': [{'text': ' Pause and breathe. '}]}}]}).encode()
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        mode = self.path.split('/')[-1].split(':')[0]
+        if mode == 'error':
+            body = json.dumps({'error': {'message': 'quota exceeded'}}).encode()
+            self.send_response(429)
+        else:
+            body = REPLY
+            self.send_response(200)
+        if mode == 'slow':
+            time.sleep(1)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if mode == 'drip':
+            # Each byte arrives well inside the read timeout; the whole body does not
+            for byte in body:
+                self.wfile.write(bytes([byte]))
+                self.wfile.flush()
+                time.sleep(0.05)
+        else:
+            self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope='module')
+def server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{server.server_port}'
+    server.shutdown()
+
+
+@pytest.fixture(scope='module')
+def client(server):
+    client = GeminiClient('test-key', base_url=server)
+    yield client
+    client.close()
+
+
+def test_generate_returns_stripped_text(client):
+    assert client.generate('prompt', 'ok', deadline=5) == 'Pause and breathe.'
+
+
+def test_api_error_message_is_raised(client):
+    with pytest.raises(GeminiError, match='quota exceeded'):
+        client.generate('prompt', 'error', deadline=5)
+
+
+def test_deadline_bounds_a_slowly_streamed_response(client):
+    start = time.monotonic()
+    with pytest.raises(GeminiError, match='deadline'):
+        client.generate('prompt', 'drip', deadline=0.5)
+    assert time.monotonic() - start < 1
+
+
+def test_unreachable_server_raises_gemini_error():
+    client = GeminiClient('test-key', base_url='http://127.0.0.1:9', connect_timeout=1)
+    with pytest.raises(GeminiError):
+        client.generate('prompt', 'ok', deadline=2)
+    client.close()
+
+
+def test_busy_lane_does_not_delay_other_call_types(server):
+    client = GeminiClient('test-key', lanes={'analysis': 1}, base_url=server)
+    try:
+        slow = threading.Thread(target=client.generate, args=('prompt', 'slow', 5), kwargs={'lane': 'analysis'})
+        slow.start()
+        time.sleep(0.1)
+        assert client.generate('prompt', 'ok', deadline=0.5, lane='recommendations') == 'Pause and breathe.'
+        with pytest.raises(GeminiError):
+            client.generate('prompt', 'ok', deadline=0.5, lane='analysis')
+        slow.join()
+    finally:
+        client.close()
@@ -0,0 +1,111 @@
+import json
+import threading
+from datetime import datetime
+
+import pytest
+
+from gemini_coach import GeminiCoach
+from mock_data_generator import MockDataGenerator
+from recommendation_cache import RecommendationCache
+
+
+@pytest.fixture(scope='module')
+def trades():
+    return MockDataGenerator(num_trades=3000, start_date=datetime(2024, 1, 1), seed=3).generate()
+
+
+class WindowClient:
+    """Answers analysis prompts in call order from `replies`."""
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.prompts = []
+        self.lock = threading.Lock()
+
+    def generate(self, prompt, model, deadline, generation_config=None, lane='default'):
+        with self.lock:
+            self.prompts.append(prompt)
+            reply = self.replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+
+def analysis(score):
+    return json.dumps({'biases': {'Overconfidence': score}, 'primary_bias': 'Overconfidence',
+                       'discipline_score': 60, 'human_tax_estimate': 100, 'coaching_insight': f'insight {score}'})
+
+
+@pytest.fixture
+def coach_with(monkeypatch):
+    monkeypatch.setenv('GEMINI_API_KEY', 'test-key')
+    return lambda replies: GeminiCoach(client=WindowClient(replies), recommendation_cache=RecommendationCache())
+
+
+def test_windows_cover_every_trade_under_the_cap(trades):
+    windows = GeminiCoach._analysis_windows(trades, window_tokens=5_000, max_windows=100)
+    assert len(windows) > 1
+    assert [trade for window in windows for trade in window] == trades
+
+
+def test_window_count_is_capped(trades):
+    windows = GeminiCoach._analysis_windows(trades, window_tokens=1_000, max_windows=4)
+    assert len(windows) == 4
+    assert [trade for window in windows for trade in window] == trades
+
+
+def test_oversized_windows_keep_their_latest_trades(trades):
+    windows = GeminiCoach._analysis_windows(trades, window_tokens=1_000, max_windows=2, max_window_tokens=3_000)
+    assert len(windows) == 2
+    first_half, second_half = trades[:1500], trades[1500:]
+    assert 0 < len(windows[0]) < len(first_half)
+    assert windows[0] == first_half[-len(windows[0]):]
+    assert windows[1] == second_half[-len(windows[1]):]
+
+
+def test_malformed_window_reply_only_drops_that_window(coach_with, trades):
+    coach = coach_with([analysis(80), 'not json', analysis(40), '["wrong shape"]'])
+    result = coach.analyze_trade_data(trades, window_tokens=25_000, concurrency=1)
+    assert result['windows_analyzed'] == 2
+    assert result['windows_failed'] == 2
+    assert result['biases']['Overconfidence'] == pytest.approx(60, abs=0.1)
+    assert result['coaching_insight'] == 'insight 80'
+
+
+def test_failed_call_in_one_window_is_tolerated(coach_with, trades):
+    coach = coach_with([RuntimeError('connection reset'), analysis(50)])
+    result = coach.analyze_trade_data(trades, window_tokens=60_000, concurrency=1)
+    assert result['windows_analyzed'] == 1 and result['windows_failed'] == 1
+
+
+def test_every_window_failing_returns_an_error(coach_with, trades):
+    coach = coach_with(['oops', 'oops'])
+    assert 'error' in coach.analyze_trade_data(trades, window_tokens=60_000, concurrency=1)
+
+
+def test_request_never_exceeds_the_window_cap(coach_with, trades):
+    coach = coach_with([analysis(10)] * 3)
+    result = coach.analyze_trade_data(trades, window_tokens=500, max_windows=3)
+    assert len(coach.client.prompts) == 3
+    assert result['trades_analyzed'] == len(trades)
+
+
+def test_progress_is_reported_per_window(coach_with, trades):
+    coach = coach_with([analysis(10)] * 3)
+    reports = []
+    coach.analyze_trade_data(trades, window_tokens=500, max_windows=3, concurrency=1,
+                             progress=lambda fraction, stage: reports.append(fraction))
+    assert reports == pytest.approx([0, 1 / 3, 2 / 3, 1])
+
+
+def test_raising_progress_stops_remaining_windows(coach_with, trades):
+    class Stop(Exception):
+        pass
+
+    def progress(fraction, stage):
+        if fraction > 0:
+            raise Stop()
+
+    coach = coach_with([analysis(10)] * 4)
+    with pytest.raises(Stop):
+        coach.analyze_trade_data(trades, window_tokens=500, max_windows=4, concurrency=1, progress=progress)
+    assert len(coach.client.prompts) < 4
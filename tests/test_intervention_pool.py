@@ -0,0 +1,106 @@
+import threading
+import time
+
+import pytest
+
+from intervention_pool import INTERVENTION_KEYS, POOL_TRADE_CONTEXT, InterventionPool
+
+
+class StubCoach:
+    def __init__(self, model='gemini-test', fail=False):
+        self.model = model
+        self.fail = fail
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def request_intervention(self, bias_type, severity, trade_data):
+        assert trade_data == POOL_TRADE_CONTEXT
+        with self.lock:
+            self.requests.append((bias_type, severity))
+            count = len(self.requests)
+        if self.fail:
+            raise TimeoutError('Gemini timed out')
+        return f'{bias_type} #{count}'
+
+    def generate_intervention(self, bias_type, severity, trade_data):
+        return f'canned {bias_type}'
+
+
+def wait_until(condition, timeout=5):
+    end = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > end:
+            raise AssertionError('condition not met in time')
+        time.sleep(0.01)
+
+
+def test_nothing_is_generated_before_first_use():
+    coach = StubCoach()
+    pool = InterventionPool(coach, pool_size=2)
+    time.sleep(0.1)
+    assert coach.requests == []
+    pool.close()
+
+
+def test_first_get_starts_every_pool():
+    coach = StubCoach()
+    pool = InterventionPool(coach, pool_size=2)
+    pool.get('Overtrading', 6)
+    wait_until(lambda: all(pool.size(*key) == 2 for key in INTERVENTION_KEYS))
+    assert {key for key in coach.requests} == set(INTERVENTION_KEYS)
+    pool.close()
+
+
+def test_get_serves_pooled_messages_and_refills():
+    coach = StubCoach()
+    pool = InterventionPool(coach, pool_size=2)
+    pool.start()
+    wait_until(lambda: pool.size('Revenge Trading', 8) == 2)
+    first = pool.get('Revenge Trading', 8)
+    second = pool.get('Revenge Trading', 8)
+    assert first.startswith('Revenge Trading') and first != second
+    wait_until(lambda: pool.size('Revenge Trading', 8) == 2)
+    pool.close()
+
+
+def test_stale_messages_are_discarded():
+    coach = StubCoach()
+    pool = InterventionPool(coach, pool_size=1, max_age_seconds=0)
+    pool.start()
+    wait_until(lambda: pool.size('Overtrading', 4) == 1)
+    time.sleep(0.01)
+    # Stale pooled message dropped; nothing served yet, so the generic message comes back
+    assert pool.get('Overtrading', 4) == '⚠️ High risk of Overtrading detected. Pause and reset.'
+    pool.close()
+
+
+def test_failing_refill_keeps_last_served_message():
+    coach = StubCoach()
+    pool = InterventionPool(coach, pool_size=1)
+    pool.start()
+    wait_until(lambda: pool.size('Overtrading', 6) == 1)
+    served = pool.get('Overtrading', 6)
+    coach.fail = True
+    wait_until(lambda: not pool._refilling)
+    assert pool.get('Overtrading', 6) == served
+    pool.close()
+
+
+def test_without_gemini_the_coach_answers_directly():
+    coach = StubCoach(model=None)
+    pool = InterventionPool(coach)
+    assert pool.get('Overtrading', 6) == 'canned Overtrading'
+    assert coach.requests == []
+    pool.close()
+
+
+def test_building_the_app_services_starts_no_pool(monkeypatch):
+    import app as app_module
+    for name in ('gemini_coach', 'intervention_pool', 'session_store', 'analysis_cache', 'job_manager'):
+        # Restored after the test
+        monkeypatch.setattr(app_module, name, getattr(app_module, name))
+    monkeypatch.setenv('GEMINI_API_KEY', 'test-key')
+    app_module.init_services()
+    assert app_module.gemini_coach.model
+    assert not app_module.intervention_pool._started
+    app_module.job_manager.close()
@@ -0,0 +1,117 @@
+import threading
+import time
+
+import pytest
+
+from job_queue import JobCancelled, JobManager
+
+
+def wait_for(job, *statuses, timeout=5):
+    deadline = time.time() + timeout
+    while job.status not in statuses:
+        assert time.time() < deadline, f"job stuck in {job.status}"
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def manager():
+    manager = JobManager(workers=1)
+    yield manager
+    manager.close()
+
+
+def test_job_reports_progress_and_result(manager):
+    seen = []
+
+    def work(job):
+        job.report(0.5, 'halfway')
+        seen.append((job.status, job.progress, job.stage))
+        return {'answer': 42}
+
+    job = manager.submit('analyze', work)
+    wait_for(job, 'done')
+    assert seen == [('running', 0.5, 'halfway')]
+    info = manager.get(job.id).snapshot()
+    assert info['result'] == {'answer': 42}
+    assert info['progress'] == 1.0 and info['finished'] >= info['started']
+
+
+def test_failed_job_records_the_error(manager):
+    def work(job):
+        raise ValueError('bad trades')
+
+    job = manager.submit('analyze', work)
+    wait_for(job, 'failed')
+    info = job.snapshot()
+    assert info['error'] == 'bad trades' and 'result' not in info
+
+
+def test_cancelling_a_queued_job_never_runs_it(manager):
+    release = threading.Event()
+    blocker = manager.submit('analyze', lambda job: release.wait(5))
+    ran = []
+    queued = manager.submit('analyze', lambda job: ran.append(job))
+
+    assert manager.cancel(queued.id).status == 'cancelled'
+    release.set()
+    wait_for(blocker, 'done')
+    assert ran == []
+
+
+def test_running_job_stops_at_its_next_checkpoint(manager):
+    started, resume = threading.Event(), threading.Event()
+    steps = []
+
+    def work(job):
+        started.set()
+        resume.wait(5)
+        job.report(0.5, 'step')
+        steps.append('after checkpoint')
+
+    job = manager.submit('analyze-csv', work)
+    started.wait(5)
+    assert manager.cancel(job.id).stage == 'cancelling'
+    resume.set()
+    wait_for(job, 'cancelled')
+    assert steps == []
+    with pytest.raises(JobCancelled):
+        job.report(0.9, 'late')
+
+
+def test_cancel_of_unknown_or_finished_job(manager):
+    assert manager.cancel('missing') is None
+    job = manager.submit('analyze', lambda job: 1)
+    wait_for(job, 'done')
+    assert manager.cancel(job.id).status == 'done'
+
+
+def test_finished_jobs_expire_after_retention():
+    manager = JobManager(workers=1, retention_seconds=0)
+    try:
+        job = manager.submit('analyze', lambda job: 1)
+        wait_for(job, 'done')
+        time.sleep(0.01)
+        assert manager.get(job.id) is None
+        assert len(manager) == 0
+    finally:
+        manager.close()
+
+
+def test_max_jobs_drops_oldest_finished_then_rejects():
+    manager = JobManager(workers=1, max_jobs=2)
+    release = threading.Event()
+    try:
+        first = manager.submit('analyze', lambda job: 1)
+        wait_for(first, 'done')
+        running = manager.submit('analyze', lambda job: release.wait(5))
+        queued = manager.submit('analyze', lambda job: 3)
+        assert manager.get(first.id) is None
+        assert len(manager) == 2
+        with pytest.raises(RuntimeError):
+            manager.submit('analyze', lambda job: 4)
+        release.set()
+        wait_for(queued, 'done')
+        assert queued.result == 3 and running.status == 'done'
+    finally:
+        release.set()
+        manager.close()
@@ -0,0 +1,117 @@
+import dataclasses
+import decimal
+import gzip
+import json
+import uuid
+from datetime import datetime
+
+import numpy as np
+import pytest
+from flask import Flask, Response
+from flask.json.provider import DefaultJSONProvider
+
+import json_provider
+from json_provider import FastJSONProvider, enable_compression
+
+
+@dataclasses.dataclass
+class Point:
+    x: int
+    y: int
+
+
+VALUES = {
+    'bool': np.bool_(True), 'int': np.int32(7), 'float': np.float64(1.5), 'array': np.arange(3),
+    'date': datetime(2024, 1, 2, 3, 4, 5), 'decimal': decimal.Decimal('1.10'),
+    'uuid': uuid.UUID(int=1), 'point': Point(1, 2), 'nested': {'list': [np.int64(1)]},
+}
+EXPECTED = {
+    'bool': True, 'int': 7, 'float': 1.5, 'array': [0, 1, 2], 'date': 'Tue, 02 Jan 2024 03:04:05 GMT',
+    'decimal': '1.10', 'uuid': str(uuid.UUID(int=1)), 'point': {'x': 1, 'y': 2}, 'nested': {'list': [1]},
+}
+
+
+@pytest.fixture(params=['orjson', 'json'])
+def app(request, monkeypatch):
+    if request.param == 'orjson' and json_provider.orjson is None:
+        pytest.skip('orjson not installed')
+    if request.param == 'json':
+        monkeypatch.setattr(json_provider, 'orjson', None)
+    app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+    return app
+
+
+def test_dumps_handles_numpy_and_flask_types(app):
+    assert json.loads(app.json.dumps(VALUES)) == EXPECTED
+
+
+def test_dates_match_the_stock_provider(app):
+    stock = DefaultJSONProvider(app)
+    assert app.json.dumps({'date': VALUES['date']}).replace(' ', '') == stock.dumps({'date': VALUES['date']}).replace(' ', '')
+
+
+def test_unknown_types_raise_type_error(app):
+    with pytest.raises(TypeError):
+        app.json.dumps({'value': object()})
+
+
+def test_response_follows_jsonify_arguments(app):
+    with app.app_context():
+        assert json.loads(app.json.response({'a': 1}).get_data()) == {'a': 1}
+        assert json.loads(app.json.response(1, 2).get_data()) == [1, 2]
+        assert json.loads(app.json.response(a=np.int8(3)).get_data()) == {'a': 3}
+        assert json.loads(app.json.response().get_data()) is None
+        assert app.json.response([1]).mimetype == 'application/json'
+        with pytest.raises(TypeError):
+            app.json.response(1, a=2)
+
+
+def test_response_is_indented_only_in_debug(app):
+    with app.app_context():
+        assert b'\n  ' not in app.json.response({'a': [1, 2]}).get_data()
+        app.debug = True
+        assert b'\n  ' in app.json.response({'a': [1, 2]}).get_data()
+
+
+def test_loads_round_trips(app):
+    assert app.json.loads(b'{"trades": [{"P/L": -1.5}]}') == {'trades': [{'P/L': -1.5}]}
+
+
+@pytest.fixture
+def compressed_app():
+    app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+    enable_compression(app, ['gzip'], min_size=100)
+
+    @app.route('/big')
+    def big():
+        return {'values': list(range(200))}
+
+    @app.route('/small')
+    def small():
+        return {'ok': True}
+
+    @app.route('/stream')
+    def stream():
+        return Response((chunk for chunk in [b'x' * 500]), mimetype='text/event-stream')
+
+    return app.test_client()
+
+
+def test_large_responses_are_gzipped_for_accepting_clients(compressed_app):
+    response = compressed_app.get('/big', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert json.loads(gzip.decompress(response.get_data()))['values'][-1] == 199
+    assert 'Content-Encoding' not in compressed_app.get('/big').headers
+
+
+def test_small_and_streamed_responses_are_sent_as_is(compressed_app):
+    for path in ('/small', '/stream'):
+        response = compressed_app.get(path, headers={'Accept-Encoding': 'gzip'})
+        assert 'Content-Encoding' not in response.headers
+
+
+def test_unknown_encoding_is_rejected():
+    with pytest.raises(ValueError):
+        enable_compression(Flask(__name__), ['zstd'])
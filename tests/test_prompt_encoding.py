@@ -0,0 +1,36 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from prompt_encoding import encode_json, encode_trades, estimate_tokens
+
+
+def test_trades_become_csv_with_every_key():
+    trades = [{'Timestamp': '2024-01-02 09:30:00', 'Asset': 'AAPL', 'P/L': 12.500000000000002},
+              {'Timestamp': '2024-01-02 09:31:00', 'Asset': 'TSLA', 'P/L': 100.0, 'Note': 'late'}]
+    assert encode_trades(trades) == ('Timestamp,Asset,P/L,Note\n'
+                                     '2024-01-02 09:30:00,AAPL,12.5,\n'
+                                     '2024-01-02 09:31:00,TSLA,100,late')
+
+
+def test_timestamps_keep_seconds_but_not_fractions():
+    trades = [{'Timestamp': value} for value in (
+        '2024-01-02T09:30:15.250Z', '2024-01-02 09:30:45', '2024-01-02T09:31+01:00',
+        pd.Timestamp('2024-01-02 09:31:05.999'), datetime(2024, 1, 2, 9, 31, 20))]
+    assert encode_trades(trades).split('\n')[1:] == [
+        '2024-01-02 09:30:15Z', '2024-01-02 09:30:45', '2024-01-02 09:31:00+01:00',
+        '2024-01-02 09:31:05', '2024-01-02 09:31:20']
+
+
+def test_trades_within_a_minute_stay_distinct():
+    trades = [{'Timestamp': f'2024-01-02T09:30:{second:02d}Z'} for second in (5, 20, 50)]
+    assert len(set(encode_trades(trades).split('\n')[1:])) == 3
+
+
+def test_json_is_compact_and_numpy_safe():
+    assert encode_json({'score': np.float64(1.5), 'count': np.int64(3)}) == '{"score":1.5,"count":3}'
+
+
+def test_token_estimate_counts_digits_and_word_pieces():
+    assert estimate_tokens('Overtrading 2024') == 3 + 4
@@ -0,0 +1,107 @@
+import math
+import time
+
+import pytest
+
+from gemini_client import GeminiError
+from gemini_coach import GeminiCoach
+from recommendation_cache import RecommendationCache, quantize, signature
+
+ADVICE = [{'bias': 'Overtrading', 'recommendation': 'Cap trades per day.', 'priority': 'High'}]
+
+
+def analysis(win_rate=52.0, total_trades=400, avg_trades=18.0, detected=True, loss_aversion_ratio=1.4):
+    return {
+        'summary': {'win_rate': win_rate, 'total_trades': total_trades},
+        'overtrading': {'detected': detected, 'severity': 'High' if detected else 'Low',
+                        'metrics': {'avg_trades_per_day': avg_trades, 'rapid_trade_percentage': 12.0}},
+        'loss_aversion': {'detected': False, 'severity': 'Low',
+                          'metrics': {'risk_reward_ratio': loss_aversion_ratio}},
+        'revenge_trading': {'detected': False, 'severity': 'Low', 'metrics': {}},
+    }
+
+
+@pytest.mark.parametrize('value, expected', [
+    (0, 'zero'), (math.nan, 'zero'), (None, None), (True, True), ('High', 'High'),
+    (1.0, 0), (1.25, 1), (-1.25, '-1'), (100, 21),
+])
+def test_quantize_buckets(value, expected):
+    assert quantize(value) == expected
+
+
+def test_neighbouring_values_share_a_bucket_and_distant_ones_do_not():
+    assert quantize(18.0) == quantize(18.5)
+    assert quantize(18.0) != quantize(25.0)
+
+
+def test_signature_ignores_small_metric_changes():
+    assert signature(analysis(avg_trades=18.0, win_rate=52.0)) == signature(analysis(avg_trades=18.4, win_rate=51.0))
+
+
+def test_signature_changes_with_buckets_and_detection():
+    base = signature(analysis())
+    assert signature(analysis(avg_trades=30.0)) != base
+    assert signature(analysis(win_rate=70.0)) != base
+    assert signature(analysis(detected=False)) != base
+
+
+def test_signature_ignores_metrics_of_undetected_biases():
+    assert signature(analysis(loss_aversion_ratio=1.4)) == signature(analysis(loss_aversion_ratio=9.0))
+
+
+def test_cache_hit_miss_and_lru():
+    cache = RecommendationCache(max_entries=2)
+    assert cache.get('a') is None
+    cache.put('a', ADVICE)
+    cache.put('b', [])
+    assert cache.get('a') == ADVICE
+    cache.put('c', ADVICE)
+    assert cache.get('b') is None and cache.get('a') == ADVICE
+
+
+def test_entries_expire_after_ttl():
+    cache = RecommendationCache(ttl_seconds=0.05)
+    cache.put('a', ADVICE)
+    time.sleep(0.1)
+    assert cache.get('a') is None
+
+
+def test_sqlite_tier_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / 'recommendations.db')
+    RecommendationCache(path=path).put('a', ADVICE)
+    assert RecommendationCache(path=path).get('a') == ADVICE
+    assert RecommendationCache(path=path, ttl_seconds=0).get('a') is None
+
+
+class StubClient:
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.calls = 0
+
+    def generate(self, prompt, model, deadline, generation_config=None, lane='default'):
+        self.calls += 1
+        reply = self.replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+
+@pytest.fixture
+def coach_with(monkeypatch):
+    monkeypatch.setenv('GEMINI_API_KEY', 'test-key')
+    return lambda *replies: GeminiCoach(client=StubClient(replies), recommendation_cache=RecommendationCache())
+
+
+def test_coach_reuses_advice_for_similar_profiles(coach_with):
+    coach = coach_with('[{"bias": "Overtrading", "recommendation": "Cap trades per day.", "priority": "High"}]')
+    assert coach.generate_recommendations(analysis()) == ADVICE
+    assert coach.generate_recommendations(analysis(avg_trades=18.4)) == ADVICE
+    assert coach.client.calls == 1
+
+
+def test_coach_does_not_cache_failures(coach_with):
+    coach = coach_with(GeminiError('timed out'), '[]', '[{"bias": "General", "recommendation": "Rest.", "priority": "Low"}]')
+    assert coach.generate_recommendations(analysis()) == []
+    assert coach.generate_recommendations(analysis()) == []
+    assert coach.generate_recommendations(analysis())[0]['recommendation'] == 'Rest.'
+    assert coach.client.calls == 3
@@ -0,0 +1,118 @@
+import threading
+import time
+
+from session_store import TraderSessionStore
+
+HISTORY = [
+    {'Timestamp': '2024-01-02 10:00:00', 'Buy/sell': 'Buy', 'Asset': 'AAPL', 'P/L': -120},
+    {'Timestamp': '2024-01-02 10:05:00', 'Buy/sell': 'Sell', 'Asset': 'AAPL', 'P/L': 40},
+]
+TRADE = {'Timestamp': '2024-01-02 10:07:00', 'Buy/sell': 'Buy', 'Asset': 'AAPL', 'P/L': -30}
+
+
+def test_unknown_session_without_history_yields_none():
+    store = TraderSessionStore()
+    with store.session('s1') as detector:
+        assert detector is None
+    assert len(store) == 0
+
+
+def test_session_keeps_updates():
+    store = TraderSessionStore()
+    with store.session('s1', HISTORY) as detector:
+        detector.update(TRADE)
+    with store.session('s1') as detector:
+        assert detector.total_trades == 3
+
+
+def test_sessions_expire_after_ttl():
+    store = TraderSessionStore(ttl_seconds=0.05)
+    with store.session('s1', HISTORY):
+        pass
+    time.sleep(0.1)
+    with store.session('s1') as detector:
+        assert detector is None
+
+
+def test_least_recently_used_session_is_evicted():
+    store = TraderSessionStore(max_sessions=2)
+    for session_id in ('a', 'b', 'c'):
+        with store.session(session_id, HISTORY):
+            pass
+    assert len(store) == 2
+    with store.session('a') as detector:
+        assert detector is None
+
+
+def test_discard_forgets_session(tmp_path):
+    store = TraderSessionStore(snapshot_path=str(tmp_path / 'sessions.db'))
+    with store.session('s1', HISTORY):
+        pass
+    store.snapshot()
+    store.discard('s1')
+    with store.session('s1') as detector:
+        assert detector is None
+
+
+def test_snapshot_survives_restart(tmp_path):
+    path = str(tmp_path / 'sessions.db')
+    store = TraderSessionStore(snapshot_path=path)
+    with store.session('s1', HISTORY) as detector:
+        detector.update(TRADE)
+    store.snapshot()
+
+    restarted = TraderSessionStore(snapshot_path=path)
+    with restarted.session('s1') as detector:
+        assert detector.total_trades == 3
+
+
+def test_evicted_session_is_persisted(tmp_path):
+    path = str(tmp_path / 'sessions.db')
+    store = TraderSessionStore(snapshot_path=path, snapshot_interval=3600, max_sessions=1)
+    with store.session('a', HISTORY):
+        pass
+    with store.session('b', HISTORY):
+        pass
+    with store.session('a') as detector:
+        assert detector is not None and detector.total_trades == 2
+
+
+def test_different_sessions_do_not_block_each_other():
+    store = TraderSessionStore()
+    inside = threading.Event()
+    release = threading.Event()
+
+    def hold():
+        with store.session('slow', HISTORY):
+            inside.set()
+            release.wait(5)
+
+    worker = threading.Thread(target=hold)
+    worker.start()
+    try:
+        assert inside.wait(5)
+        start = time.monotonic()
+        with store.session('fast', HISTORY) as detector:
+            assert detector is not None
+        assert time.monotonic() - start < 1
+    finally:
+        release.set()
+        worker.join()
+
+
+def test_same_session_requests_take_turns():
+    store = TraderSessionStore()
+    with store.session('s1', HISTORY):
+        pass
+
+    def add_trade():
+        with store.session('s1') as detector:
+            detector.update(TRADE)
+
+    workers = [threading.Thread(target=add_trade) for _ in range(20)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    with store.session('s1') as detector:
+        assert detector.total_trades == 22
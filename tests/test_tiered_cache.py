@@ -0,0 +1,68 @@
+import time
+
+from tiered_cache import TieredCache
+
+
+def test_least_recently_used_entry_is_evicted():
+    evicted = []
+    cache = TieredCache('t', max_entries=2, on_evict=lambda key, value, stored: evicted.append(key))
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.get('a')
+    cache.put('c', 3)
+    assert evicted == ['b']
+    assert cache.get('b') is None
+    assert cache.get('a') == 1 and cache.get('c') == 3
+
+
+def test_weight_budget_keeps_newest_entry():
+    cache = TieredCache('t', weigh=len, max_weight=5)
+    cache.put('a', 'xxx')
+    cache.put('b', 'yyy')
+    assert cache.get('a') is None
+    cache.put('c', 'z' * 10)
+    assert len(cache) == 1 and cache.get('c') == 'z' * 10
+
+
+def test_entries_expire_after_ttl():
+    cache = TieredCache('t', ttl_seconds=0.05)
+    cache.put('a', 1)
+    assert cache.get('a') == 1
+    time.sleep(0.1)
+    assert cache.get('a') is None
+
+
+def test_memory_miss_falls_back_to_disk(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    TieredCache('t', path=path).put('a', {'x': [1, 2]})
+    cache = TieredCache('t', path=path)
+    assert cache.get('a') == {'x': [1, 2]}
+    assert len(cache) == 1
+
+
+def test_put_without_persist_waits_for_persist(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    cache = TieredCache('t', path=path)
+    cache.put('a', 1, persist=False)
+    assert TieredCache('t', path=path).get('a') is None
+    cache.persist(['a', 'missing'])
+    assert TieredCache('t', path=path).get('a') == 1
+
+
+def test_disk_keeps_most_recently_used(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    cache = TieredCache('t', max_entries=1, path=path, max_disk_entries=2)
+    for key in ('a', 'b', 'c'):
+        cache.put(key, key)
+    fresh = TieredCache('t', path=path)
+    assert fresh.get('a') is None
+    assert fresh.get('b') == 'b' and fresh.get('c') == 'c'
+
+
+def test_weights_below_covers_memory_and_disk(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    cache = TieredCache('t', max_entries=1, path=path, weigh=len)
+    cache.put('a', 'xx')
+    cache.put('b', 'xxxx')
+    assert cache.weights_below(10) == {2, 4}
+    assert cache.weights_below(3) == {2}
@@ -0,0 +1,176 @@
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager, nullcontext
+
+
+@contextmanager
+def connect(path):
+    """SQLite connection that commits on success and is always closed."""
+    conn = sqlite3.connect(path)
+    try:
+        yield conn
+        conn.commit()
+    finally:
+        conn.close()
+
+
+class TieredCache:
+    """
+    Thread-safe in-memory LRU map with an optional SQLite tier.
+
+    Memory keeps the most recently used values. Past `max_entries`, or once
+    the summed `weigh(value)` exceeds `max_weight`, the least recently used
+    are dropped (the newest value always stays) and `on_evict(key, value,
+    stored)` is called for each, outside the lock. With `ttl_seconds`, a
+    value reads as missing that long after it was stored.
+
+    When `path` is set, values are also pickled into `table` in that SQLite
+    file, which keeps the `max_disk_entries` most recently used; memory
+    misses fall back to it. put(persist=False) leaves the disk copy alone
+    until persist() or save() writes it.
+    """
+    def __init__(self, table, max_entries=1024, path=None, max_disk_entries=10000,
+                 ttl_seconds=None, weigh=None, max_weight=None, on_evict=None):
+        self.table = table
+        self.max_entries = max_entries
+        self.path = path
+        self.max_disk_entries = max_disk_entries
+        self.ttl_seconds = ttl_seconds
+        self.weigh = weigh
+        self.max_weight = max_weight
+        self.on_evict = on_evict
+
+        self._entries = OrderedDict()  # key -> (value, stored), least recently used first
+        self._weight = 0
+        self._lock = threading.Lock()
+
+        if self.path:
+            with connect(self.path) as conn:
+                conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                    "key TEXT PRIMARY KEY, value BLOB NOT NULL, weight INTEGER NOT NULL, "
+                    "stored REAL NOT NULL, used REAL NOT NULL)"
+                )
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Value stored under `key`, or None if missing or expired."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if not self._expired(entry[1], now):
+                    self._entries.move_to_end(key)
+                    return entry[0]
+                self._remove(key)
+        if not self.path:
+            return None
+
+        with connect(self.path) as conn:
+            row = conn.execute(
+                f"SELECT value, stored FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or self._expired(row[1], now):
+                return None
+            conn.execute(f"UPDATE {self.table} SET used = ? WHERE key = ?", (now, key))
+        value = pickle.loads(row[0])
+        self._insert(key, value, row[1])
+        return value
+
+    def put(self, key, value, persist=True):
+        stored = time.time()
+        self._insert(key, value, stored)
+        if persist:
+            self.save(key, value, stored)
+
+    def delete(self, key):
+        with self._lock:
+            self._remove(key)
+        if self.path:
+            with connect(self.path) as conn:
+                conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def save(self, key, value, stored=None):
+        """Write one value to the SQLite tier, if configured."""
+        self._write([self._row(key, value, stored or time.time())])
+
+    def persist(self, keys, guard=None):
+        """
+        Write the in-memory values of `keys` to the SQLite tier.
+
+        `guard(key)`, when given, returns a context manager held while that
+        value is read and pickled (e.g. a lock its owner mutates it under).
+        """
+        rows = []
+        for key in keys:
+            with guard(key) if guard else nullcontext():
+                with self._lock:
+                    entry = self._entries.get(key)
+                if entry is not None:
+                    rows.append(self._row(key, *entry))
+        self._write(rows)
+
+    def weights_below(self, limit):
+        """Distinct weights under `limit` among memory and disk values."""
+        with self._lock:
+            weights = {self._weigh(value) for value, _ in self._entries.values()}
+        weights = {weight for weight in weights if weight < limit}
+        if self.path:
+            with connect(self.path) as conn:
+                weights.update(row[0] for row in conn.execute(
+                    f"SELECT DISTINCT weight FROM {self.table} WHERE weight < ?", (limit,)))
+        return weights
+
+    def _expired(self, stored, now):
+        return self.ttl_seconds is not None and now - stored > self.ttl_seconds
+
+    def _weigh(self, value):
+        return self.weigh(value) if self.weigh else 0
+
+    def _row(self, key, value, stored):
+        return key, pickle.dumps(value), self._weigh(value), stored, time.time()
+
+    def _write(self, rows):
+        if not self.path or not rows:
+            return
+        with connect(self.path) as conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, weight, stored, used) VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            if self.ttl_seconds is not None:
+                conn.execute(f"DELETE FROM {self.table} WHERE stored < ?", (time.time() - self.ttl_seconds,))
+            conn.execute(
+                f"DELETE FROM {self.table} WHERE key NOT IN "
+                f"(SELECT key FROM {self.table} ORDER BY used DESC LIMIT ?)",
+                (self.max_disk_entries,)
+            )
+
+    def _remove(self, key):
+        value, _ = self._entries.pop(key)
+        self._weight -= self._weigh(value)
+
+    def _insert(self, key, value, stored):
+        evicted = []
+        now = time.time()
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, stored)
+            self._weight += self._weigh(value)
+            while len(self._entries) > 1:
+                oldest, (old_value, old_stored) = next(iter(self._entries.items()))
+                over = len(self._entries) > self.max_entries or (
+                    self.max_weight is not None and self._weight > self.max_weight)
+                if not over and not self._expired(old_stored, now):
+                    break
+                self._remove(oldest)
+                evicted.append((oldest, old_value, old_stored))
+        if self.on_evict:
+            for entry in evicted:
+                self.on_evict(*entry)
@@ -0,0 +1,116 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+REQUIRED_COLUMNS = ['Timestamp', 'Buy/sell', 'Asset', 'P/L']
+DEFAULT_CHUNKSIZE = 250_000
+
+
+def iter_trade_chunks(source, filename, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Yield DataFrames of at most `chunksize` trades from a CSV or Parquet file.
+
+    Only the required columns are read, and never more than one chunk is held
+    in memory. The format is picked from the file extension (.parquet/.pq,
+    anything else is treated as CSV).
+
+    Args:
+        source: Path or binary file object
+        filename: Original file name, used to pick the format
+
+    Raises:
+        ValueError: If a required column is missing or the format is unavailable
+    """
+    extension = os.path.splitext(filename or '')[1].lower()
+    if extension in ('.parquet', '.pq'):
+        yield from _iter_parquet(source, chunksize)
+    else:
+        yield from _iter_csv(source, chunksize)
+
+
+def _check_columns(columns):
+    missing = [col for col in REQUIRED_COLUMNS if col not in columns]
+    if missing:
+        raise ValueError(f'Missing required columns: {missing}')
+
+
+def _iter_csv(source, chunksize):
+    reader = pd.read_csv(
+        source,
+        chunksize=chunksize,
+        usecols=lambda col: col in REQUIRED_COLUMNS,
+        dtype={'Buy/sell': 'string', 'Asset': 'string'}
+    )
+    with reader:
+        for i, chunk in enumerate(reader):
+            if i == 0:
+                _check_columns(chunk.columns)
+            yield chunk
+
+
+def _iter_parquet(source, chunksize):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError('Parquet uploads require pyarrow (pip install pyarrow)')
+
+    parquet = pq.ParquetFile(source)
+    _check_columns(parquet.schema_arrow.names)
+    for batch in parquet.iter_batches(batch_size=chunksize, columns=REQUIRED_COLUMNS):
+        yield batch.to_pandas()
+
+
+ARROW_STREAM_MIMETYPE = 'application/vnd.apache.arrow.stream'
+
+
+def trades_frame(trades):
+    """
+    DataFrame for the `trades` field of a JSON request.
+
+    Accepts either row objects ([{"Timestamp": ..., "P/L": ...}, ...]) or
+    columns as parallel arrays ({"Timestamp": [...], "P/L": [...], ...}).
+    Columnar payloads skip the per-row dicts on both ends; numeric
+    timestamps are read as epoch milliseconds.
+
+    Raises:
+        ValueError: If a required column is missing or columns differ in length
+    """
+    if isinstance(trades, dict):
+        lengths = {len(values) for values in trades.values() if isinstance(values, list)}
+        if len(lengths) != 1 or not all(isinstance(values, list) for values in trades.values()):
+            raise ValueError('Columnar trades must be lists of equal length')
+        _check_columns(trades)
+        columns = dict(trades)
+        timestamps = np.asarray(columns['Timestamp'])
+        if timestamps.dtype.kind in 'iuf':
+            columns['Timestamp'] = pd.to_datetime(timestamps, unit='ms')
+        columns['P/L'] = pd.to_numeric(np.asarray(columns['P/L']), errors='coerce')
+        return pd.DataFrame(columns)
+
+    df = pd.DataFrame(trades)
+    _check_columns(df.columns)
+    return df
+
+
+def read_arrow_trades(body):
+    """
+    DataFrame from an Arrow IPC stream body.
+
+    Numeric and timestamp columns map onto the frame without copying, and
+    dictionary-encoded string columns arrive as categoricals.
+
+    Raises:
+        ValueError: If a required column is missing or pyarrow is unavailable
+    """
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise ValueError('Arrow payloads require pyarrow (pip install pyarrow)')
+
+    try:
+        table = pa.ipc.open_stream(body).read_all()
+    except pa.ArrowInvalid as e:
+        raise ValueError(f'Invalid Arrow stream: {e}')
+    _check_columns(table.column_names)
+    return table.to_pandas(split_blocks=True, self_destruct=True)